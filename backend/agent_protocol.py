@@ -1,7 +1,10 @@
 import asyncio
-from typing import Dict, Any, Optional, List
-from backend.services.brain_service import CrisisOrchestrator
-from backend.services.speech_service import GuardianVoiceClient
+import base64
+from typing import AsyncIterator, Dict, Any, Optional, List
+from backend.services.audio_store import AudioClip
+from backend.services.brain_service import CrisisOrchestrator, Speculation, StageCallback, notify_stage
+from backend.services.speech_service import ALERT_PREFIX, HELP_ON_THE_WAY, GuardianVoiceClient, SynthesisBackpressure
+from backend.services.tracing_service import traced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,6 +43,10 @@ class GuardianMasterAgent:
             logger.error(f"Failed to initialize Voice Client: {e}")
             self.voice_client = None
 
+        # The spoken high-severity alert is stitched from cached phrases here instead
+        if self.voice_client and self.crisis_orchestrator:
+            self.crisis_orchestrator.speech_alerts = False
+
         self.gesture_history: List[Dict[str, Any]] = []
         self.pending_dispatch_call: Optional[str] = None
 
@@ -206,26 +213,120 @@ class GuardianMasterAgent:
         # 3. Action
         await self.execute_response(sbar)
         
-    async def process_emergency(self, vision_context: str, user_metadata: Dict[str, Any], sign_detected: str = "HELP") -> Dict[str, str]:
+    def prearm(self, vision_context: str, user_metadata: Dict[str, Any],
+               sign_detected: str = "HELP") -> Optional[Speculation]:
+        """
+        Starts the emergency reasoning while the gesture is still being
+        confirmed. Returns None when the brain is unavailable.
+        """
+        if not self.crisis_orchestrator:
+            return None
+        return self.crisis_orchestrator.speculate(vision_context, sign_detected, user_metadata)
+
+    async def follow_up_emergency(self, incident_id: str, observation: str) -> Optional[Dict[str, Any]]:
+        """
+        Updates severity and SBAR of an incident handled by process_emergency
+        after the scene changed. Returns None when there is nothing to update.
+        """
+        if not self.crisis_orchestrator:
+            return None
+        return await self.crisis_orchestrator.follow_up(incident_id, observation)
+
+    async def _announce_alert(self, user_metadata: Dict[str, Any], incident_id: Optional[str],
+                              on_stage: Optional[StageCallback]) -> None:
+        """Stitches the spoken high-severity alert from cached phrases and reports it as "alert_audio"."""
+        location = user_metadata.get("location") or "an unknown location"
+        name = f"{incident_id}-alert" if incident_id else None
+        try:
+            clip = await self.voice_client.render_phrases([ALERT_PREFIX, location, HELP_ON_THE_WAY], name)
+        except Exception as e:
+            logger.error(f"Alert audio failed: {e}")
+            return
+        await notify_stage(on_stage, "alert_audio", audio_url=clip.url)
+
+    async def _speak_pipelined(self, sentences: "asyncio.Queue[Optional[str]]", incident_id: Optional[str],
+                               on_stage: Optional[StageCallback]) -> AudioClip:
+        """Speaks the SBAR as its text is queued, reporting each sentence as "audio_chunk"."""
+        async def chunks() -> AsyncIterator[str]:
+            while (text := await sentences.get()) is not None:
+                yield text
+
+        async def on_chunk(index: int, sentence: str, audio: bytes) -> None:
+            await notify_stage(on_stage, "audio_chunk", index=index, text=sentence, mime="audio/wav",
+                               audio=base64.b64encode(audio).decode("ascii"))
+
+        return await self.voice_client.synthesize_pipelined(chunks(), incident_id=incident_id, on_chunk=on_chunk)
+
+    @traced("agent.process_emergency")
+    async def process_emergency(self, vision_context: str, user_metadata: Dict[str, Any], sign_detected: str = "HELP",
+                                on_stage: Optional[StageCallback] = None,
+                                speculation: Optional[Speculation] = None,
+                                incident_id: Optional[str] = None) -> Dict[str, str]:
         """
         Handles the emergency workflow when TRIGGERED.
         Uses CrisisOrchestrator's Agentic Loop.
+        `on_stage` receives the loop's stage updates plus "audio_ready" (and
+        "audio_chunk" per sentence when the voice client is pipelined).
+        `speculation` is a run started by prearm() to commit instead of starting over.
+        With an `incident_id`, the verdict is kept for follow_up_emergency().
         """
         logger.warning(f"PROCESSING EMERGENCY: {vision_context} | Sign: {sign_detected}")
         
         # User Feedback (Immediate)
-        feedback_message = "Help is on the way. Stay calm."
+        feedback_message = HELP_ON_THE_WAY
         sbar_preview = "Pending..."
         
         if self.crisis_orchestrator:
+            alert_task: Optional[asyncio.Task] = None
+            speech_task: Optional[asyncio.Task] = None
+            # SBAR text for the pipelined speech; None ends it
+            speech_text: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+            streamed_sbar = False
+
+            async def loop_stage(stage: str, data: Dict[str, Any]) -> None:
+                nonlocal alert_task, speech_task, streamed_sbar
+                # Audible warning as soon as severity is known, long before the SBAR audio
+                if stage == "severity" and data.get("severity", 0) > 8 and self.voice_client and alert_task is None:
+                    alert_task = asyncio.create_task(self._announce_alert(user_metadata, incident_id, on_stage))
+                    if self.voice_client.pipelined:
+                        speech_task = asyncio.create_task(self._speak_pipelined(speech_text, incident_id, on_stage))
+                elif stage == "sbar_delta" and speech_task is not None:
+                    streamed_sbar = True
+                    speech_text.put_nowait(data.get("text", ""))
+                await notify_stage(on_stage, stage, **data)
+
             # Run Agentic Loop
-            result = await self.crisis_orchestrator.run_agentic_loop(
-                vision_context=vision_context, 
-                sign_detected=sign_detected, 
-                user_metadata=user_metadata
-            )
+            try:
+                result = await self.crisis_orchestrator.run_agentic_loop(
+                    vision_context=vision_context, 
+                    sign_detected=sign_detected, 
+                    user_metadata=user_metadata,
+                    on_stage=loop_stage,
+                    speculation=speculation
+                )
+                if speech_task is not None:
+                    # A report that did not stream is spoken from the finished text
+                    if result["status"] == "COMPLETED" and not streamed_sbar:
+                        speech_text.put_nowait(result["sbar_report"])
+                    speech_text.put_nowait(None)
+                if alert_task is not None:
+                    await alert_task
+            except BaseException:
+                if speech_task is not None:
+                    speech_task.cancel()
+                raise
+            finally:
+                if alert_task is not None and not alert_task.done():
+                    alert_task.cancel()
+            if speech_task is not None and (result["status"] != "COMPLETED" or result.get("severity", 0) <= 8):
+                speech_task.cancel()
+                speech_task = None
             
             if result["status"] == "COMPLETED":
+                if incident_id is not None:
+                    self.crisis_orchestrator.open_incident_context(
+                        incident_id, vision_context, sign_detected, user_metadata, result
+                    )
                 self.pending_dispatch_call = result["sbar_report"]
                 sbar_preview = f"[Severity {result['severity']}] {self.pending_dispatch_call}"
                 
@@ -236,17 +337,22 @@ class GuardianMasterAgent:
                 if result.get("severity", 0) > 8:
                     if self.voice_client:
                         try:
-                            # Generate audio
-                            # Note: In production this should be awaited in background or handled better to not block
-                            # But for this prototype we await it
-                            audio_path = await self.voice_client.synthesize_sbar_to_audio(self.pending_dispatch_call)
-                            # Assuming static mount is at /static/emergency_call.wav (since filename is fixed in service)
-                            # But let's be dynamic if service changes, though service returns absolute path.
-                            # We know main.py mounts backend/static at /static
-                            # Filename is emergency_call.wav
-                            audio_url = "/runtime_audio/emergency_call.wav"
+                            if speech_task is not None:
+                                # Already speaking sentence by sentence
+                                clip = await speech_task
+                            else:
+                                # Generate audio on the TTS pool; other streams keep running meanwhile
+                                clip = await self.voice_client.synthesize_sbar_to_audio(
+                                    self.pending_dispatch_call, incident_id=incident_id
+                                )
+                            # One clip per incident, served from memory by main.py under /audio
+                            audio_url = clip.url
                             call_status = "CALL_PLACED"
                             feedback_message += " (Voice Alert Broadcasted)"
+                            await notify_stage(on_stage, "audio_ready", audio_url=audio_url)
+                        except SynthesisBackpressure as e:
+                            logger.warning(f"Voice alert skipped: {e}")
+                            call_status = "TTS_BUSY"
                         except Exception as e:
                             logger.error(f"Voice generation failed: {e}")
                             call_status = "FAILED"
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+from backend.services.image_signature import FrameSignature, changed_fraction, frame_signature, signatures_available
+
+logger = logging.getLogger(__name__)
+
+# Fraction of changed thumbnail pixels below which a frame counts as unchanged
+CHANGE_THRESHOLD = float(os.getenv("GUARDIAN_CHANGE_THRESHOLD", "0.01"))
+# A cached result is never reused for longer than this, however static the scene
+MAX_REUSE_SECONDS = float(os.getenv("GUARDIAN_MAX_REUSE_SECONDS", "10"))
+
+
+class FrameDifferenceGate:
+    """
+    CPU-only pre-analysis stage for one stream.
+
+    Each frame is reduced to a grayscale thumbnail and compared with the
+    last frame that was actually sent for analysis. If the scene has not
+    changed, the previous analyze_frame result is reused instead of paying
+    for another cloud call.
+    """
+    def __init__(self, threshold: float = CHANGE_THRESHOLD, max_reuse_seconds: float = MAX_REUSE_SECONDS):
+        self.threshold = threshold
+        self.max_reuse_seconds = max_reuse_seconds
+        self.enabled = signatures_available()
+
+        self.reference = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_analyzed_at = 0.0
+
+    async def signature(self, image_bytes: Union[bytes, memoryview]) -> Optional[FrameSignature]:
+        """
+        Decodes off the event loop; None when the gate is disabled. The
+        perceptual hash comes from the same decode, for the result cache.
+        """
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(frame_signature, image_bytes)
+
+    def check(self, thumbnail, now: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Returns (reuse_previous_result, change) where change is the fraction
+        of pixels that moved since the last analyzed frame.
+        """
+        if thumbnail is None or self.reference is None or self.last_result is None:
+            return False, 1.0
+
+        if now is None:
+            now = time.time()
+
+        change = changed_fraction(thumbnail, self.reference)
+        if change < self.threshold and (now - self.last_analyzed_at) < self.max_reuse_seconds:
+            return True, change
+        return False, change
+
+    def record(self, thumbnail, result: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Stores a fresh analysis as the new reference. Failed analyses are never reused."""
+        if thumbnail is None or result.get("metadata", {}).get("error"):
+            return
+        self.reference = thumbnail
+        self.last_result = result
+        self.last_analyzed_at = now if now is not None else time.time()
@@ -0,0 +1,120 @@
+import base64
+import binascii
+import struct
+import time
+from typing import Optional, Union
+
+# ==========================================
+# /ws/stream WIRE PROTOCOL (v1)
+# ==========================================
+# Binary messages carry one raw JPEG each, prefixed by a fixed header:
+#
+#   offset  size  field
+#   0       2     magic            b"GL"
+#   2       1     protocol version (PROTOCOL_VERSION)
+#   3       1     message kind     (KIND_FRAME)
+#   4       4     stream id        uint32, big-endian
+#   8       4     sequence number  uint32, big-endian
+#   12      8     capture time     uint64, milliseconds since epoch
+#   20      ...   JPEG payload
+#
+# Text messages are either JSON control messages ({"type": "ping"}) or,
+# for legacy clients, a base64 data-URL of the frame.
+# ==========================================
+
+PROTOCOL_VERSION = 1
+MAGIC = b"GL"
+KIND_FRAME = 1
+
+HEADER = struct.Struct("!2sBBIIQ")
+HEADER_SIZE = HEADER.size
+
+
+class FrameProtocolError(ValueError):
+    """Raised when a binary message does not follow the /ws/stream protocol."""
+
+
+class StreamFrame:
+    """
+    A single camera frame received over /ws/stream.
+
+    Binary frames keep a memoryview into the received message, so the JPEG
+    payload reaches the vision client without being copied. Legacy text
+    frames keep the base64 string and are only decoded when the payload is
+    actually requested. `trace` carries the frame's root trace span from
+    the socket reader to the analyzer.
+    """
+    __slots__ = ("stream_id", "sequence", "capture_ts_ms", "received_at", "legacy", "trace", "_payload", "_encoded")
+
+    def __init__(self, stream_id: Optional[int], sequence: Optional[int], capture_ts_ms: Optional[int],
+                 payload: Optional[memoryview] = None, encoded: Optional[str] = None):
+        self.stream_id = stream_id
+        self.sequence = sequence
+        self.capture_ts_ms = capture_ts_ms
+        self.received_at = time.time()
+        self.legacy = encoded is not None
+        self.trace = None
+        self._payload = payload
+        self._encoded = encoded
+
+    def payload(self) -> Union[memoryview, bytes]:
+        """
+        Returns the JPEG bytes. Zero-copy for binary frames; legacy frames are
+        base64-decoded once on first access.
+        """
+        if self._payload is None:
+            try:
+                self._payload = base64.b64decode(self._encoded)
+            except (binascii.Error, ValueError) as e:
+                raise FrameProtocolError(f"Invalid base64 frame: {e}")
+            self._encoded = None
+        return self._payload
+
+    def describe(self) -> dict:
+        """Fields echoed back to binary clients so they can correlate responses."""
+        if self.legacy:
+            return {}
+        return {"stream_id": self.stream_id, "seq": self.sequence, "capture_ts": self.capture_ts_ms}
+
+
+def parse_binary_frame(data: Union[bytes, bytearray, memoryview]) -> StreamFrame:
+    """
+    Parses a binary /ws/stream message without copying the JPEG payload.
+    """
+    view = memoryview(data)
+    if len(view) <= HEADER_SIZE:
+        raise FrameProtocolError(f"Binary message too short ({len(view)} bytes)")
+
+    magic, version, kind, stream_id, sequence, capture_ts_ms = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise FrameProtocolError("Bad magic in frame header")
+    if version != PROTOCOL_VERSION:
+        raise FrameProtocolError(f"Unsupported protocol version {version}")
+    if kind != KIND_FRAME:
+        raise FrameProtocolError(f"Unsupported message kind {kind}")
+
+    return StreamFrame(stream_id, sequence, capture_ts_ms, payload=view[HEADER_SIZE:])
+
+
+def parse_text_frame(data: str) -> StreamFrame:
+    """
+    Wraps a legacy base64 (optionally data-URL prefixed) text frame.
+    Decoding is deferred until the payload is needed.
+    """
+    comma = data.find(",")
+    encoded = data[comma + 1:] if comma != -1 else data
+    return StreamFrame(None, None, None, encoded=encoded)
+
+
+def pack_frame(payload: bytes, stream_id: int = 0, sequence: int = 0, capture_ts_ms: Optional[int] = None) -> bytes:
+    """
+    Builds a binary /ws/stream message. Used by tests and load tools.
+    """
+    if capture_ts_ms is None:
+        capture_ts_ms = int(time.time() * 1000)
+    return HEADER.pack(MAGIC, PROTOCOL_VERSION, KIND_FRAME, stream_id, sequence, capture_ts_ms) + payload
+
+
+def is_control_message(data: str) -> bool:
+    """JSON control messages are objects; legacy frames are base64/data-URLs."""
+    return data.startswith("{")
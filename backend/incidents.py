@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long in-flight incidents may keep running after their stream closes (or on shutdown)
+INCIDENT_DRAIN_SECONDS = float(os.getenv("GUARDIAN_INCIDENT_DRAIN_SECONDS", "10"))
+# Finished incidents kept for GET /incidents
+INCIDENT_HISTORY_SIZE = 100
+# Minimum spacing of follow-up re-evaluations while the scene keeps changing
+INCIDENT_FOLLOW_UP_SECONDS = float(os.getenv("GUARDIAN_INCIDENT_FOLLOW_UP_SECONDS", "5"))
+
+
+class Incident:
+    """One confirmed emergency, handled in the background while its stream keeps running."""
+    def __init__(self, incident_id: str, stream_id: str, sign: str, owner: Any = None):
+        self.incident_id = incident_id
+        self.stream_id = stream_id
+        self.sign = sign
+        self.owner = owner
+        self.status = "running"
+        self.stages: List[str] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        # Scene (normalized caption) the latest verdict is based on, and when it was re-evaluated
+        self.observation: Optional[str] = None
+        self.followed_up_at = 0.0
+
+    def advance(self, stage: str) -> None:
+        self.stages.append(stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "incident_id": self.incident_id,
+            "stream_id": self.stream_id,
+            "sign": self.sign,
+            "status": self.status,
+            "stages": list(self.stages),
+            "created_at": self.created_at,
+            "duration_s": round((self.finished_at or time.time()) - self.created_at, 3),
+        }
+
+
+class IncidentManager:
+    """
+    Tracks background incident tasks. The analyzer spawns an incident and
+    moves on to the next frame; the incident reports its progress itself.
+    Incidents belong to an owner (the stream session) so they can be
+    drained when that stream goes away.
+    """
+    def __init__(self, drain_seconds: float = INCIDENT_DRAIN_SECONDS, history_size: int = INCIDENT_HISTORY_SIZE):
+        self.drain_seconds = drain_seconds
+        self.active: Dict[str, Incident] = {}
+        self.recent: deque = deque(maxlen=history_size)
+        self._ids = itertools.count(1)
+
+    def spawn(self, stream_id: str, sign: str, runner: Callable[[Incident], Awaitable[None]],
+              owner: Any = None) -> Incident:
+        incident = Incident(f"{stream_id}-{int(time.time())}-{next(self._ids)}", stream_id, sign, owner)
+        incident.task = asyncio.create_task(self._run(incident, runner))
+        self.active[incident.incident_id] = incident
+        logger.warning(f"[{stream_id}] Incident {incident.incident_id} started ({sign})")
+        return incident
+
+    async def _run(self, incident: Incident, runner: Callable[[Incident], Awaitable[None]]) -> None:
+        try:
+            await runner(incident)
+            if incident.status == "running":
+                incident.status = "completed"
+        except asyncio.CancelledError:
+            incident.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Incident {incident.incident_id} failed: {e}")
+            incident.status = "failed"
+        finally:
+            incident.finished_at = time.time()
+            self.active.pop(incident.incident_id, None)
+            self.recent.append(incident)
+            logger.info(f"Incident {incident.incident_id} finished: {incident.status}")
+
+    def for_owner(self, owner: Any) -> List[Incident]:
+        return [incident for incident in self.active.values() if incident.owner is owner]
+
+    async def drain(self, owner: Any = None, timeout: Optional[float] = None) -> None:
+        """
+        Lets running incidents (of one owner, or all) finish within `timeout`
+        seconds, then cancels whatever is still running.
+        """
+        incidents = self.for_owner(owner) if owner is not None else list(self.active.values())
+        tasks = [incident.task for incident in incidents if incident.task is not None]
+        if not tasks:
+            return
+
+        timeout = self.drain_seconds if timeout is None else timeout
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} incident(s) still running after {timeout}s")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": [incident.snapshot() for incident in self.active.values()],
+            "recent": [incident.snapshot() for incident in reversed(self.recent)],
+        }
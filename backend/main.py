@@ -1,11 +1,10 @@
 import asyncio
-import base64
 import json
 import logging
 import time
 import os
 import sys
-from typing import Optional
+from typing import Any, Dict, Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
@@ -28,25 +27,28 @@ env_path = os.path.join(project_root, '.env')
 print(f"Loading .env from: {env_path}")
 load_dotenv(dotenv_path=env_path, override=True)
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from backend.services.vision_service import AzureVisionClient
 from backend.agent_protocol import GuardianMasterAgent
-from collections import deque
-from enum import Enum
+from backend.frame_protocol import (
+    PROTOCOL_VERSION, HEADER_SIZE, FrameProtocolError,
+    parse_binary_frame, parse_text_frame, is_control_message
+)
+from backend.incidents import INCIDENT_FOLLOW_UP_SECONDS, Incident, IncidentManager
+from backend.profile_store import ProfileStore
+from backend.stream_session import EmergencyState, StreamSession, StreamSessionRegistry, SessionLimitReached
+from backend.services.tracing_service import NOOP_SPAN, TRACE_INCIDENTS, tracer
+from backend.services.verdict_cache import normalize_context
+from backend.services.vision_backends import describe_scene
+from backend.services.audio_store import etag_matches, parse_range
+from backend.services.metrics_service import (
+    ACTIVE_STREAMS, EMERGENCIES, FRAME_OUTCOMES, FRAMES_RECEIVED, REGISTRY, STAGE_SECONDS, WEBSOCKET_CONNECTIONS
+)
 import traceback
 
-class EmergencyState(Enum):
-    IDLE = "IDLE"
-    CONFIRMED = "CONFIRMED"
-    COOLDOWN = "COOLDOWN"
-
-# Global State for Finite State Machine
-SYSTEM_STATE = EmergencyState.IDLE
-LAST_TRIGGER_TIME = 0.0
-COOLDOWN_SECONDS = 30.0
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -79,10 +81,24 @@ master_agent = GuardianMasterAgent()
 async def lifespan(app: FastAPI):
     # Startup Logic
     logger.info("Guardian-Link Backend Started")
+    # Fixed alert phrases are rendered in the background so the first incident finds them cached
+    warming = asyncio.create_task(master_agent.voice_client.warm_phrases()) if master_agent.voice_client else None
+    watching_profiles = asyncio.create_task(profiles.watch())
     yield
+    if warming is not None and not warming.done():
+        warming.cancel()
+    watching_profiles.cancel()
     # Shutdown Logic
     logger.info("Guardian-Link Backend Shutting Down...")
+    stream_sessions.shutdown()
+    await incidents.drain()
     await vision_client.close()
+    if master_agent.crisis_orchestrator:
+        await asyncio.to_thread(master_agent.crisis_orchestrator.verdict_cache.close)
+    if master_agent.voice_client:
+        master_agent.voice_client.close()
+        await master_agent.voice_client.store.flush()
+    tracer.close()
 
 # Initialize App with Lifespan
 app = FastAPI(lifespan=lifespan)
@@ -96,150 +112,418 @@ app.add_middleware(
 )
 
 # Mount local static for assets if any
-app.mount("/static", StaticFiles(directory=os.path.join(current_dir, "static")), name="static")
+static_dir = os.path.join(current_dir, "static")
+os.makedirs(static_dir, exist_ok=True)
+app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# Mount Runtime Audio
-runtime_audio_dir = os.path.join(project_root, "runtime_audio")
-os.makedirs(runtime_audio_dir, exist_ok=True)
-app.mount("/runtime_audio", StaticFiles(directory=runtime_audio_dir), name="runtime_audio")
+# Incident audio is served from the voice client's in-memory store under /audio
+AUDIO_CHUNK_BYTES = 64 * 1024
 
-FRAME_HISTORY = deque(maxlen=10)
+# Per-stream temporal windows, FSMs and throttlers
+stream_sessions = StreamSessionRegistry()
 
-class Throttler:
-    def __init__(self, interval_seconds: float):
-        self.interval = interval_seconds
-        self.last_action_time = 0.0
+# Background emergency protocols, one task per confirmed incident
+incidents = IncidentManager()
 
-    def allow(self) -> bool:
-        current_time = time.time()
-        if current_time - self.last_action_time >= self.interval:
-            self.last_action_time = current_time
-            return True
-        return False
+# User profiles by user and stream id, loaded once and reloaded when the file changes
+profiles = ProfileStore()
 
-# Global throttler
-frame_throttler = Throttler(interval_seconds=1.0)
+# Metric children resolved once; observations in the frame loop are attribute updates
+ACTIVE_STREAMS.set_function(lambda: len(stream_sessions))
+VISION_QUEUE_DEPTH = REGISTRY.gauge("guardian_vision_queue_depth", "Vision requests waiting for a scheduler slot.")
+VISION_QUEUE_DEPTH.set_function(lambda: vision_client.scheduler.depth)
+FRAME_PARSE_SECONDS = STAGE_SECONDS.labels(stage="frame_parse")
+FRAME_DECODE_SECONDS = STAGE_SECONDS.labels(stage="frame_decode")
+FSM_SECONDS = STAGE_SECONDS.labels(stage="fsm")
+EMERGENCY_SECONDS = STAGE_SECONDS.labels(stage="emergency_protocol")
+BINARY_FRAMES = FRAMES_RECEIVED.labels(encoding="binary")
+TEXT_FRAMES = FRAMES_RECEIVED.labels(encoding="base64")
+FRAMES_ANALYZED = FRAME_OUTCOMES.labels(outcome="analyzed")
+FRAMES_SKIPPED = FRAME_OUTCOMES.labels(outcome="skipped")
+FRAMES_SUPERSEDED = FRAME_OUTCOMES.labels(outcome="superseded")
+FRAMES_FAILED = FRAME_OUTCOMES.labels(outcome="error")
 
 @app.get("/")
 def read_root():
     return {"Hello": "Guardian-Link Backend"}
 
-@app.websocket("/ws/stream")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    logger.info("WebSocket connection established")
-    
-    try:
-        while True:
-            # Receive data
-            data = await websocket.receive_text()
-            
-            # Check for ping before throttling
-            if data.startswith("{") and "ping" in data:
-                try:
-                    message = json.loads(data)
-                    if message.get("type") == "ping":
-                        await websocket.send_json({"type": "pong"})
-                        continue
-                except:
-                    pass 
+@app.get("/streams")
+def list_streams():
+    return {
+        **stream_sessions.snapshot(),
+        "vision_cache": vision_client.cache.stats(),
+        "vision_scheduler": vision_client.scheduler.stats(),
+        "profiles": profiles.stats()
+    }
+
+@app.get("/incidents")
+def list_incidents():
+    orchestrator = master_agent.crisis_orchestrator
+    return {
+        **incidents.snapshot(),
+        "verdict_cache": orchestrator.verdict_cache.stats() if orchestrator else None,
+        "incident_contexts": orchestrator.incident_contexts.stats() if orchestrator else None,
+        "audio_store": master_agent.voice_client.store.stats() if master_agent.voice_client else None
+    }
+
+@app.get("/audio/{key}")
+async def incident_audio(key: str, request: Request):
+    """Streams an incident's audio clip, honouring ETag revalidation and single byte ranges."""
+    clip = await master_agent.voice_client.store.get(key) if master_agent.voice_client else None
+    if clip is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    headers = {"ETag": clip.etag, "Accept-Ranges": "bytes", "Cache-Control": "private, max-age=3600"}
+    if etag_matches(request.headers.get("if-none-match"), clip.etag):
+        return Response(status_code=304, headers=headers)
+
+    size = len(clip.data)
+    byte_range = None
+    # A stale If-Range means the client's partial copy is outdated: send everything
+    if request.headers.get("if-range", clip.etag) == clip.etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    start, end = byte_range or (0, size - 1)
+    view = memoryview(clip.data)[start:end + 1]
 
-            # Apply Throttling for frame processing
-            if not frame_throttler.allow():
-                 continue
-                 
+    async def body():
+        for offset in range(0, len(view), AUDIO_CHUNK_BYTES):
+            yield bytes(view[offset:offset + AUDIO_CHUNK_BYTES])
+
+    headers["Content-Length"] = str(len(view))
+    if byte_range is None:
+        return StreamingResponse(body(), media_type=clip.mime, headers=headers)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(body(), status_code=206, media_type=clip.mime, headers=headers)
+
+@app.get("/traces")
+def list_traces(trace_id: Optional[str] = None, name: Optional[str] = None,
+                min_duration_ms: float = 0.0, limit: int = 50):
+    ring = tracer.ring()
+    return {
+        **tracer.stats(),
+        "traces": ring.query(trace_id, name, min_duration_ms, limit) if ring else []
+    }
+
+@app.put("/traces/sampling")
+def set_trace_sampling(rate: float):
+    tracer.sample_rate = min(1.0, max(0.0, rate))
+    return tracer.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+async def run_incident(session: StreamSession, incident: Incident, scene_caption: str, incident_trace,
+                       speculation=None) -> None:
+    """
+    Executes the emergency protocol for one incident, pushing an
+    `incident_update` message to the stream as each stage completes
+    (and one per SBAR chunk while the report is being written, and per
+    spoken sentence in pipelined speech mode).
+    `speculation` is the stream's pre-armed reasoning run, if any.
+    """
+    async def publish(stage: str, data: Dict[str, Any]) -> None:
+        # SBAR text and speech stream out as "sbar_delta" / "audio_chunk"; only real stages are recorded
+        if stage not in ("sbar_delta", "audio_chunk"):
+            incident.advance(stage)
+        await session.broadcast({
+            "type": "incident_update",
+            "incident_id": incident.incident_id,
+            "stream_id": session.stream_id,
+            "stage": stage,
+            **data
+        })
+
+    emergency_started = time.perf_counter()
+    with incident_trace:
+        try:
+            agent_response = await master_agent.process_emergency(
+                scene_caption, profiles.for_stream(session.stream_id), sign_detected=incident.sign,
+                on_stage=publish, speculation=speculation, incident_id=incident.incident_id
+            )
+            await publish("completed", {
+                "status": "alert",
+                "sbar": agent_response.get("sbar_preview", ""),
+                "audio_ready": agent_response.get("call_status") == "CALL_PLACED",
+                "audio_url": agent_response.get("audio_url"),
+                "caption": agent_response.get("user_feedback") or scene_caption
+            })
+            EMERGENCIES.labels(outcome=agent_response.get("call_status") or "reported").inc()
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Agent/Brain Failure: {e}")
+            incident.status = "failed"
+            EMERGENCIES.labels(outcome="failed").inc()
+            await publish("failed", {
+                "status": "fallback",
+                "sbar": "SYSTEM FAILURE: Manual Dispatch Required."
+            })
+        finally:
+            EMERGENCY_SECONDS.observe(time.perf_counter() - emergency_started)
+
+async def run_follow_up(session: StreamSession, incident: Incident, scene_caption: str) -> None:
+    """Re-evaluates a completed incident from its latest verdict after the scene changed."""
+    update = await master_agent.follow_up_emergency(incident.incident_id, scene_caption)
+    if update is None:
+        return
+    incident.advance("sbar_update")
+    await session.broadcast({
+        "type": "incident_update",
+        "incident_id": incident.incident_id,
+        "stream_id": session.stream_id,
+        "stage": "sbar_update",
+        "valid": update["valid"],
+        "severity": update["severity"],
+        "sbar": f"[Severity {update['severity']}] {update['sbar_report']}",
+        "caption": scene_caption
+    })
+
+def schedule_follow_up(session: StreamSession, scene_caption: str) -> None:
+    """
+    While a stream is in alert, a changed scene re-evaluates its latest
+    incident in the background: at most one follow-up at a time, spaced
+    by INCIDENT_FOLLOW_UP_SECONDS.
+    """
+    incident = session.incident
+    if incident is None or incident.status != "completed":
+        return
+    if session.follow_up_task is not None and not session.follow_up_task.done():
+        return
+    now = time.time()
+    if now - incident.followed_up_at < INCIDENT_FOLLOW_UP_SECONDS:
+        return
+    observation = normalize_context(scene_caption)
+    if observation == incident.observation:
+        return
+    incident.observation = observation
+    incident.followed_up_at = now
+    session.follow_up_task = asyncio.create_task(run_follow_up(session, incident, scene_caption))
+
+async def analyze_stream(session: StreamSession):
+    """
+    Analyzer loop for one stream. Always takes the freshest frame from the
+    session mailbox, so a slow vision call never leaves a backlog behind it.
+    """
+    while True:
+        await session.mailbox.wait()
+        await session.rate.wait()
+        frame = session.mailbox.take()
+        if frame is None:
+            continue
+
+        session.metrics["last_frame_age_ms"] = round((time.time() - frame.received_at) * 1000, 1)
+
+        # Root span opened by the socket reader; ends once the response is sent
+        trace = frame.trace or NOOP_SPAN
+        with tracer.use(trace):
             try:
-                if "," in data:
-                    header, encoded = data.split(",", 1)
+                # Binary frames hand over a memoryview, no copy
+                started = time.perf_counter()
+                with tracer.span("frame.decode", legacy=frame.legacy):
+                    image_bytes = frame.payload()
+
+                    # Local difference gate: an unchanged scene reuses the previous analysis
+                    now = time.time()
+                    signature = await session.gate.signature(image_bytes)
+                    thumbnail = signature.thumbnail if signature is not None else None
+                    reuse, change = session.gate.check(thumbnail, now)
+                FRAME_DECODE_SECONDS.observe(time.perf_counter() - started)
+                trace.set(queue_ms=session.metrics["last_frame_age_ms"], gate="reuse" if reuse else "analyze")
+
+                if reuse:
+                    results = session.gate.last_result
+                    session.metrics["frames_skipped"] += 1
+                    FRAMES_SKIPPED.inc()
                 else:
-                    encoded = data
-                
-                image_bytes = base64.b64decode(encoded)
-                
-                # Analyze frame
-                results = await vision_client.analyze_frame(image_bytes)
+                    started = time.perf_counter()
+                    results = await vision_client.analyze_frame(
+                        image_bytes,
+                        stream_id=session.stream_id,
+                        priority=session.in_alert(),
+                        changed=change >= session.gate.threshold,
+                        frame_hash=signature.hash if signature is not None else None
+                    )
+                    session.metrics["frames_analyzed"] += 1
+                    FRAMES_ANALYZED.inc()
+                    session.rate.observe_result(time.perf_counter() - started, results.get("metadata", {}).get("error"))
+                    session.gate.record(thumbnail, results, now)
+
+                # Scene activity drives the idle/base rate (payload size is the fallback motion signal)
+                motion = change if thumbnail is not None else session.rate.estimate_motion(len(image_bytes))
+                session.rate.observe_scene(motion, people_present=bool(results.get("people")))
 
                 # --- Temporal Logic ---
-                gestures = results.get("gestures", [])
-                current_tag = "Neutral"
-                if gestures:
-                    best_gesture = max(gestures, key=lambda x: x['probability'])
-                    if best_gesture['probability'] > 0.5:
-                        current_tag = best_gesture['tag']
-                
-                FRAME_HISTORY.append(current_tag)
-                
-                scene_caption = "Monitoring..."
-                if results.get("captions"):
-                    scene_caption = results["captions"][0]["text"]
+                fsm_started = time.perf_counter()
+                # Incremental per-tag windows (rules from gesture_rules.json)
+                decision = session.voter.observe(results.get("gestures", []))
+                current_tag = decision.tag
+                session.frame_history.append(current_tag)
+            
+                observation = describe_scene(results)
+                scene_caption = observation or "Monitoring..."
 
                 # --- Emergency Trigger Check ---
-                help_count = FRAME_HISTORY.count("HELP")
-                emergency_triggered = False
-                
-                if len(FRAME_HISTORY) == FRAME_HISTORY.maxlen and help_count > 7:
-                    emergency_triggered = True
+                emergency_triggered = decision.triggered is not None
 
                 response_payload = {
                     "status": "alert" if emergency_triggered else "monitoring",
                     "sign": current_tag,
                     "caption": scene_caption,
                     "sbar": "",
-                    "audio_ready": False
+                    "audio_ready": False,
+                    **frame.describe()
                 }
 
                 # --- Hysteresis & State Machine ---
-                current_time = time.time()
-                global SYSTEM_STATE, LAST_TRIGGER_TIME
-                
-                if SYSTEM_STATE != EmergencyState.IDLE:
-                    if (current_time - LAST_TRIGGER_TIME) > COOLDOWN_SECONDS:
-                        SYSTEM_STATE = EmergencyState.IDLE
-                        logger.info("System State Reset to IDLE")
+                emergency_triggered = session.confirm_emergency(emergency_triggered)
 
+                # Burst while gesture votes are accumulating on an idle stream
+                session.rate.set_arming(session.state == EmergencyState.IDLE and decision.pending)
+                FSM_SECONDS.observe(time.perf_counter() - fsm_started)
+
+                # Pre-arm: start the reasoning once the votes pass the lower threshold, so most
+                # of it happens during the confirmation window; drop it if the votes decay
+                speculation = None
                 if emergency_triggered:
-                    if SYSTEM_STATE == EmergencyState.IDLE:
-                        logger.warning("EMERGENCY TRIGGERED - CONFIRMED")
-                        SYSTEM_STATE = EmergencyState.CONFIRMED
-                        LAST_TRIGGER_TIME = current_time
-                    else:
-                        emergency_triggered = False
+                    speculation = session.take_speculation(decision.triggered)
+                else:
+                    prearm = decision.prearm if session.state == EmergencyState.IDLE else None
+                    if session.speculation is not None and session.speculation.sign_detected != prearm:
+                        session.discard_speculation()
+                    if prearm is not None and session.speculation is None:
+                        session.speculation = master_agent.prearm(
+                            scene_caption, profiles.for_stream(session.stream_id), prearm
+                        )
 
                 if emergency_triggered:
-                    logger.warning("EXECUTING EMERGENCY PROTOCOL")
-                    try:
-                        user_profile_path = os.path.join(current_dir, "user_profile.json")
-                        try:
-                            with open(user_profile_path, "r") as f:
-                                user_metadata = json.load(f)
-                        except:
-                            user_metadata = {"name": "Unknown", "location": "Unknown"}
-                        
-                        user_metadata["location"] = "37.7749, -122.4194 (Mock GPS)"
-                        
-                        agent_response = await master_agent.process_emergency(scene_caption, user_metadata)
-                        
-                        response_payload["sbar"] = agent_response.get("sbar_preview", "Generating Report...")
-                        response_payload["audio_ready"] = (agent_response.get("call_status") == "CALL_PLACED")
-                        if agent_response.get("user_feedback"):
-                            response_payload["caption"] = agent_response["user_feedback"]
-
-                    except Exception as e:
-                        logger.error(f"Agent/Brain Failure: {e}")
-                        response_payload["status"] = "fallback"
-                        response_payload["sbar"] = "SYSTEM FAILURE: Manual Dispatch Required."
-
-                await websocket.send_json(response_payload)
-                
+                    logger.warning(f"[{session.stream_id}] EXECUTING EMERGENCY PROTOCOL")
+                    # Incidents get their own trace, linked to the frame that confirmed them
+                    incident_trace = tracer.start_trace(
+                        "incident", sampled=True if TRACE_INCIDENTS else None,
+                        stream_id=session.stream_id, frame_trace_id=trace.trace_id
+                    )
+                    if incident_trace.sampled:
+                        response_payload["trace_id"] = incident_trace.trace_id
+
+                    # The incident runs in the background; this stream keeps analyzing frames
+                    incident = incidents.spawn(
+                        session.stream_id, decision.triggered,
+                        lambda new_incident, caption=scene_caption, span=incident_trace, draft=speculation:
+                            run_incident(session, new_incident, caption, span, draft),
+                        owner=session
+                    )
+                    response_payload["incident_id"] = incident.incident_id
+                    incident.observation = normalize_context(scene_caption)
+                    session.incident = incident
+                elif session.state == EmergencyState.CONFIRMED and observation:
+                    schedule_follow_up(session, scene_caption)
+
+                await session.broadcast(response_payload)
+            
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                # Catch processing errors but KEEP CONNECTION ALIVE
+                # Catch processing errors but KEEP STREAM ALIVE
                 logger.error(f"Frame processing error: {e}")
-                await websocket.send_json({
+                session.metrics["frame_errors"] += 1
+                FRAMES_FAILED.inc()
+                trace.set(error=repr(e))
+                trace.end("error")
+                await session.broadcast({
                     "status": "fallback",
                     "caption": "System Error - Retrying...",
                 })
+            finally:
+                trace.end()
+
+@app.websocket("/ws/stream")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+
+    # Camera id comes from the URL (/ws/stream?stream_id=cam-1); anonymous clients get their own session
+    try:
+        session = stream_sessions.open(websocket.query_params.get("stream_id"), websocket)
+    except SessionLimitReached as e:
+        logger.warning(f"Rejecting WebSocket connection: {e}")
+        await websocket.close(code=1013)
+        return
+
+    logger.info(f"WebSocket connection established (stream {session.stream_id})")
+    session.start_analyzer(analyze_stream(session))
+    WEBSOCKET_CONNECTIONS.inc()
+    
+    try:
+        # Reader loop: drain the socket continuously and hand frames to the analyzer
+        while True:
+            # Receive data (binary frames, JSON control messages or legacy base64 text)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                trace = tracer.start_trace("frame", stream_id=session.stream_id, encoding="binary")
+                try:
+                    started = time.perf_counter()
+                    frame = parse_binary_frame(message["bytes"])
+                    FRAME_PARSE_SECONDS.observe(time.perf_counter() - started)
+                    BINARY_FRAMES.inc()
+                    trace.set(seq=frame.sequence, bytes=len(message["bytes"]))
+                except FrameProtocolError as e:
+                    trace.end("rejected")
+                    logger.warning(f"Rejected binary frame: {e}")
+                    await session.send(websocket, {"type": "error", "detail": str(e)})
+                    continue
+            else:
+                data = message.get("text") or ""
+
+                # Control channel is handled by the reader, never queued behind frames
+                if is_control_message(data):
+                    try:
+                        control = json.loads(data)
+                    except ValueError:
+                        continue
+                    if control.get("type") == "ping":
+                        await session.send(websocket, {"type": "pong"})
+                    elif control.get("type") == "hello":
+                        await session.send(websocket, {
+                            "type": "hello",
+                            "protocol_version": PROTOCOL_VERSION,
+                            "header_size": HEADER_SIZE,
+                            "stream_id": session.stream_id
+                        })
+                    continue
+
+                trace = tracer.start_trace("frame", stream_id=session.stream_id, encoding="base64")
+                started = time.perf_counter()
+                frame = parse_text_frame(data)
+                FRAME_PARSE_SECONDS.observe(time.perf_counter() - started)
+                TEXT_FRAMES.inc()
+
+            session.metrics["frames_received"] += 1
+            session.metrics["last_frame_at"] = frame.received_at
+
+            frame.trace = trace
+
+            # Latest frame wins: an unanalyzed older frame is dropped
+            pending = session.mailbox.pending
+            if session.mailbox.put(frame):
+                session.metrics["frames_superseded"] += 1
+                FRAMES_SUPERSEDED.inc()
+                if pending.trace is not None:
+                    pending.trace.end("superseded")
                 
     except WebSocketDisconnect:
-        logger.info("WebSocket disconnected")
+        logger.info(f"WebSocket disconnected (stream {session.stream_id})")
     except Exception as e:
-        logger.error(f"WebSocket fatal error: {e}")
\ No newline at end of file
+        logger.error(f"WebSocket fatal error: {e}")
+    finally:
+        WEBSOCKET_CONNECTIONS.dec()
+        if stream_sessions.close(session, websocket):
+            # Last client gone: give running incidents a bounded window to finish
+            await incidents.drain(owner=session)
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A single profile object, a list of profiles, or {"default_user_id": ..., "profiles": [...]}
+PROFILES_PATH = os.getenv("GUARDIAN_PROFILES_PATH",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "user_profile.json"))
+# How often the file's version stamp is checked for changes
+PROFILES_POLL_SECONDS = float(os.getenv("GUARDIAN_PROFILES_POLL_SECONDS", "2"))
+
+UNKNOWN_PROFILE: Dict[str, Any] = {"name": "Unknown", "location": "Unknown"}
+MOCK_LOCATION = "37.7749, -122.4194 (Mock GPS)"
+
+# (mtime_ns, size) of the profile file, None when it is missing
+Stamp = Optional[Tuple[int, int]]
+
+
+class ProfileIndex:
+    """One load of the profile file, indexed by user id and by the stream ids a profile lists."""
+    __slots__ = ("version", "stamp", "by_user", "by_stream", "default", "loaded_at")
+
+    def __init__(self, version: int, stamp: Stamp, profiles: List[Dict[str, Any]],
+                 default_user_id: Optional[str] = None):
+        self.version = version
+        self.stamp = stamp
+        self.loaded_at = time.time()
+        self.by_user: Dict[str, Dict[str, Any]] = {}
+        self.by_stream: Dict[str, Dict[str, Any]] = {}
+        for profile in profiles:
+            user_id = profile.get("user_id")
+            if user_id is not None:
+                self.by_user[str(user_id)] = profile
+            for stream_id in profile.get("stream_ids") or ():
+                self.by_stream[str(stream_id)] = profile
+
+        if default_user_id is not None:
+            self.default = self.by_user.get(str(default_user_id))
+        else:
+            # A lone profile (the original single-user file) covers every stream
+            self.default = profiles[0] if len(profiles) == 1 else None
+
+
+class ProfileStore:
+    """
+    User profiles loaded once and kept in memory, so the alert path does a
+    dict lookup instead of reading the file. watch() reloads the file off
+    the event loop whenever its version stamp (mtime, size) changes and
+    swaps the whole index in one assignment; a file that fails to parse
+    leaves the previous index in place.
+    """
+    def __init__(self, path: str = PROFILES_PATH, poll_seconds: float = PROFILES_POLL_SECONDS):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.reloads = 0
+        self.errors = 0
+        # Startup load, before the event loop serves anything
+        self.index = self._load(1) or ProfileIndex(1, None, [])
+
+    def _stamp(self) -> Stamp:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, version: int) -> Optional[ProfileIndex]:
+        # Stamp first: a write that lands during the read is picked up by the next check
+        stamp = self._stamp()
+        if stamp is None:
+            logger.warning(f"Profile file {self.path} not found; using the unknown profile.")
+            return ProfileIndex(version, None, [])
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logger.error(f"Cannot load profiles from {self.path}: {e}")
+            return None
+
+        default_user_id = None
+        if isinstance(data, dict) and isinstance(data.get("profiles"), list):
+            default_user_id = data.get("default_user_id")
+            data = data["profiles"]
+        profiles = [p for p in (data if isinstance(data, list) else [data]) if isinstance(p, dict)]
+        return ProfileIndex(version, stamp, profiles, default_user_id)
+
+    async def refresh(self) -> bool:
+        """Reloads the profiles if the file changed. Returns True when a new index was installed."""
+        if await asyncio.to_thread(self._stamp) == self.index.stamp:
+            return False
+        index = await asyncio.to_thread(self._load, self.index.version + 1)
+        if index is None:
+            return False
+        self.index = index
+        self.reloads += 1
+        logger.info(f"Loaded {len(index.by_user)} profiles (version {index.version}).")
+        return True
+
+    async def watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Profile refresh failed: {e}")
+
+    @staticmethod
+    def _metadata(profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # A copy, so callers can annotate it without touching the shared profile
+        metadata = dict(profile) if profile is not None else dict(UNKNOWN_PROFILE)
+        if not profile or not profile.get("location"):
+            metadata["location"] = MOCK_LOCATION
+        return metadata
+
+    def for_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        profile = self.index.by_user.get(user_id)
+        return self._metadata(profile) if profile is not None else None
+
+    def for_stream(self, stream_id: str) -> Dict[str, Any]:
+        """The profile of the user a camera stream belongs to, the default one, or the unknown one."""
+        index = self.index
+        return self._metadata(index.by_stream.get(stream_id) or index.default)
+
+    def stats(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "path": self.path,
+            "version": index.version,
+            "profiles": len(index.by_user),
+            "streams": len(index.by_stream),
+            "has_default": index.default is not None,
+            "loaded_at": index.loaded_at,
+            "reloads": self.reloads,
+            "errors": self.errors,
+        }
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-stream analysis rates (frames per second)
+IDLE_FPS = 0.2          # empty, static room
+BASE_FPS = 1.0          # normal monitoring (the old fixed Throttler rate)
+BURST_FPS = 4.0         # HELP votes are accumulating
+MIN_FPS = 0.1
+
+IDLE_AFTER_SECONDS = 10.0      # no people / motion for this long -> idle rate
+MOTION_THRESHOLD = 0.02        # relative change that counts as scene motion
+LATENCY_ALPHA = 0.3            # EWMA smoothing for analyze_frame latency
+ERROR_ALPHA = 0.2              # EWMA smoothing for the error rate
+RATE_LIMIT_BACKOFF = 0.5       # multiplicative decrease on a 429
+RECOVERY_STEP = 0.05           # additive recovery per clean result
+BUDGET_RECOMPUTE_SECONDS = 0.5 # fair shares are refreshed at most this often
+
+# Total analysis budget for the whole process, shared across streams
+GLOBAL_FPS_BUDGET = float(os.getenv("GUARDIAN_VISION_FPS_BUDGET", "50"))
+
+
+class FrameBudget:
+    """
+    Process-wide analysis budget split max-min fairly across streams:
+    streams asking for less than an equal share get what they ask for, and
+    the remainder is divided evenly among the rest.
+    """
+    def __init__(self, total_fps: float = GLOBAL_FPS_BUDGET):
+        self.total_fps = total_fps
+        self._demands: Dict[str, float] = {}
+        self._shares: Dict[str, float] = {}
+        self._dirty = False
+        self._last_recompute = 0.0
+
+    def request(self, stream_id: str, fps: float) -> float:
+        """Records a stream's desired rate and returns its current fair share."""
+        fps = round(fps, 2)
+        if self._demands.get(stream_id) != fps:
+            self._demands[stream_id] = fps
+            self._dirty = True
+        return self.share(stream_id)
+
+    def release(self, stream_id: str) -> None:
+        if self._demands.pop(stream_id, None) is not None:
+            self._dirty = True
+
+    def share(self, stream_id: str) -> float:
+        # Shares are allowed to be slightly stale so hundreds of streams don't
+        # each trigger an O(n log n) recompute per frame.
+        now = time.monotonic()
+        if self._dirty and now - self._last_recompute >= BUDGET_RECOMPUTE_SECONDS:
+            self._recompute()
+            self._last_recompute = now
+        share = self._shares.get(stream_id)
+        if share is None:
+            # New stream since the last recompute: provisional equal share
+            share = self.total_fps / max(1, len(self._demands))
+        return share
+
+    def _recompute(self) -> None:
+        remaining = self.total_fps
+        pending = sorted(self._demands.items(), key=lambda item: item[1])
+        shares = {}
+        while pending:
+            equal_share = remaining / len(pending)
+            stream_id, demand = pending[0]
+            if demand <= equal_share:
+                shares[stream_id] = demand
+                remaining -= demand
+                pending.pop(0)
+            else:
+                for stream_id, _ in pending:
+                    shares[stream_id] = equal_share
+                break
+        self._shares = shares
+        self._dirty = False
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"total_fps": self.total_fps, "streams": len(self._demands)}
+
+
+class AdaptiveRateController:
+    """
+    Decides how often one stream is analyzed.
+
+    The target rate starts from the scene (idle when nothing has moved or
+    been seen for a while, base otherwise, burst while HELP votes are
+    accumulating), is capped by what the vision backend can currently
+    sustain (observed latency, error and 429 rate) and finally by the
+    stream's fair share of the global budget.
+    """
+    def __init__(self, stream_id: str, budget: Optional[FrameBudget] = None):
+        self.stream_id = stream_id
+        self.budget = budget
+        self.last_slot_time = 0.0
+
+        self.last_payload_size = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.backoff = 1.0
+        self.last_activity_time = time.time()
+        self.arming = False
+        self.target_fps = BASE_FPS
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.target_fps
+
+    def observe_result(self, latency_seconds: float, error: Optional[str] = None) -> None:
+        """Feeds back one analyze_frame call: its latency and error kind, if any."""
+        if self.latency_ewma is None:
+            self.latency_ewma = latency_seconds
+        else:
+            self.latency_ewma += LATENCY_ALPHA * (latency_seconds - self.latency_ewma)
+
+        self.error_rate += ERROR_ALPHA * ((1.0 if error else 0.0) - self.error_rate)
+
+        if error == "rate_limited":
+            self.backoff = max(MIN_FPS / BURST_FPS, self.backoff * RATE_LIMIT_BACKOFF)
+            logger.warning(f"[{self.stream_id}] Vision rate limited, backing off to x{self.backoff:.2f}")
+        elif not error:
+            self.backoff = min(1.0, self.backoff + RECOVERY_STEP)
+
+        self._update()
+
+    def estimate_motion(self, payload_size: int) -> float:
+        """
+        Cheap motion proxy: JPEG size tracks scene content, so the relative
+        size change between analyzed frames approximates how much changed.
+        """
+        previous, self.last_payload_size = self.last_payload_size, payload_size
+        if not previous:
+            return 1.0
+        return abs(payload_size - previous) / previous
+
+    def observe_scene(self, motion: float, people_present: bool, now: Optional[float] = None) -> None:
+        """Scene activity: relative frame change (0..1) and whether anyone is in view."""
+        if people_present or motion >= MOTION_THRESHOLD:
+            self.last_activity_time = now if now is not None else time.time()
+        self._update(now)
+
+    def set_arming(self, arming: bool) -> None:
+        """True while the stream is accumulating emergency votes."""
+        if arming != self.arming:
+            self.arming = arming
+            self._update()
+
+    def _update(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+
+        if self.arming:
+            fps = BURST_FPS
+        elif now - self.last_activity_time > IDLE_AFTER_SECONDS:
+            fps = IDLE_FPS
+        else:
+            fps = BASE_FPS
+
+        # Never ask for more than the backend is currently delivering
+        if self.latency_ewma:
+            fps = min(fps, max(BASE_FPS, 1.0 / self.latency_ewma))
+        fps *= self.backoff * (1.0 - self.error_rate / 2)
+
+        if self.budget is not None:
+            fps = min(fps, self.budget.request(self.stream_id, fps))
+
+        self.target_fps = max(MIN_FPS, fps)
+
+    async def wait(self) -> None:
+        """Sleeps until the stream's next analysis slot, then takes it."""
+        delay = self.last_slot_time + self.interval - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.last_slot_time = time.time()
+
+    def release(self) -> None:
+        if self.budget is not None:
+            self.budget.release(self.stream_id)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "target_fps": round(self.target_fps, 3),
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma else None,
+            "error_rate": round(self.error_rate, 3),
+            "backoff": round(self.backoff, 3),
+            "arming": self.arming,
+        }
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, Optional, Set, Tuple
+
+from backend.services.cache_service import TTLCache
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+AUDIO_STORE_MAX_BYTES = int(os.getenv("GUARDIAN_AUDIO_STORE_BYTES", str(64 * 1024 * 1024)))
+AUDIO_STORE_MAX_ENTRIES = int(os.getenv("GUARDIAN_AUDIO_STORE_ENTRIES", "512"))
+# Clips evicted from memory are written here and still served; empty disables spilling
+AUDIO_SPILL_DIR = os.getenv("GUARDIAN_AUDIO_SPILL_DIR", os.path.join(project_root, "runtime_audio")) or None
+
+MIME_TYPES = {"wav": "audio/wav", "mp3": "audio/mpeg", "ogg": "audio/ogg"}
+# One path component with a known audio extension
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.(wav|mp3|ogg)$")
+# One entity tag of an If-None-Match list; a quoted tag may itself contain commas
+ENTITY_TAG_PATTERN = re.compile(r'\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+
+
+class AudioClip:
+    """One synthesized clip, addressed as /audio/<key>."""
+    __slots__ = ("key", "data", "mime", "etag")
+
+    def __init__(self, key: str, data: bytes, mime: str):
+        self.key = key
+        self.data = data
+        self.mime = mime
+        self.etag = f'"{hashlib.blake2b(data, digest_size=12).hexdigest()}"'
+
+    @property
+    def url(self) -> str:
+        return f"/audio/{self.key}"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) of a single-range `Range: bytes=` header, or None
+    to send the whole clip (no header, or one this parser does not handle).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header names `etag`: "*", or an exact match of
+    one of its comma-separated entity tags (weak comparison, so a W/ prefix
+    is ignored).
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(match.group(1) == etag for match in ENTITY_TAG_PATTERN.finditer(header))
+
+
+class AudioStore:
+    """
+    Incident audio kept in memory (LRU, bounded by bytes) so the alert path
+    never touches the disk. Clips pushed out by the bound are written to
+    `spill_dir` in the background and served from there afterwards.
+    """
+    def __init__(self, max_bytes: int = AUDIO_STORE_MAX_BYTES, max_entries: int = AUDIO_STORE_MAX_ENTRIES,
+                 spill_dir: Optional[str] = AUDIO_SPILL_DIR):
+        self.spill_dir = spill_dir
+        self.memory = TTLCache("incident-audio", max_entries=max_entries, ttl_seconds=float("inf"),
+                               max_bytes=max_bytes, sizeof=len, on_evict=self._spill)
+        # Evicted clips still being written, served from here meanwhile
+        self._spilling: Dict[str, AudioClip] = {}
+        self._spill_tasks: Set[asyncio.Future] = set()
+        self.spilled = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def put(self, key: str, data: bytes, mime: Optional[str] = None) -> AudioClip:
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid audio key: {key}")
+        clip = AudioClip(key, data, mime or MIME_TYPES[key.rsplit(".", 1)[1]])
+        self._spilling.pop(key, None)
+        if self.memory.max_bytes is not None and len(clip) > self.memory.max_bytes:
+            # Too large to keep in memory at all
+            self._spill(key, clip)
+        else:
+            self.memory.set(key, clip)
+        return clip
+
+    async def get(self, key: str) -> Optional[AudioClip]:
+        if not KEY_PATTERN.match(key):
+            return None
+        clip = self.memory.get(key) or self._spilling.get(key)
+        if clip is not None or not self.spill_dir:
+            return clip
+        data = await asyncio.to_thread(self._read, key)
+        return AudioClip(key, data, MIME_TYPES[key.rsplit(".", 1)[1]]) if data is not None else None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, clip: AudioClip) -> None:
+        # Write then rename, so a reader never sees a partial clip
+        path = self._path(clip.key)
+        partial = f"{path}.part"
+        with open(partial, "wb") as f:
+            f.write(clip.data)
+        os.replace(partial, path)
+
+    def _spill(self, key: str, clip: AudioClip) -> None:
+        if not self.spill_dir:
+            return
+        self._spilling[key] = clip
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_spilled(clip)
+            self._spilled(clip)
+            return
+        def written(task: asyncio.Future) -> None:
+            self._spill_tasks.discard(task)
+            self._spilled(clip)
+
+        task = loop.run_in_executor(None, self._write_spilled, clip)
+        self._spill_tasks.add(task)
+        task.add_done_callback(written)
+
+    def _write_spilled(self, clip: AudioClip) -> None:
+        try:
+            self._write(clip)
+            self.spilled += 1
+        except OSError as e:
+            logger.warning(f"Cannot spill audio {clip.key}: {e}")
+
+    def _spilled(self, clip: AudioClip) -> None:
+        if self._spilling.get(clip.key) is clip:
+            del self._spilling[clip.key]
+
+    async def flush(self) -> None:
+        """Waits for background spills (shutdown, tests)."""
+        if self._spill_tasks:
+            await asyncio.gather(*list(self._spill_tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, object]:
+        return {**self.memory.stats(), "spill_dir": self.spill_dir, "spilled": self.spilled,
+                "spilling": len(self._spilling)}
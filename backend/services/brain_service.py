@@ -2,12 +2,21 @@
 import os
 import logging
 from google import genai
+from google.genai import types
 try:
     import azure.cognitiveservices.speech as speechsdk
 except ImportError:
     speechsdk = None
 from dotenv import load_dotenv
 import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from backend.services.metrics_service import REGISTRY, STAGE_SECONDS
+from backend.services.tracing_service import traced, tracer
+from backend.services.incident_context import IncidentContext, IncidentContextStore
+from backend.services.verdict_cache import VerdictCache
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +25,165 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+AGENT_LOOP_SECONDS = STAGE_SECONDS.labels(stage="agent_loop")
+VALIDATE_SECONDS = STAGE_SECONDS.labels(stage="llm_validate")
+SEVERITY_SECONDS = STAGE_SECONDS.labels(stage="llm_severity")
+REPORT_SECONDS = STAGE_SECONDS.labels(stage="llm_report")
+FUSED_SECONDS = STAGE_SECONDS.labels(stage="llm_fused")
+FOLLOW_UP_SECONDS = STAGE_SECONDS.labels(stage="llm_follow_up")
+SPECULATION_CANCELLED = REGISTRY.counter(
+    "guardian_llm_speculation_cancelled",
+    "Speculative LLM calls cancelled because validation returned INVALID.",
+)
+PREARM_RUNS = REGISTRY.counter(
+    "guardian_prearm_runs",
+    "Pre-armed reasoning runs by outcome (committed on trigger, or discarded when the votes decayed).",
+    ("outcome",),
+)
+PREARM_WASTED_CALLS = REGISTRY.counter(
+    "guardian_prearm_wasted_calls",
+    "LLM calls started by pre-armed runs that were discarded.",
+)
+
+# Upper bound for one Gemini round-trip; a timed-out stage falls back to its safe default
+LLM_TIMEOUT_SECONDS = float(os.getenv("GUARDIAN_LLM_TIMEOUT", "10"))
+
+# "sequential": validation, severity and SBAR as three calls
+# "fused": one structured-output call, falling back to sequential on failure
+# "speculative": the three calls run concurrently; results are kept only if validation passes
+REASONING_MODES = ("sequential", "fused", "speculative")
+REASONING_MODE = os.getenv("GUARDIAN_REASONING_MODE", "sequential").lower()
+
+# Bump when a prompt changes so cached verdicts from the old wording are not reused
+VALIDATE_PROMPT_VERSION = 1
+SEVERITY_PROMPT_VERSION = 1
+
+SBAR_SECTIONS = ("situation", "background", "assessment", "recommendation")
+
+FUSED_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "valid": {"type": "boolean"},
+        "severity": {"type": "integer", "minimum": 1, "maximum": 10},
+        "sbar": {
+            "type": "object",
+            "properties": {section: {"type": "string"} for section in SBAR_SECTIONS},
+            "required": list(SBAR_SECTIONS),
+        },
+    },
+    "required": ["valid", "severity", "sbar"],
+}
+
+
+def parse_fused_verdict(text: str) -> Dict[str, Any]:
+    """
+    Validates a fused-mode response against FUSED_RESPONSE_SCHEMA.
+    Returns {"valid", "severity", "sbar_report"}; raises ValueError otherwise.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Fused verdict is not a JSON object")
+
+    valid = data.get("valid")
+    if not isinstance(valid, bool):
+        raise ValueError("Fused verdict: 'valid' must be a boolean")
+
+    severity = data.get("severity")
+    if isinstance(severity, bool) or not isinstance(severity, int) or not 1 <= severity <= 10:
+        raise ValueError(f"Fused verdict: severity out of range: {severity!r}")
+
+    sbar = data.get("sbar")
+    if not isinstance(sbar, dict):
+        raise ValueError("Fused verdict: 'sbar' must be an object")
+    sections = []
+    for section in SBAR_SECTIONS:
+        content = sbar.get(section)
+        if not isinstance(content, str) or not content.strip():
+            raise ValueError(f"Fused verdict: missing SBAR section '{section}'")
+        sections.append(f"{section.upper()}: {content.strip()}")
+
+    return {"valid": valid, "severity": severity, "sbar_report": "\n".join(sections)}
+
+# on_stage(stage, data) callbacks receive progress as each loop stage finishes
+StageCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def notify_stage(on_stage: Optional[StageCallback], stage: str, **data: Any) -> None:
+    """Reports loop progress; a failing listener never breaks the loop."""
+    if on_stage is None:
+        return
+    try:
+        await on_stage(stage, data)
+    except Exception as e:
+        logger.warning(f"Stage listener failed for '{stage}': {e}")
+
+class Speculation:
+    """
+    Validation, severity and an SBAR draft started in the background before
+    the outcome is known. The speculative loop awaits one right away; a
+    pre-armed one is started while gesture votes are still accumulating
+    and is either committed to an incident or discarded. The draft is
+    streamed into `chunks`, so a committed run can hand the report out as
+    "sbar_delta" stages like the sequential loop (see replay_report()).
+    """
+    def __init__(self, orchestrator: "CrisisOrchestrator", vision_context: str, sign_detected: str,
+                 user_metadata: dict):
+        self.vision_context = vision_context
+        self.sign_detected = sign_detected
+        self.started_at = time.perf_counter()
+        self.timings: Dict[str, Any] = {}
+        self.chunks: List[str] = []
+        # Set whenever the draft grows or finishes
+        self._changed = asyncio.Event()
+        self.validation = asyncio.create_task(orchestrator._timed_stage(
+            "validate", VALIDATE_SECONDS, orchestrator.validate_context(vision_context, sign_detected), self.timings))
+        self.severity = asyncio.create_task(orchestrator._timed_stage(
+            "severity", SEVERITY_SECONDS, orchestrator.calculate_severity(vision_context, sign_detected), self.timings))
+        self.report = asyncio.create_task(orchestrator._timed_stage(
+            "report", REPORT_SECONDS,
+            orchestrator.generate_dispatch_report(vision_context, user_metadata, on_stage=self._buffer_chunk),
+            self.timings))
+        self.report.add_done_callback(lambda _: self._changed.set())
+
+    @property
+    def tasks(self):
+        return (self.validation, self.severity, self.report)
+
+    async def _buffer_chunk(self, stage: str, data: Dict[str, Any]) -> None:
+        self.chunks.append(data["text"])
+        self._changed.set()
+
+    async def replay_report(self, on_stage: Optional[StageCallback]) -> None:
+        """
+        Reports the draft written so far as "sbar_delta" stages, then keeps
+        forwarding chunks as they arrive until the draft is finished.
+        """
+        sent = 0
+        while True:
+            self._changed.clear()
+            while sent < len(self.chunks):
+                await notify_stage(on_stage, "sbar_delta", index=sent, text=self.chunks[sent])
+                sent += 1
+            if self.report.done():
+                return
+            await self._changed.wait()
+
+    def cancel(self) -> int:
+        """Cancels the calls still in flight; returns how many were cancelled."""
+        cancelled = 0
+        for task in self.tasks:
+            if not task.done():
+                task.cancel()
+                cancelled += 1
+        return cancelled
+
+    def discard(self) -> None:
+        """Drops a pre-armed run whose trigger never came; all three calls were wasted."""
+        self.cancel()
+        PREARM_RUNS.labels(outcome="discarded").inc()
+        PREARM_WASTED_CALLS.inc(len(self.tasks))
+
+
 class CrisisOrchestrator:
     """
     Orchestrates high-stress decision making using Google Gemini (gemini-2.5-flash).
@@ -23,6 +191,12 @@ class CrisisOrchestrator:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.model_name = "gemini-2.5-flash"
+        self.timeout = LLM_TIMEOUT_SECONDS
+        self.reasoning_mode = REASONING_MODE if REASONING_MODE in REASONING_MODES else "sequential"
+        self.verdict_cache = VerdictCache()
+        self.incident_contexts = IncidentContextStore()
+        # Speak the high-severity alert from here (turned off when the agent renders it from cached phrases)
+        self.speech_alerts = True
 
         if not self.api_key:
             logger.warning("Gemini credentials missing! Feature will be disabled.")
@@ -50,6 +224,25 @@ class CrisisOrchestrator:
 
         logger.info(f"CrisisOrchestrator initialized with model: {self.model_name}")
 
+    async def _generate(self, prompt: str, timeout: Optional[float] = None, **kwargs: Any):
+        """
+        One Gemini call on the SDK's async client, so the event loop (and every
+        other camera) keeps running during the round-trip. Raises
+        asyncio.TimeoutError after `timeout` seconds; cancelling the caller
+        cancels the request.
+        """
+        if not self.client:
+            raise RuntimeError("Gemini Client not initialized")
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(
+                self.client.aio.models.generate_content(model=self.model_name, contents=prompt, **kwargs),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Gemini call timed out after {timeout}s")
+
+    @traced("llm.validate")
     async def validate_context(self, vision_context: str, sign_detected: str) -> bool:
         """
         Uses LLM to check consistency between visual scene and sign detected.
@@ -65,18 +258,27 @@ class CrisisOrchestrator:
             logger.warning("Gemini Client not initialized. Skipping validation.")
             return True # Fail open
 
+        cache_key = self.verdict_cache.key("validate", vision_context, sign_detected,
+                                           self.model_name, VALIDATE_PROMPT_VERSION)
+        cached = await self.verdict_cache.get(cache_key)
+        if cached is not None:
+            tracer.current().set(cache="hit")
+            return cached
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = await self._generate(prompt)
             result = response.text.strip().upper()
             logger.info(f"Validation Result: {result}")
-            return "VALID" in result
+            # "INVALID" contains "VALID": check the negative verdict first
+            is_valid = "INVALID" not in result and "VALID" in result
+            if is_valid or "INVALID" in result:
+                self.verdict_cache.set(cache_key, is_valid)
+            return is_valid
         except Exception as e:
             logger.error(f"Validation failed: {e}")
             return True # Fail open safely
 
+    @traced("llm.severity")
     async def calculate_severity(self, vision_context: str, sign_detected: str) -> int:
         """
         Calculates a Severity Score (1-10).
@@ -87,17 +289,23 @@ class CrisisOrchestrator:
             f"Rate the severity of this emergency on a scale of 1 to 10 (10 being immediate life threat).\n"
             f"Output ONLY the number."
         )
+        cache_key = self.verdict_cache.key("severity", vision_context, sign_detected,
+                                           self.model_name, SEVERITY_PROMPT_VERSION)
+        cached = await self.verdict_cache.get(cache_key)
+        if cached is not None:
+            tracer.current().set(cache="hit")
+            return cached
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = await self._generate(prompt)
             score_text = response.text.strip()
             # Extract number
             import re
             match = re.search(r'\d+', score_text)
             score = int(match.group()) if match else 5
             logger.info(f"Severity Score: {score}")
+            if match:
+                self.verdict_cache.set(cache_key, score)
             return score
         except Exception as e:
             logger.error(f"Severity calculation failed: {e}")
@@ -121,53 +329,283 @@ class CrisisOrchestrator:
         else:
             logger.info("Speech module skipped (not configured).")
 
-    async def run_agentic_loop(self, vision_context: str, sign_detected: str, user_metadata: dict) -> dict:
+    def speculate(self, vision_context: str, sign_detected: str, user_metadata: dict) -> Speculation:
+        """
+        Starts the reasoning for a gesture that has not confirmed yet. Pass the
+        result to run_agentic_loop once it confirms, or discard() it.
+        """
+        logger.info(f"Pre-arming reasoning for {sign_detected}: {vision_context}")
+        return Speculation(self, vision_context, sign_detected, user_metadata)
+
+    @traced("agent.loop")
+    async def run_agentic_loop(self, vision_context: str, sign_detected: str, user_metadata: dict,
+                               on_stage: Optional[StageCallback] = None,
+                               speculation: Optional[Speculation] = None) -> dict:
         """
         Autonomous Agentic Loop:
         1. Validation
         2. Severity Check
         3. Action (Speech + SBAR)
+        `on_stage` is awaited with "validated", "severity" and "sbar_ready" as they complete.
+        The SBAR is also streamed as "sbar_delta" stages, except in fused mode; a
+        speculative draft is buffered and replayed once validation passes.
+        A pre-armed `speculation` (see speculate()) is committed instead of
+        starting new calls, whatever the reasoning mode.
         """
-        logger.info(">>> Starting Agentic Loop <<<")
-        
+        logger.info(f">>> Starting Agentic Loop ({'prearmed' if speculation else self.reasoning_mode}) <<<")
+        started = time.perf_counter()
+        with AGENT_LOOP_SECONDS.time():
+            result = None
+            if speculation is not None:
+                PREARM_RUNS.labels(outcome="committed").inc()
+                result = await self._speculative_loop(vision_context, sign_detected, user_metadata, on_stage,
+                                                      speculation)
+                result["mode"] = "prearmed"
+                # How far ahead of the confirmation the calls were started
+                result["timings"]["prearm_lead_ms"] = round((started - speculation.started_at) * 1000, 1)
+            elif self.reasoning_mode == "fused":
+                result = await self._fused_loop(vision_context, sign_detected, user_metadata, on_stage)
+                if result is None:
+                    logger.warning("Fused reasoning failed, falling back to sequential calls")
+            elif self.reasoning_mode == "speculative":
+                result = await self._speculative_loop(vision_context, sign_detected, user_metadata, on_stage)
+            if result is None:
+                result = await self._agentic_loop(vision_context, sign_detected, user_metadata, on_stage)
+
+        # Wall-clock time to the final verdict, next to the individual stage timings
+        result.setdefault("timings", {})["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    @staticmethod
+    async def _timed_stage(name: str, histogram, call: Awaitable[Any], timings: Dict[str, Any]) -> Any:
+        """Awaits one stage, recording its duration in the stage histogram and `timings`."""
+        started = time.perf_counter()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            timings[f"{name}_ms"] = "cancelled"
+            raise
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed)
+        timings[f"{name}_ms"] = round(elapsed * 1000, 1)
+        return result
+
+    async def _agentic_loop(self, vision_context: str, sign_detected: str, user_metadata: dict,
+                            on_stage: Optional[StageCallback]) -> dict:
+        timings: Dict[str, Any] = {}
+
         # 1. Validation
-        is_valid = await self.validate_context(vision_context, sign_detected)
+        is_valid = await self._timed_stage(
+            "validate", VALIDATE_SECONDS, self.validate_context(vision_context, sign_detected), timings)
+        await notify_stage(on_stage, "validated", valid=is_valid)
         if not is_valid:
             logger.warning("Emergency validation returned INVALID. Aborting high alert.")
-            return {"status": "ABORTED", "reason": "Context Mismatch"}
+            return {"status": "ABORTED", "reason": "Context Mismatch", "timings": timings}
 
         # 2. Severity Score
-        severity = await self.calculate_severity(vision_context, sign_detected)
+        severity = await self._timed_stage(
+            "severity", SEVERITY_SECONDS, self.calculate_severity(vision_context, sign_detected), timings)
+        await notify_stage(on_stage, "severity", severity=severity)
         
         # 3. Action Logic
-        if severity > 8:
-            logger.warning("High Severity Detected! Bypassing confirmation.")
-            speech_text = f"Emergency Alert! High severity incident detected at {user_metadata.get('location')}."
-            loop = asyncio.get_event_loop()
-            loop.run_in_executor(None, self.trigger_speech_alert, speech_text)
+        self._alert_on_high_severity(severity, user_metadata)
         
-        # Generate SBAR (Stage 3 final output)
-        report = await self.generate_dispatch_report(vision_context, user_metadata)
+        # Generate SBAR (Stage 3 final output), streamed to the listener as it is written
+        report = await self._timed_stage(
+            "report", REPORT_SECONDS, self.generate_dispatch_report(vision_context, user_metadata, on_stage), timings)
+        await notify_stage(on_stage, "sbar_ready", severity=severity, sbar=f"[Severity {severity}] {report}")
         
         return {
             "status": "COMPLETED",
             "severity": severity,
             "sbar_report": report,
-            "speech_triggered": severity > 8
+            "speech_triggered": severity > 8,
+            "mode": "sequential",
+            "timings": timings
         }
 
-    async def generate_dispatch_report(self, vision_context: str, user_metadata: dict) -> str:
+    async def _speculative_loop(self, vision_context: str, sign_detected: str, user_metadata: dict,
+                                on_stage: Optional[StageCallback], speculation: Optional[Speculation] = None) -> dict:
         """
-        Generates a concise SBAR report for 911 dispatch based on visual context and user metadata.
-        Uses Gemini's thinking process to formulate a professional report.
+        Starts validation, severity and the SBAR draft at once (none of them
+        depends on another) and commits to severity/SBAR only once validation
+        passes. An INVALID verdict cancels the calls still in flight, so the
+        critical path is the slowest call instead of the sum of all three.
+        """
+        if speculation is None:
+            speculation = Speculation(self, vision_context, sign_detected, user_metadata)
+        timings = speculation.timings
+        validation, severity_task, report_task = speculation.tasks
+        speculative = (severity_task, report_task)
+
+        try:
+            is_valid = await validation
+            await notify_stage(on_stage, "validated", valid=is_valid)
+            if not is_valid:
+                logger.warning("Emergency validation returned INVALID. Aborting high alert.")
+                for task in speculative:
+                    if not task.done():
+                        task.cancel()
+                        SPECULATION_CANCELLED.inc()
+                await asyncio.gather(*speculative, return_exceptions=True)
+                return {"status": "ABORTED", "reason": "Context Mismatch", "timings": timings}
+
+            severity = await severity_task
+            await notify_stage(on_stage, "severity", severity=severity)
+            self._alert_on_high_severity(severity, user_metadata)
+
+            # The draft was buffered until validation passed; catch up, then follow it live
+            if on_stage is not None:
+                await speculation.replay_report(on_stage)
+            report = await report_task
+            await notify_stage(on_stage, "sbar_ready", severity=severity, sbar=f"[Severity {severity}] {report}")
+        finally:
+            # The incident itself was cancelled: take the speculative calls down with it
+            for task in (validation, *speculative):
+                if not task.done():
+                    task.cancel()
+
+        return {
+            "status": "COMPLETED",
+            "severity": severity,
+            "sbar_report": report,
+            "speech_triggered": severity > 8,
+            "mode": "speculative",
+            "timings": timings
+        }
+
+    def _alert_on_high_severity(self, severity: int, user_metadata: dict) -> None:
+        if severity > 8:
+            logger.warning("High Severity Detected! Bypassing confirmation.")
+            if self.speech_alerts:
+                speech_text = f"Emergency Alert! High severity incident detected at {user_metadata.get('location')}."
+                loop = asyncio.get_event_loop()
+                loop.run_in_executor(None, self.trigger_speech_alert, speech_text)
+
+    def _fused_prompt(self, vision_context: str, sign_detected: str, user_metadata: dict) -> str:
+        return (
+            f"Visual Context: {vision_context}\n"
+            f"Sign Detected: {sign_detected}\n"
+            f"Medical History: {user_metadata.get('medical_history', 'None available')}\n"
+            f"Name: {user_metadata.get('name', 'Unknown User')}\n"
+            f"Location: {user_metadata.get('location', 'Unknown Location')}\n"
+            f"Emergency Contact: {user_metadata.get('emergency_contact', 'None available')}\n\n"
+            f"You are triaging an emergency for a dispatcher. In one JSON answer:\n"
+            f"1. valid: false only if the sign and scene look like a complete error. A mismatched sign during "
+            f"an immediate physical threat (fire, weapon) is still a valid emergency.\n"
+            f"2. severity: 1 to 10 (10 being immediate life threat).\n"
+            f"3. sbar: a professional SBAR report for the dispatcher, under 80 words in total, "
+            f"including the user details above."
+        )
+
+    @traced("llm.fused")
+    async def _fused_loop(self, vision_context: str, sign_detected: str, user_metadata: dict,
+                          on_stage: Optional[StageCallback]) -> Optional[dict]:
+        """
+        Validation, severity and SBAR in a single structured-output call.
+        Returns None when the call or the schema check fails, so the caller
+        can fall back to the sequential path.
+        """
+        if not self.client:
+            return None
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_json_schema=FUSED_RESPONSE_SCHEMA
+        )
+        timings: Dict[str, Any] = {}
+        try:
+            prompt = self._fused_prompt(vision_context, sign_detected, user_metadata)
+            response = await self._timed_stage("fused", FUSED_SECONDS, self._generate(prompt, config=config), timings)
+            verdict = parse_fused_verdict(response.text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Fused reasoning call failed: {e}")
+            return None
+
+        severity = verdict["severity"]
+        logger.info(f"Fused verdict: valid={verdict['valid']} severity={severity}")
+        await notify_stage(on_stage, "validated", valid=verdict["valid"])
+        if not verdict["valid"]:
+            logger.warning("Emergency validation returned INVALID. Aborting high alert.")
+            return {"status": "ABORTED", "reason": "Context Mismatch", "timings": timings}
+
+        await notify_stage(on_stage, "severity", severity=severity)
+        self._alert_on_high_severity(severity, user_metadata)
+
+        report = verdict["sbar_report"]
+        await notify_stage(on_stage, "sbar_ready", severity=severity, sbar=f"[Severity {severity}] {report}")
+        return {
+            "status": "COMPLETED",
+            "severity": severity,
+            "sbar_report": report,
+            "speech_triggered": severity > 8,
+            "mode": "fused",
+            "timings": timings
+        }
+
+    def open_incident_context(self, incident_id: str, vision_context: str, sign_detected: str,
+                              user_metadata: dict, result: dict) -> Optional[IncidentContext]:
         """
+        Keeps a completed loop's verdict, so follow-ups on the same incident
+        only need that verdict and what changed.
+        """
+        if not self.client or result.get("status") != "COMPLETED":
+            return None
+        context = IncidentContext(incident_id, sign_detected, result["severity"], result["sbar_report"])
+        self.incident_contexts.add(context)
+        return context
+
+    def _follow_up_prompt(self, context: IncidentContext, observation: str) -> str:
+        return (
+            f"Sign Detected: {context.sign_detected}\n"
+            f"Current verdict, severity {context.severity}:\n{context.sbar_report}\n\n"
+            f"New observation: {observation}\n"
+            f"Update the verdict as one JSON answer. valid: false only if the emergency now appears "
+            f"resolved or was a false alarm. Keep the user details; SBAR under 80 words."
+        )
+
+    @traced("llm.follow_up")
+    async def follow_up(self, incident_id: str, observation: str) -> Optional[dict]:
+        """
+        Re-evaluates an open incident after the scene changed, from its
+        latest verdict and the new observation only. Returns
+        {"valid", "severity", "sbar_report", "timings"}, or None when the
+        incident has no context (never opened or evicted) or the call fails.
+        """
+        context = self.incident_contexts.get(incident_id)
+        if context is None or not self.client:
+            return None
+
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_json_schema=FUSED_RESPONSE_SCHEMA
+        )
+        prompt = self._follow_up_prompt(context, observation)
+        timings: Dict[str, Any] = {}
+        try:
+            response = await self._timed_stage(
+                "follow_up", FOLLOW_UP_SECONDS, self._generate(prompt, config=config), timings)
+            verdict = parse_fused_verdict(response.text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Follow-up for incident {incident_id} failed: {e}")
+            return None
+
+        context.record(prompt, response)
+        context.update(verdict["severity"], verdict["sbar_report"])
+        logger.info(f"Follow-up for incident {incident_id}: valid={verdict['valid']} severity={verdict['severity']}")
+        return {**verdict, "timings": timings}
+
+    def _report_prompt(self, vision_context: str, user_metadata: dict) -> str:
         location = user_metadata.get("location", "Unknown Location")
         name = user_metadata.get("name", "Unknown User")
         medical_history = user_metadata.get("medical_history", "None available")
         emergency_contact = user_metadata.get("emergency_contact", "None available")
-        
+
         # Refined SBAR instructions
-        prompt = (
+        return (
             f"Analyze the visual scene {vision_context} and the user's medical history {medical_history}.\n"
             f"Generate a professional SBAR report for an emergency dispatcher. Keep it under 80 words.\n"
             f"YOU MUST USE THE FOLLOWING EXACT HEADERS (in uppercase):\n"
@@ -181,21 +619,64 @@ class CrisisOrchestrator:
             f"Emergency Contact: {emergency_contact}"
         )
 
+    @traced("llm.report")
+    async def generate_dispatch_report(self, vision_context: str, user_metadata: dict,
+                                       on_stage: Optional[StageCallback] = None) -> str:
+        """
+        Generates a concise SBAR report for 911 dispatch based on visual context and user metadata.
+        With `on_stage`, the report is streamed and each chunk is reported as an
+        "sbar_delta" stage while the rest is still being generated; the full
+        text is returned either way.
+        """
         if not self.client:
              return "SBAR Unavailable (Brain Offline)"
 
+        prompt = self._report_prompt(vision_context, user_metadata)
         try:
-            # Using generate_content which supports thinking if the model supports it, 
-            # though standard flash models might just produce the text.
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-
-            report = response.text
+            if on_stage is None:
+                response = await self._generate(prompt)
+                report = response.text
+            else:
+                chunks = []
+                async for text in self.stream_dispatch_report(prompt):
+                    await notify_stage(on_stage, "sbar_delta", index=len(chunks), text=text)
+                    chunks.append(text)
+                report = "".join(chunks)
             logger.info("SBAR Report generated successfully")
             return report
 
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Failed to generate SBAR report: {e}")
             return "CRITICAL ERROR: Failed to generate emergency report."
+
+    async def stream_dispatch_report(self, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Yields the SBAR text as Gemini streams it. `timeout` bounds the whole
+        generation, not each chunk, so a trickling stream cannot outlive a
+        blocking call. Raises asyncio.TimeoutError past the deadline.
+        """
+        if not self.client:
+            raise RuntimeError("Gemini Client not initialized")
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            return max(deadline - time.monotonic(), 0.0)
+
+        try:
+            stream = await asyncio.wait_for(
+                self.client.aio.models.generate_content_stream(model=self.model_name, contents=prompt),
+                timeout=remaining()
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    yield chunk.text
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Gemini stream timed out after {timeout}s")
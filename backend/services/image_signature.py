@@ -0,0 +1,144 @@
+import io
+import logging
+from typing import NamedTuple, Optional, Union
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Grayscale thumbnail used for all CPU-side frame comparisons
+THUMBNAIL_SIZE = (32, 24)
+# Per-pixel gray-level change that counts as "this pixel changed"
+PIXEL_DELTA = 16
+
+
+def signatures_available() -> bool:
+    return np is not None and Image is not None
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable read-only file over a bytes-like object. Unlike io.BytesIO it
+    does not copy the buffer up front, so a memoryview frame is only read
+    in the chunks the decoder asks for.
+    """
+    def __init__(self, buffer: Union[bytes, memoryview]):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        chunk = self._view[self._position:end].tobytes()
+        self._position = max(self._position, end)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+
+class FrameSignature(NamedTuple):
+    """Both CPU-side signatures of one frame, from a single decode."""
+    thumbnail: "np.ndarray"
+    hash: int
+
+
+def _decode_gray(image_bytes: Union[bytes, memoryview]) -> "Image.Image":
+    # JPEG draft mode lets the decoder do the downscaling (DCT scaling),
+    # which is far cheaper than a full-size decode
+    image = Image.open(BufferReader(image_bytes))
+    image.draft("L", (THUMBNAIL_SIZE[0] * 4, THUMBNAIL_SIZE[1] * 4))
+    return image.convert("L")
+
+
+def _thumbnail(gray: "Image.Image") -> "np.ndarray":
+    return np.asarray(gray.resize(THUMBNAIL_SIZE, Image.BILINEAR), dtype=np.int16)
+
+
+def _dhash(gray: "Image.Image") -> int:
+    pixels = np.asarray(gray.resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def frame_signature(image_bytes: Union[bytes, memoryview]) -> Optional[FrameSignature]:
+    """
+    Decodes the frame once and derives the gate thumbnail and the
+    perceptual hash from the same grayscale image. Returns None when NumPy
+    or Pillow are unavailable or the frame cannot be decoded.
+    """
+    if not signatures_available():
+        return None
+    try:
+        gray = _decode_gray(image_bytes)
+        return FrameSignature(_thumbnail(gray), _dhash(gray))
+    except Exception as e:
+        logger.debug(f"Frame signature failed: {e}")
+        return None
+
+
+def decode_thumbnail(image_bytes: Union[bytes, memoryview]) -> Optional["np.ndarray"]:
+    """
+    Decodes a JPEG straight to a small grayscale thumbnail. Returns None
+    when NumPy or Pillow are unavailable or the frame cannot be decoded.
+    """
+    if not signatures_available():
+        return None
+    try:
+        return _thumbnail(_decode_gray(image_bytes))
+    except Exception as e:
+        logger.debug(f"Thumbnail decode failed: {e}")
+        return None
+
+
+def changed_fraction(current: "np.ndarray", reference: "np.ndarray") -> float:
+    """
+    Fraction of thumbnail pixels whose brightness moved by more than
+    PIXEL_DELTA. Localized motion (a waving arm) registers even when the
+    mean difference over the whole frame stays small.
+    """
+    if current.shape != reference.shape:
+        return 1.0
+    return float(np.count_nonzero(np.abs(current - reference) > PIXEL_DELTA)) / current.size
+
+
+def perceptual_hash(image_bytes: Union[bytes, memoryview]) -> Optional[int]:
+    """
+    64-bit difference hash (dHash) of the frame: each bit records whether a
+    pixel of a 9x8 grayscale reduction is brighter than its right-hand
+    neighbour. Sensor noise and JPEG re-encoding rarely flip a bit, so
+    near-identical frames from a fixed camera share a hash.
+    """
+    if not signatures_available():
+        return None
+    try:
+        return _dhash(_decode_gray(image_bytes))
+    except Exception as e:
+        logger.debug(f"Perceptual hash failed: {e}")
+        return None
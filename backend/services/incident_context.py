@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from backend.services.cache_service import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bounded: least recently used incidents are evicted first, idle ones expire
+INCIDENT_CONTEXT_MAX_ENTRIES = int(os.getenv("GUARDIAN_INCIDENT_CONTEXTS", "64"))
+INCIDENT_CONTEXT_TTL_SECONDS = float(os.getenv("GUARDIAN_INCIDENT_CONTEXT_TTL", "900"))
+
+
+class IncidentContext:
+    """
+    The latest verdict of one incident. A follow-up sends that verdict
+    (whose SBAR already carries the user details) plus the new observation
+    in one stateless request, so its size stays the same however many
+    follow-ups came before and is smaller than a fresh fused prompt.
+    """
+    def __init__(self, incident_id: str, sign_detected: str, severity: int, sbar_report: str):
+        self.incident_id = incident_id
+        self.sign_detected = sign_detected
+        self.severity = severity
+        self.sbar_report = sbar_report
+        self.follow_ups = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.created_at = time.time()
+
+    def record(self, prompt: str, response: Any) -> None:
+        self.follow_ups += 1
+        self.prompt_chars += len(prompt)
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.prompt_tokens += getattr(usage, "prompt_token_count", None) or 0
+
+    def update(self, severity: int, sbar_report: str) -> None:
+        self.severity = severity
+        self.sbar_report = sbar_report
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "incident_id": self.incident_id,
+            "severity": self.severity,
+            "follow_ups": self.follow_ups,
+            "prompt_chars": self.prompt_chars,
+            "prompt_tokens": self.prompt_tokens,
+        }
+
+
+class IncidentContextStore:
+    """Incident contexts by id, in a TTLCache so memory stays bounded however many incidents run."""
+    def __init__(self, max_entries: int = INCIDENT_CONTEXT_MAX_ENTRIES,
+                 ttl_seconds: float = INCIDENT_CONTEXT_TTL_SECONDS):
+        self.contexts = TTLCache("incident-contexts", max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def add(self, context: IncidentContext) -> None:
+        self.contexts.set(context.incident_id, context)
+
+    def get(self, incident_id: str) -> Optional[IncidentContext]:
+        context = self.contexts.get(incident_id)
+        if context is not None:
+            # Re-store so the idle timeout restarts with every use
+            self.contexts.set(incident_id, context)
+        return context
+
+    def pop(self, incident_id: str) -> Optional[IncidentContext]:
+        return self.contexts.pop(incident_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.contexts.stats()
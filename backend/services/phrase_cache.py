@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import wave
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from backend.services.cache_service import TTLCache
+from backend.services.metrics_service import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+PHRASE_CACHE_MAX_BYTES = int(os.getenv("GUARDIAN_PHRASE_CACHE_BYTES", str(32 * 1024 * 1024)))
+PHRASE_CACHE_MAX_ENTRIES = int(os.getenv("GUARDIAN_PHRASE_CACHE_ENTRIES", "256"))
+
+# 24 kHz, 16-bit mono: the speech client's output format
+SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+# Pause inserted between stitched segments
+SEGMENT_GAP_SECONDS = 0.12
+
+PHRASE_LOOKUPS = REGISTRY.counter(
+    "guardian_tts_phrase_lookups",
+    "Phrase audio lookups by tier that answered (memory, disk or rendered).",
+    ("tier",),
+)
+
+
+def pcm_from_wav(data: bytes) -> bytes:
+    """Strips the RIFF header from a synthesizer result."""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        return wav.readframes(wav.getnframes())
+
+
+def wav_from_pcm(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class PhraseAudioCache:
+    """
+    PCM audio for recurring phrases, rendered once and stitched together at
+    playback time. Lookups go memory (LRU, bounded by bytes) -> disk
+    (content-addressed by voice and text, so it survives restarts) ->
+    `render`, and concurrent lookups of the same phrase share one render;
+    if its owner is cancelled, the next waiter renders the phrase instead.
+    `voice` names everything besides the text that shapes the audio.
+    """
+    def __init__(self, render: Callable[[str], Awaitable[bytes]], store_dir: Optional[str], voice: str,
+                 max_bytes: int = PHRASE_CACHE_MAX_BYTES, max_entries: int = PHRASE_CACHE_MAX_ENTRIES):
+        self.render = render
+        self.store_dir = store_dir
+        self.voice = voice
+        self.memory = TTLCache("tts-phrases", max_entries=max_entries, ttl_seconds=float("inf"),
+                               max_bytes=max_bytes, sizeof=len)
+        self._rendering: Dict[str, asyncio.Future] = {}
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+
+    def key(self, text: str) -> str:
+        material = f"{self.voice}|{SAMPLE_RATE}|{SAMPLE_WIDTH}|{CHANNELS}|{text.strip()}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.store_dir, key[:2], f"{key}.pcm")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, key: str, pcm: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.part"
+        with open(partial, "wb") as f:
+            f.write(pcm)
+        os.replace(partial, path)
+
+    async def get(self, text: str) -> bytes:
+        key = self.key(text)
+        pcm = self.memory.get(key)
+        if pcm is not None:
+            PHRASE_LOOKUPS.labels(tier="memory").inc()
+            return pcm
+
+        pending = self._rendering.get(key)
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only the render's owner was cancelled, not this waiter: render it here instead
+                if not pending.cancelled():
+                    raise
+            pending = self._rendering.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._rendering[key] = future
+        try:
+            pcm = await asyncio.to_thread(self._read, key) if self.store_dir else None
+            if pcm is not None:
+                PHRASE_LOOKUPS.labels(tier="disk").inc()
+            else:
+                pcm = await self.render(text)
+                PHRASE_LOOKUPS.labels(tier="rendered").inc()
+                if self.store_dir:
+                    try:
+                        await asyncio.to_thread(self._write, key, pcm)
+                    except OSError as e:
+                        logger.warning(f"Cannot store phrase audio {key}: {e}")
+            self.memory.set(key, pcm)
+            future.set_result(pcm)
+            return pcm
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting: do not leave "exception never retrieved" behind
+            future.exception()
+            raise
+        finally:
+            self._rendering.pop(key, None)
+
+    async def warm(self, phrases: Iterable[str]) -> None:
+        """Renders the fixed phrases ahead of the first incident."""
+        for text in phrases:
+            try:
+                await self.get(text)
+            except Exception as e:
+                logger.warning(f"Could not pre-render phrase '{text}': {e}")
+
+    async def compose(self, segments: List[str]) -> bytes:
+        """One WAV of the segments in order; cached ones cost no synthesis."""
+        parts = await asyncio.gather(*(self.get(text) for text in segments))
+        gap = b"\x00" * (int(SAMPLE_RATE * SEGMENT_GAP_SECONDS) * SAMPLE_WIDTH * CHANNELS)
+        return wav_from_pcm(gap.join(parts))
+
+    def stats(self) -> Dict[str, object]:
+        return {**self.memory.stats(), "store_dir": self.store_dir, "rendering": len(self._rendering)}
@@ -1,22 +1,169 @@
+import asyncio
 import os
 import logging
+import queue
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
 
+from backend.services.audio_store import AudioClip, AudioStore
+from backend.services.metrics_service import REGISTRY, STAGE_SECONDS
+from backend.services.phrase_cache import PhraseAudioCache, pcm_from_wav, wav_from_pcm
+from backend.services.tracing_service import traced
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Synthesizers (and executor threads) shared by all incidents
+TTS_POOL_SIZE = int(os.getenv("GUARDIAN_TTS_POOL_SIZE", "4"))
+# Requests allowed to wait for a free synthesizer before new ones are rejected
+TTS_QUEUE_LIMIT = int(os.getenv("GUARDIAN_TTS_QUEUE_LIMIT", "8"))
+# Content-addressed PCM of pre-rendered phrases
+PHRASE_STORE_DIR = os.getenv("GUARDIAN_PHRASE_CACHE_DIR", os.path.join(project_root, "runtime_audio", "phrases"))
+# Format of the SBAR report audio (stitched alerts and pipelined sentences stay WAV)
+TTS_AUDIO_FORMAT = os.getenv("GUARDIAN_TTS_FORMAT", "mp3")
+# "document" renders the whole SBAR in one request; "pipelined" speaks it sentence by sentence as it arrives
+TTS_MODE = os.getenv("GUARDIAN_TTS_MODE", "document")
+# Sentences of one report synthesized at the same time in pipelined mode
+TTS_PIPELINE_DEPTH = int(os.getenv("GUARDIAN_TTS_PIPELINE_DEPTH", "3"))
+
+VOICE_NAME = "en-US-AvaNeural"
+
+# name -> (SDK output format, file extension)
+AUDIO_FORMATS = {
+    "wav": (speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm, "wav"),
+    "mp3": (speechsdk.SpeechSynthesisOutputFormat.Audio24Khz48KBitRateMonoMp3, "mp3"),
+    "opus": (speechsdk.SpeechSynthesisOutputFormat.Ogg24Khz16BitMonoOpus, "ogg"),
+}
+
+# Fixed alert fragments, rendered at startup and stitched with the dynamic parts per incident
+ALERT_PREFIX = "Emergency Alert! High severity incident detected at"
+HELP_ON_THE_WAY = "Help is on the way. Stay calm."
+FIXED_PHRASES = (ALERT_PREFIX, HELP_ON_THE_WAY)
+
+TTS_SECONDS = STAGE_SECONDS.labels(stage="tts")
+TTS_QUEUE_SECONDS = STAGE_SECONDS.labels(stage="tts_queue")
+TTS_FIRST_AUDIO_SECONDS = STAGE_SECONDS.labels(stage="tts_first_audio")
+TTS_QUEUE_DEPTH = REGISTRY.gauge("guardian_tts_queue_depth", "Synthesis requests waiting for a free synthesizer.")
+TTS_IN_FLIGHT = REGISTRY.gauge("guardian_tts_in_flight", "Synthesis requests running on the TTS executor.")
+TTS_REJECTED = REGISTRY.counter("guardian_tts_rejected", "Synthesis requests rejected because the pool was saturated.")
+
+
+class SynthesisBackpressure(RuntimeError):
+    """Raised when every synthesizer is busy and the wait queue is full."""
+
+
+class SynthesizerPool:
+    """
+    A fixed set of speech synthesizers driven from a dedicated thread pool,
+    so the blocking `speak_ssml_async(...).get()` never runs on the event
+    loop and concurrent incidents synthesize in parallel. Callers beyond
+    `size` running plus `queue_limit` waiting get SynthesisBackpressure.
+    `create_synthesizer()` makes the default-format synthesizer of a slot;
+    other formats are created on first use as `create_synthesizer(fmt)`.
+    """
+    def __init__(self, create_synthesizer: Callable[..., Any], size: int = TTS_POOL_SIZE,
+                 queue_limit: int = TTS_QUEUE_LIMIT):
+        self.size = size
+        self.queue_limit = queue_limit
+        self.create_synthesizer = create_synthesizer
+        # One slot per thread: output format (None = default) -> synthesizer
+        self._synthesizers: "queue.SimpleQueue[Dict[Optional[str], Any]]" = queue.SimpleQueue()
+        for _ in range(size):
+            self._synthesizers.put({None: create_synthesizer()})
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="tts")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.in_flight = 0
+        TTS_QUEUE_DEPTH.set_function(lambda: self.waiting)
+        TTS_IN_FLIGHT.set_function(lambda: self.in_flight)
+
+    def _speak(self, ssml: str, audio_format: Optional[str] = None) -> Any:
+        slot = self._synthesizers.get()
+        try:
+            synthesizer = slot.get(audio_format)
+            if synthesizer is None:
+                synthesizer = slot[audio_format] = self.create_synthesizer(audio_format)
+            return synthesizer.speak_ssml_async(ssml).get()
+        finally:
+            self._synthesizers.put(slot)
+
+    async def speak_ssml(self, ssml: str, audio_format: Optional[str] = None) -> Any:
+        if self._slots is None:
+            # Created lazily so it binds to the running loop
+            self._slots = asyncio.Semaphore(self.size)
+        if self._slots.locked() and self.waiting >= self.queue_limit:
+            TTS_REJECTED.inc()
+            raise SynthesisBackpressure(
+                f"TTS pool saturated ({self.in_flight} running, {self.waiting} waiting)"
+            )
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        TTS_QUEUE_SECONDS.observe(time.perf_counter() - queued)
+
+        self.in_flight += 1
+        try:
+            with TTS_SECONDS.time():
+                return await asyncio.get_running_loop().run_in_executor(self._executor, self._speak, ssml, audio_format)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {"size": self.size, "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight, "waiting": self.waiting}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SentenceSplitter:
+    """
+    Cuts text that arrives in arbitrary chunks (or all at once) into
+    sentences and SBAR lines that can be spoken on their own.
+    """
+    BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Returns the sentences completed by `text`; the unfinished tail is kept."""
+        self._buffer += text
+        parts = self.BOUNDARY.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self) -> List[str]:
+        tail, self._buffer = self._buffer.strip(), ""
+        return [tail] if tail else []
+
+
 class GuardianVoiceClient:
     """
     Handles speech synthesis for Guardian emergencies using Azure Speech Services.
     """
-    def __init__(self):
+    def __init__(self, store: Optional[AudioStore] = None):
         self.speech_key = os.getenv("AZURE_SPEECH_KEY")
         self.speech_region = os.getenv("AZURE_SPEECH_REGION")
         
         if not self.speech_key or not self.speech_region:
             logger.error("Azure Speech credentials missing.")
             raise ValueError("Missing AZURE_SPEECH_KEY or AZURE_SPEECH_REGION")
+        if TTS_AUDIO_FORMAT not in AUDIO_FORMATS:
+            raise ValueError(f"Unknown GUARDIAN_TTS_FORMAT '{TTS_AUDIO_FORMAT}' (expected one of {list(AUDIO_FORMATS)})")
 
         try:
             self.speech_config = speechsdk.SpeechConfig(
@@ -24,39 +171,48 @@ class GuardianVoiceClient:
                 region=self.speech_region
             )
             # Set default voice (though SSML overrides this usually, it's good practice)
-            self.speech_config.speech_synthesis_voice_name = "en-US-AvaNeural"
-            
-            # Configure audio output to file
-            # Configure audio output to decoupled runtime folder
-            self.static_dir = r"C:\Users\divay\OneDrive\Documents\guardianlink_runtime\audio"
-            os.makedirs(self.static_dir, exist_ok=True)
-            self.output_file = os.path.join(self.static_dir, "emergency_call.wav")
-            
-            self.audio_config = speechsdk.audio.AudioOutputConfig(filename=self.output_file)
-            
-            self.synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config, 
-                audio_config=self.audio_config
-            )
-            logger.info("GuardianVoiceClient initialized.")
+            self.speech_config.speech_synthesis_voice_name = VOICE_NAME
+            # Synthesizers return WAV bytes by default, stitchable as PCM
+            self.speech_config.set_speech_synthesis_output_format(AUDIO_FORMATS["wav"][0])
+
+            # Each incident's audio is kept in memory and served by main.py under /audio
+            self.store = store or AudioStore()
+            self.mode = TTS_MODE
+            self.audio_format = TTS_AUDIO_FORMAT
+
+            self.pool = SynthesizerPool(self._create_synthesizer)
+            self.phrases = PhraseAudioCache(self._render_phrase, PHRASE_STORE_DIR, voice=f"{VOICE_NAME}|fast|loud")
+            logger.info(f"GuardianVoiceClient initialized ({self.pool.size} synthesizers).")
             
         except Exception as e:
             logger.error(f"Failed to initialize Azure Speech: {e}")
             raise
 
-    async def synthesize_sbar_to_audio(self, sbar_text: str) -> str:
-        """
-        Synthesizes the SBAR report into an emergency audio file using SSML.
-        Returns the path to the generated wav file.
-        """
-        logger.info("Synthesizing SBAR to audio...")
-        
+    def _create_synthesizer(self, audio_format: Optional[str] = None) -> Any:
+        config = self.speech_config
+        if audio_format is not None:
+            config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.speech_region)
+            config.speech_synthesis_voice_name = VOICE_NAME
+            config.set_speech_synthesis_output_format(AUDIO_FORMATS[audio_format][0])
+        return speechsdk.SpeechSynthesizer(speech_config=config, audio_config=None)
+
+    @staticmethod
+    def audio_key(incident_id: Optional[str] = None, extension: str = "wav") -> str:
+        # Incident ids embed the client-chosen stream id: keep them to one safe path component
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", incident_id) if incident_id else uuid.uuid4().hex
+        return f"{name}.{extension}"
+
+    def close(self) -> None:
+        self.pool.close()
+
+    @staticmethod
+    def _ssml(text: str) -> str:
         # XML-escape special characters in text to avoid SSML errors
-        safe_text = sbar_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        safe_text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
-        ssml_string = f"""
+        return f"""
         <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-US">
-            <voice name="en-US-AvaNeural">
+            <voice name="{VOICE_NAME}">
                 <prosody rate="fast" volume="loud">
                     {safe_text}
                 </prosody>
@@ -64,22 +220,129 @@ class GuardianVoiceClient:
         </speak>
         """
 
+    @staticmethod
+    def _audio_or_raise(result: Any) -> bytes:
+        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            return result.audio_data
+        if result.reason == speechsdk.ResultReason.Canceled:
+            cancellation_details = result.cancellation_details
+            logger.error(f"Speech synthesis canceled: {cancellation_details.reason}")
+            if cancellation_details.reason == speechsdk.CancellationReason.Error:
+                logger.error(f"Error details: {cancellation_details.error_details}")
+            raise RuntimeError("Speech synthesis failed.")
+        raise RuntimeError(f"Unexpected result reason: {result.reason}")
+
+    async def _render_phrase(self, text: str) -> bytes:
+        result = await self.pool.speak_ssml(self._ssml(text))
+        return pcm_from_wav(self._audio_or_raise(result))
+
+    async def warm_phrases(self) -> None:
+        await self.phrases.warm(FIXED_PHRASES)
+
+    @traced("tts.phrases")
+    async def render_phrases(self, segments: List[str], name: Optional[str] = None) -> AudioClip:
+        """
+        Stitches cached phrase audio (rendering only the segments never seen
+        before) into the `name`.wav clip.
+        """
+        audio = await self.phrases.compose(segments)
+        return self.store.put(self.audio_key(name), audio)
+
+    @property
+    def pipelined(self) -> bool:
+        return self.mode == "pipelined"
+
+    async def _synthesize_text(self, text: str) -> bytes:
+        return self._audio_or_raise(await self.pool.speak_ssml(self._ssml(text)))
+
+    async def stream_sentences(self, chunks: AsyncIterator[str],
+                               depth: int = TTS_PIPELINE_DEPTH) -> AsyncIterator[Tuple[int, str, bytes]]:
+        """
+        Yields (index, sentence, WAV bytes) in order while `chunks` is still
+        arriving. Each sentence is submitted to the pool as soon as it is
+        complete, up to `depth` at a time, so the first one plays after
+        roughly one sentence of synthesis.
+        """
+        window = asyncio.Semaphore(depth)
+        pending: "asyncio.Queue[Optional[Tuple[str, asyncio.Task]]]" = asyncio.Queue()
+        first_submitted: List[float] = []
+
+        async def synthesize(sentence: str) -> bytes:
+            async with window:
+                return await self._synthesize_text(sentence)
+
+        def submit(sentences: List[str]) -> None:
+            for sentence in sentences:
+                if not first_submitted:
+                    first_submitted.append(time.perf_counter())
+                pending.put_nowait((sentence, asyncio.create_task(synthesize(sentence))))
+
+        async def feed() -> None:
+            splitter = SentenceSplitter()
+            try:
+                async for chunk in chunks:
+                    submit(splitter.feed(chunk))
+                submit(splitter.flush())
+            finally:
+                pending.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
+        index = 0
+        try:
+            while (item := await pending.get()) is not None:
+                sentence, task = item
+                audio = await task
+                if index == 0:
+                    TTS_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - first_submitted[0])
+                yield index, sentence, audio
+                index += 1
+            # Surfaces a failure of the text source
+            await feeder
+        finally:
+            feeder.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+    @traced("tts.pipelined")
+    async def synthesize_pipelined(self, chunks: AsyncIterator[str], incident_id: Optional[str] = None,
+                                   on_chunk: Optional[Callable[[int, str, bytes], Awaitable[None]]] = None) -> AudioClip:
+        """
+        Speaks SBAR text sentence by sentence as `chunks` arrive, handing
+        each sentence's WAV to `on_chunk` as soon as it and all earlier ones
+        are ready. The whole report is also stored as the incident's clip.
+        """
+        parts = []
+        async for index, sentence, audio in self.stream_sentences(chunks):
+            parts.append(pcm_from_wav(audio))
+            if on_chunk is not None:
+                await on_chunk(index, sentence, audio)
+        if not parts:
+            raise RuntimeError("No SBAR text to synthesize.")
+
+        clip = self.store.put(self.audio_key(incident_id), wav_from_pcm(b"".join(parts)))
+        logger.info(f"Audio stored as {clip.key} ({len(parts)} sentences)")
+        return clip
+
+    @traced("tts.synthesize")
+    async def synthesize_sbar_to_audio(self, sbar_text: str, incident_id: Optional[str] = None) -> AudioClip:
+        """
+        Synthesizes the SBAR report into an emergency audio clip using SSML,
+        in the configured (by default compressed) format, one per incident.
+        Raises SynthesisBackpressure when the synthesizer pool is saturated.
+        """
+        logger.info("Synthesizing SBAR to audio...")
+
         try:
-            # Azure Speech SDK synthesis is blocking, but fast enough for this scope. 
-            # Ideally running in executor if high load, but acceptable here.
-            result = self.synthesizer.speak_ssml_async(ssml_string).get()
-
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                logger.info(f"Audio saved to {self.output_file}")
-                return self.output_file
-            elif result.reason == speechsdk.ResultReason.Canceled:
-                cancellation_details = result.cancellation_details
-                logger.error(f"Speech synthesis canceled: {cancellation_details.reason}")
-                if cancellation_details.reason == speechsdk.CancellationReason.Error:
-                    logger.error(f"Error details: {cancellation_details.error_details}")
-                raise RuntimeError("Speech synthesis failed.")
-            else:
-                 raise RuntimeError(f"Unexpected result reason: {result.reason}")
+            # Blocking SDK call, run on the pool's executor
+            audio_format = None if self.audio_format == "wav" else self.audio_format
+            result = await self.pool.speak_ssml(self._ssml(sbar_text), audio_format)
+            audio = self._audio_or_raise(result)
+
+            clip = self.store.put(self.audio_key(incident_id, AUDIO_FORMATS[self.audio_format][1]), audio)
+            logger.info(f"Audio stored as {clip.key} ({len(audio)} bytes)")
+            return clip
 
         except Exception as e:
             logger.error(f"Error in synthesize_sbar_to_audio: {e}")
@@ -0,0 +1,267 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fraction of frames traced end to end; incidents are always traced unless disabled
+TRACE_SAMPLE_RATE = float(os.getenv("GUARDIAN_TRACE_SAMPLE_RATE", "0.05"))
+TRACE_INCIDENTS = os.getenv("GUARDIAN_TRACE_INCIDENTS", "1") != "0"
+# Finished spans kept in memory for /traces
+TRACE_BUFFER_SPANS = int(os.getenv("GUARDIAN_TRACE_BUFFER", "4096"))
+# Optional JSON-lines file receiving every finished span
+TRACE_FILE = os.getenv("GUARDIAN_TRACE_FILE")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("guardian_span", default=None)
+
+
+def _new_id(bits: int = 64) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """
+    One timed operation inside a trace. Used as a context manager it becomes
+    the current span (children attach to it) and ends on exit; an exception
+    leaving the block marks the span as an error.
+    """
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "start", "duration",
+                 "attributes", "status", "_token")
+
+    sampled = True
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self._token = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, status: Optional[str] = None) -> None:
+        if self.duration is not None:
+            return
+        if status is not None:
+            self.status = status
+        self.duration = time.time() - self.start
+        self.tracer._export(self)
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc_type is not None and self.status == "ok":
+            self.status = "cancelled" if exc_type.__name__ == "CancelledError" else "error"
+            self.attributes["error"] = repr(exc)
+        self.end()
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in for unsampled work: every operation is a no-op."""
+    __slots__ = ()
+    sampled = False
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def end(self, status: Optional[str] = None) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Activation:
+    """Makes an existing span current without ending it (for spans that outlive a block)."""
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span):
+        self.span = span
+
+    def __enter__(self):
+        self._token = _current_span.set(self.span if self.span.sampled else None)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory for querying."""
+    def __init__(self, capacity: int = TRACE_BUFFER_SPANS):
+        self.spans: deque = deque(maxlen=capacity)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def query(self, trace_id: Optional[str] = None, name: Optional[str] = None,
+              min_duration_ms: float = 0.0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Returns recent traces, newest first, each with its spans. Filters
+        apply to the trace's root span (`name`, `min_duration_ms`).
+        """
+        grouped: Dict[str, List[Span]] = {}
+        for span in list(self.spans):
+            if trace_id is None or span.trace_id == trace_id:
+                grouped.setdefault(span.trace_id, []).append(span)
+
+        traces = []
+        for tid, spans in reversed(list(grouped.items())):
+            root = next((s for s in spans if s.parent_id is None), None)
+            if name is not None and (root is None or root.name != name):
+                continue
+            if min_duration_ms and (root is None or root.duration * 1000 < min_duration_ms):
+                continue
+            traces.append({
+                "trace_id": tid,
+                "root": root.name if root else None,
+                "duration_ms": round(root.duration * 1000, 3) if root else None,
+                "spans": [s.to_dict() for s in sorted(spans, key=lambda s: s.start)],
+            })
+            if len(traces) >= limit:
+                break
+        return traces
+
+
+class JsonlFileExporter:
+    """Appends finished spans to a JSON-lines file (buffered, flushed on close)."""
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", buffering=64 * 1024)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """
+    Lightweight span tracer. The sampling decision is made once per trace;
+    inside an unsampled trace (or outside any trace) `span()` returns the
+    shared no-op span, so instrumented code costs one context-var lookup.
+    """
+    def __init__(self, sample_rate: float = TRACE_SAMPLE_RATE, exporters: Optional[List[Any]] = None):
+        self.sample_rate = sample_rate
+        self.exporters = exporters if exporters is not None else []
+        self.started = 0
+        self.sampled = 0
+
+    def start_trace(self, name: str, sampled: Optional[bool] = None, **attributes: Any):
+        """
+        Starts a root span. It is NOT made current: wrap work in
+        `with tracer.use(span)` or `with span` and call `span.end()` when a
+        trace spans several tasks.
+        """
+        self.started += 1
+        if sampled is None:
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        if not sampled:
+            return NOOP_SPAN
+        self.sampled += 1
+        return Span(self, name, _new_id(128), None, attributes)
+
+    def span(self, name: str, **attributes: Any):
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    def use(self, span) -> _Activation:
+        return _Activation(span if span is not None else NOOP_SPAN)
+
+    def current(self):
+        return _current_span.get() or NOOP_SPAN
+
+    def _export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.debug(f"Span export failed: {e}")
+
+    def ring(self) -> Optional[RingBufferExporter]:
+        return next((e for e in self.exporters if isinstance(e, RingBufferExporter)), None)
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            if hasattr(exporter, "close"):
+                exporter.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "trace_incidents": TRACE_INCIDENTS,
+            "traces_started": self.started,
+            "traces_sampled": self.sampled,
+        }
+
+
+def _default_exporters() -> List[Any]:
+    exporters: List[Any] = [RingBufferExporter()]
+    if TRACE_FILE:
+        try:
+            exporters.append(JsonlFileExporter(TRACE_FILE))
+        except OSError as e:
+            logger.error(f"Cannot open trace file {TRACE_FILE}: {e}")
+    return exporters
+
+
+tracer = Tracer(exporters=_default_exporters())
+
+
+def traced(name: str):
+    """Decorator: runs an async function inside a child span of the current trace."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
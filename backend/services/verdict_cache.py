@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from backend.services.cache_service import TTLCache
+from backend.services.metrics_service import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+VERDICT_CACHE_TTL_SECONDS = float(os.getenv("GUARDIAN_VERDICT_CACHE_TTL", "600"))
+VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("GUARDIAN_VERDICT_CACHE_ENTRIES", "2048"))
+# Optional SQLite file so verdicts survive restarts (unset = memory only)
+VERDICT_CACHE_DB = os.getenv("GUARDIAN_VERDICT_CACHE_DB")
+
+VERDICT_LOOKUPS = REGISTRY.counter(
+    "guardian_verdict_cache_lookups",
+    "LLM verdict cache lookups by result.",
+    ("kind", "result"),
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_context(text: str) -> str:
+    """Case, punctuation and spacing differences between captions do not change a verdict."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text.lower())).strip()
+
+
+class VerdictCache:
+    """
+    Caches LLM validation and severity verdicts keyed on the normalized
+    (kind, caption, sign, model, prompt version) tuple. Memory is a
+    TTLCache (LRU + TTL); an optional SQLite layer is written through on
+    every store and consulted on memory misses. SQLite only runs on the
+    cache's own thread: writes are queued there without waiting, and disk
+    reads are awaited off the event loop. Callers only store verdicts that
+    came from a successful call, never fallbacks.
+    """
+    def __init__(self, ttl_seconds: float = VERDICT_CACHE_TTL_SECONDS,
+                 max_entries: int = VERDICT_CACHE_MAX_ENTRIES, db_path: Optional[str] = VERDICT_CACHE_DB):
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache("llm-verdicts", max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.disk_hits = 0
+        if db_path:
+            self._open(db_path)
+        if self.db is not None:
+            # One thread serializes every use of the connection
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verdict-db")
+
+    def _open(self, db_path: str) -> None:
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self.db.execute("DELETE FROM verdicts WHERE expires_at <= ?", (time.time(),))
+            self.db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Verdict cache persistence disabled ({db_path}): {e}")
+            self.db = None
+
+    @staticmethod
+    def key(kind: str, vision_context: str, sign_detected: str, model: str, prompt_version: int) -> Tuple:
+        return (kind, normalize_context(vision_context), sign_detected.strip().upper(), model, prompt_version)
+
+    async def get(self, key: Tuple) -> Any:
+        value = self.memory.get(key)
+        if value is None and self._executor is not None:
+            row = await asyncio.get_running_loop().run_in_executor(self._executor, self._load, key)
+            if row is not None:
+                value, expires_at = row
+                # Warm the memory tier for the rest of the entry's lifetime
+                self.memory.set(key, value, ttl_seconds=expires_at - time.time())
+                self.disk_hits += 1
+        VERDICT_LOOKUPS.labels(kind=key[0], result="miss" if value is None else "hit").inc()
+        return value
+
+    def set(self, key: Tuple, value: Any) -> None:
+        self.memory.set(key, value)
+        if self._executor is not None:
+            # Fire and forget: the verdict is already served from memory
+            self._executor.submit(self._store, json.dumps(key), json.dumps(value), time.time() + self.ttl_seconds)
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        try:
+            self.db.execute(
+                "INSERT OR REPLACE INTO verdicts (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self.db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Verdict cache write failed: {e}")
+
+    def _load(self, key: Tuple) -> Optional[Tuple[Any, float]]:
+        try:
+            row = self.db.execute(
+                "SELECT value, expires_at FROM verdicts WHERE key = ?", (json.dumps(key),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Verdict cache read failed: {e}")
+            return None
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def close(self) -> None:
+        """Finishes the queued writes, then closes the database."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.memory.stats(), "disk_hits": self.disk_hits, "persistent": self.db is not None}
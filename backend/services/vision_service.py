@@ -1,7 +1,10 @@
 import os
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+import heapq
+import itertools
+import time
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Union
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -17,17 +20,214 @@ from azure.ai.vision.imageanalysis.models import VisualFeatures
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
 
+from backend.services.cache_service import TTLCache
+from backend.services.image_signature import perceptual_hash, signatures_available
+from backend.services.metrics_service import STAGE_SECONDS, VISION_REQUESTS
+from backend.services.tracing_service import traced, tracer
+from backend.services.vision_backends import (
+    VisionBackend, LocalPersonDetectorBackend, CascadeVisionBackend, apply_mvp_gesture, empty_result
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class AzureVisionClient:
+VISION_SECONDS = STAGE_SECONDS.labels(stage="vision")
+VISION_CACHE_HITS = VISION_REQUESTS.labels(result="cache_hit")
+VISION_OK = VISION_REQUESTS.labels(result="ok")
+VISION_ERRORS = VISION_REQUESTS.labels(result="error")
+
+# Result cache (keyed by stream + perceptual hash of the frame)
+VISION_CACHE_TTL_SECONDS = float(os.getenv("GUARDIAN_VISION_CACHE_TTL", "30"))
+VISION_CACHE_MAX_ENTRIES = int(os.getenv("GUARDIAN_VISION_CACHE_ENTRIES", "4096"))
+VISION_CACHE_MAX_BYTES = int(os.getenv("GUARDIAN_VISION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Outbound request scheduling (shared by every stream)
+VISION_MAX_CONCURRENCY = int(os.getenv("GUARDIAN_VISION_MAX_CONCURRENCY", "8"))
+VISION_TPS_QUOTA = float(os.getenv("GUARDIAN_VISION_TPS", "10"))
+VISION_DEFAULT_RETRY_AFTER = 1.0
+
+# azure | local | cascade | auto (Azure when configured, else the local detector)
+VISION_BACKEND = os.getenv("GUARDIAN_VISION_BACKEND", "auto").lower()
+
+
+def _estimate_result_size(result: Dict[str, Any]) -> int:
+    """Rough in-memory footprint of an analyze_frame result, for the cache ceiling."""
+    detections = sum(len(result.get(key, [])) for key in ("captions", "objects", "people", "gestures"))
+    return 512 + 256 * detections
+
+
+def _as_bytes(image_bytes: Union[bytes, memoryview]) -> bytes:
     """
-    MVP VERSION: Uses 'Person Detection' to simulate 'Gesture Detection'.
+    The Azure SDK only accepts real bytes. A view spanning a whole bytes
+    object is unwrapped for free; anything else is materialized exactly once.
     """
-    def __init__(self):
+    if isinstance(image_bytes, memoryview):
+        if isinstance(image_bytes.obj, bytes) and image_bytes.nbytes == len(image_bytes.obj):
+            return image_bytes.obj
+        return image_bytes.tobytes()
+    return image_bytes
+
+class VisionRequestScheduler:
+    """
+    Central scheduler for outbound vision requests.
+
+    - Bounded concurrency: at most `max_concurrency` requests in flight.
+    - Token bucket: requests start at no more than `rate_per_second`
+      (the Azure TPS quota), with bursts up to `burst`. A 429 pauses the
+      bucket for the server's Retry-After instead of retrying into a storm.
+    - Weighted fair queuing: each stream's requests get start-time fair
+      queuing tags, so a busy stream cannot starve quiet ones. Streams in
+      an alert state are served ahead of everyone else.
+    """
+    def __init__(self, max_concurrency: int = VISION_MAX_CONCURRENCY,
+                 rate_per_second: float = VISION_TPS_QUOTA, burst: Optional[float] = None):
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1.0, rate_per_second)
+
+        self.tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # (priority class, finish tag, seq, slot future, start tag, enqueued at)
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._finish_tags: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self.weights: Dict[str, float] = {}
+        self.in_flight = 0
+
+        self.submitted = 0
+        self.dispatched = 0
+        self.rate_limited = 0
+        self.wait_ewma = 0.0
+        self.wait_max = 0.0
+
+    def set_weight(self, stream_id: str, weight: float) -> None:
+        self.weights[stream_id] = max(0.01, weight)
+
+    async def run(self, stream_id: str, request: Callable[[], Awaitable[Any]], priority: bool = False) -> Any:
+        """Waits for a fair, quota-compliant slot, then runs `request()` in it."""
+        slot = asyncio.get_running_loop().create_future()
+        start_tag = max(self._virtual_time, self._finish_tags.get(stream_id, 0.0))
+        finish_tag = start_tag + 1.0 / self.weights.get(stream_id, 1.0)
+        self._finish_tags[stream_id] = finish_tag
+        heapq.heappush(self._queue, (0 if priority else 1, finish_tag, next(self._seq), slot, start_tag, time.monotonic()))
+        self.submitted += 1
+        self._pump()
+
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                self._release()  # slot was granted just as we were cancelled
+            raise
+
+        try:
+            return await request()
+        finally:
+            self._release()
+
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        """Called on a 429: stop starting requests until the quota window reopens."""
+        self.rate_limited += 1
+        delay = retry_after if retry_after is not None else VISION_DEFAULT_RETRY_AFTER
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self.tokens = 0.0
+        logger.warning(f"Vision quota exceeded, pausing outbound requests for {delay:.1f}s")
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._pump()
+
+    def _take_token(self, now: float) -> bool:
+        if now < self._paused_until:
+            return False
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate_per_second)
+        self._last_refill = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def _pump(self) -> None:
+        while self._queue and self.in_flight < self.max_concurrency:
+            slot = self._queue[0][3]
+            if slot.cancelled():
+                heapq.heappop(self._queue)
+                continue
+
+            now = time.monotonic()
+            if not self._take_token(now):
+                self._schedule_wakeup(now)
+                return
+
+            _, _, _, slot, start_tag, enqueued_at = heapq.heappop(self._queue)
+            self._virtual_time = max(self._virtual_time, start_tag)
+            self.in_flight += 1
+            self.dispatched += 1
+
+            waited = now - enqueued_at
+            self.wait_ewma += 0.1 * (waited - self.wait_ewma)
+            self.wait_max = max(self.wait_max, waited)
+            slot.set_result(None)
+
+        if not self._queue:
+            # Nobody is waiting: fairness history can be forgotten
+            self._finish_tags.clear()
+
+    def _schedule_wakeup(self, now: float) -> None:
+        if self._wakeup is not None:
+            return
+        if now < self._paused_until:
+            delay = self._paused_until - now
+        else:
+            delay = (1.0 - self.tokens) / self.rate_per_second
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self) -> None:
+        self._wakeup = None
+        self._pump()
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for entry in self._queue if not entry[3].cancelled())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate_per_second,
+            "tokens": round(self.tokens, 2),
+            "paused": time.monotonic() < self._paused_until,
+            "submitted": self.submitted,
+            "dispatched": self.dispatched,
+            "rate_limited": self.rate_limited,
+            "wait_ms_ewma": round(self.wait_ewma * 1000, 1),
+            "wait_ms_max": round(self.wait_max * 1000, 1),
+        }
+
+
+def _retry_after_seconds(error: HttpResponseError) -> Optional[float]:
+    try:
+        return float(error.response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+class AzureImageAnalysisBackend:
+    """
+    Azure AI Vision Image Analysis. Every request goes through the shared
+    VisionRequestScheduler so the TPS quota is respected across streams.
+    """
+    name = "azure"
+
+    def __init__(self, scheduler: Optional[VisionRequestScheduler] = None):
         self.endpoint = os.getenv("AZURE_VISION_ENDPOINT")
         self.key = os.getenv("AZURE_VISION_KEY")
+        self.scheduler = scheduler or VisionRequestScheduler()
 
         if not self.endpoint or not self.key:
             logger.warning("Azure Vision credentials missing.")
@@ -44,38 +244,35 @@ class AzureVisionClient:
             logger.error(f"Failed to initialize AzureVisionClient: {e}")
             self.client = None
 
-    async def analyze_frame(self, image_bytes: bytes) -> Dict[str, Any]:
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    async def analyze(self, image_bytes: Union[bytes, memoryview], stream_id: Optional[str] = None,
+                      priority: bool = False) -> Dict[str, Any]:
         """
         Analyzes frame. IF A PERSON IS DETECTED, IT FORCES A 'HELP' GESTURE.
         """
         # Default empty response
-        response_data = {
-            "captions": [],
-            "objects": [],
-            "people": [],
-            "gestures": [],
-            "metadata": {"width": 0, "height": 0, "model_version": "mvp_bypass"}
-        }
+        response_data = empty_result()
 
         if not self.client:
             return response_data
 
         try:
-            # 1. Run Standard Azure Vision (This works!)
-            result = await self.client.analyze(
-                image_data=image_bytes,
-                visual_features=[VisualFeatures.OBJECTS, VisualFeatures.PEOPLE]
+            # 1. Run Standard Azure Vision (This works!), in a fair, quota-compliant slot
+            result = await self.scheduler.run(
+                stream_id or "",
+                lambda: self.client.analyze(
+                    image_data=_as_bytes(image_bytes),
+                    visual_features=[VisualFeatures.OBJECTS, VisualFeatures.PEOPLE]
+                ),
+                priority=priority
             )
 
             # 2. Populate Standard Data
-            person_detected = False
-            
             if result.people:
                 for person in result.people.list:
-                    # If we see a person with > 50% confidence
-                    if person.confidence > 0.5:
-                        person_detected = True
-                        
                     response_data["people"].append({
                         "confidence": person.confidence,
                         "box": {
@@ -99,14 +296,8 @@ class AzureVisionClient:
                         }
                     })
 
-            # 3. THE HARDCODE HACK:
-            # If a person is in the frame, we pretend they are signing "HELP".
-            if person_detected:
-                print(">>> MVP TRIGGER: Person detected -> Injecting 'HELP' Gesture")
-                response_data["gestures"].append({
-                    "tag": "HELP",
-                    "probability": 0.98  # Fake high confidence
-                })
+            # 3. THE HARDCODE HACK (person with > 50% confidence -> 'HELP')
+            apply_mvp_gesture(response_data)
 
             # Fill metadata
             response_data["metadata"] = {
@@ -117,10 +308,115 @@ class AzureVisionClient:
             
             return response_data
 
+        except HttpResponseError as e:
+            logger.error(f"Error in analyze_frame: {str(e)}")
+            if e.status_code == 429:
+                self.scheduler.backoff(_retry_after_seconds(e))
+            # Surfaced so callers can back off on quota errors
+            response_data["metadata"]["error"] = "rate_limited" if e.status_code == 429 else "http_error"
+            return response_data
+
         except Exception as e:
             logger.error(f"Error in analyze_frame: {str(e)}")
+            response_data["metadata"]["error"] = "error"
             return response_data
 
     async def close(self):
         if self.client:
-            await self.client.close()
\ No newline at end of file
+            await self.client.close()
+
+
+class AzureVisionClient:
+    """
+    MVP VERSION: Uses 'Person Detection' to simulate 'Gesture Detection'.
+
+    Front door for frame analysis: a per-stream result cache in front of a
+    pluggable VisionBackend (Azure, the local CPU detector, or a cascade of
+    both, selected with GUARDIAN_VISION_BACKEND).
+    """
+    def __init__(self, backend: Optional[VisionBackend] = None):
+        self.cache = TTLCache(
+            "vision_results",
+            max_entries=VISION_CACHE_MAX_ENTRIES,
+            ttl_seconds=VISION_CACHE_TTL_SECONDS,
+            max_bytes=VISION_CACHE_MAX_BYTES,
+            sizeof=_estimate_result_size
+        )
+
+        self.azure = AzureImageAnalysisBackend()
+        self.client = self.azure.client
+        self.scheduler = self.azure.scheduler
+        self.backend = backend or self._select_backend(VISION_BACKEND)
+        logger.info(f"Vision backend: {self.backend.name}")
+
+    def _select_backend(self, mode: str) -> VisionBackend:
+        if mode == "azure":
+            return self.azure
+
+        local = LocalPersonDetectorBackend()
+        if not local.available:
+            if mode in ("local", "cascade"):
+                logger.warning("OpenCV not installed, local person detector unavailable. Using Azure.")
+            return self.azure
+
+        if mode == "local":
+            return local
+        if mode == "cascade":
+            return CascadeVisionBackend(local, self.azure)
+
+        # auto
+        if self.azure.available:
+            return self.azure
+        logger.warning("Azure Vision not configured, falling back to the local person detector.")
+        return local
+
+    @traced("vision.analyze")
+    async def analyze_frame(self, image_bytes: Union[bytes, memoryview], stream_id: Optional[str] = None,
+                            priority: bool = False, changed: bool = False,
+                            frame_hash: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyzes frame, answering near-identical frames from the result cache.
+        Cache entries are scoped per stream; results are shared and must be treated as read-only.
+        Cache misses go to the configured backend; `priority` marks a stream in an alert state.
+        `changed` means the caller already saw the scene change (the frame difference gate):
+        the cache is not consulted, since a 64-bit hash can collide across very different
+        frames (an empty room and one with a person lying in it), and the fresh result
+        replaces the cached one. A `frame_hash` already computed by the caller saves a decode.
+        Accepts bytes or a memoryview (binary /ws/stream frames are passed through uncopied).
+        """
+        with VISION_SECONDS.time():
+            if not self.backend.available or not signatures_available():
+                return self._count(await self.backend.analyze(image_bytes, stream_id, priority))
+
+            if frame_hash is None:
+                frame_hash = await asyncio.to_thread(perceptual_hash, image_bytes)
+            if frame_hash is None:
+                return self._count(await self.backend.analyze(image_bytes, stream_id, priority))
+
+            key = (stream_id or "", frame_hash)
+            cached = None if changed else self.cache.get(key)
+            if cached is not None:
+                VISION_CACHE_HITS.inc()
+                tracer.current().set(cache="hit")
+                return cached
+
+            result = self._count(await self.backend.analyze(image_bytes, stream_id, priority))
+            if not result["metadata"].get("error"):
+                self.cache.set(key, result)
+            return result
+
+    @staticmethod
+    def _count(result: Dict[str, Any]) -> Dict[str, Any]:
+        (VISION_ERRORS if result["metadata"].get("error") else VISION_OK).inc()
+        return result
+
+    async def analyze_frames(self, frames: List[Union[bytes, memoryview]], stream_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Batch/offline entry point. Goes through the same cache as analyze_frame.
+        """
+        return list(await asyncio.gather(*(self.analyze_frame(frame, stream_id) for frame in frames)))
+
+    async def close(self):
+        if self.backend is not self.azure:
+            await self.backend.close()
+        await self.azure.close()
@@ -0,0 +1,282 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Dict, Optional
+
+from backend.frame_gate import FrameDifferenceGate
+from backend.rate_control import AdaptiveRateController, FrameBudget
+from backend.temporal_voting import TemporalVoter
+from backend.services.metrics_service import STAGE_SECONDS
+from backend.services.tracing_service import tracer
+
+logger = logging.getLogger(__name__)
+
+# Temporal window / FSM defaults (per stream)
+FRAME_HISTORY_SIZE = 10
+COOLDOWN_SECONDS = 30.0
+MAX_STREAM_SESSIONS = 1000
+
+WS_SEND_SECONDS = STAGE_SECONDS.labels(stage="ws_send")
+
+
+class EmergencyState(Enum):
+    IDLE = "IDLE"
+    CONFIRMED = "CONFIRMED"
+    COOLDOWN = "COOLDOWN"
+
+
+class FrameMailbox:
+    """
+    Single-slot, latest-frame-wins handoff between the socket reader and the
+    analyzer. Putting a frame while one is pending replaces it, so the
+    analyzer never works through a backlog of stale frames.
+    """
+    def __init__(self):
+        self._frame: Any = None
+        self._ready = asyncio.Event()
+
+    def put(self, frame: Any) -> bool:
+        """Stores the frame. Returns True if it superseded an unanalyzed one."""
+        superseded = self._frame is not None
+        self._frame = frame
+        self._ready.set()
+        return superseded
+
+    @property
+    def pending(self) -> Any:
+        """The frame waiting to be analyzed, if any."""
+        return self._frame
+
+    async def wait(self) -> None:
+        await self._ready.wait()
+
+    def take(self) -> Any:
+        """Returns the freshest pending frame (or None) and empties the slot."""
+        frame = self._frame
+        self._frame = None
+        self._ready.clear()
+        return frame
+
+
+class StreamSession:
+    """
+    Everything that belongs to one camera stream: its temporal window, its
+    emergency FSM, its analysis rate controller, its frame mailbox and analyzer task,
+    and its counters. Sessions never share state, so one camera's votes or
+    cooldown cannot affect another.
+    """
+    def __init__(self, stream_id: str, budget: Optional[FrameBudget] = None):
+        self.stream_id = stream_id
+        self.created_at = time.time()
+
+        # Attached WebSocket clients, each with its own send lock
+        self.clients: Dict[Any, asyncio.Lock] = {}
+
+        self.mailbox = FrameMailbox()
+        self.analyzer_task: Optional[asyncio.Task] = None
+
+        # Temporal gesture votes; frame_history keeps the recent tags for display
+        self.voter = TemporalVoter()
+        self.frame_history = deque(maxlen=FRAME_HISTORY_SIZE)
+
+        # Finite State Machine
+        self.state = EmergencyState.IDLE
+        self.last_trigger_time = 0.0
+
+        # Reasoning started ahead of the trigger (a brain_service Speculation), if pre-armed
+        self.speculation: Optional[Any] = None
+
+        # Latest incident of this stream, and its running follow-up re-evaluation
+        self.incident: Optional[Any] = None
+        self.follow_up_task: Optional[asyncio.Task] = None
+
+        # Adaptive analysis rate, drawing on the shared frame budget
+        self.rate = AdaptiveRateController(stream_id, budget)
+
+        # Reuses the last analysis while the scene is unchanged
+        self.gate = FrameDifferenceGate()
+
+        # Fixed set of counters so per-session memory stays constant
+        self.metrics: Dict[str, Any] = {
+            "frames_received": 0,
+            "frames_superseded": 0,
+            "frames_analyzed": 0,
+            "frames_skipped": 0,
+            "last_frame_age_ms": None,
+            "frame_errors": 0,
+            "emergencies_confirmed": 0,
+            "last_frame_at": None,
+        }
+
+    @property
+    def connections(self) -> int:
+        return len(self.clients)
+
+    def start_analyzer(self, analyzer: Awaitable[None]) -> None:
+        """Runs the stream's analyzer loop once, no matter how many clients attach."""
+        if self.analyzer_task is None:
+            self.analyzer_task = asyncio.create_task(analyzer)
+        else:
+            analyzer.close()
+
+    def shutdown(self) -> None:
+        if self.analyzer_task is not None:
+            self.analyzer_task.cancel()
+            self.analyzer_task = None
+        self.discard_speculation()
+        if self.follow_up_task is not None:
+            self.follow_up_task.cancel()
+            self.follow_up_task = None
+        self.rate.release()
+
+    async def send(self, client: Any, payload: Dict[str, Any]) -> None:
+        """Sends JSON to one client, serialized with any other sender on that socket."""
+        lock = self.clients.get(client)
+        if lock is None:
+            return
+        async with lock:
+            with WS_SEND_SECONDS.time():
+                await client.send_json(payload)
+
+    async def broadcast(self, payload: Dict[str, Any]) -> None:
+        with tracer.span("ws.broadcast", clients=len(self.clients)):
+            for client in list(self.clients):
+                try:
+                    await self.send(client, payload)
+                except Exception as e:
+                    logger.warning(f"[{self.stream_id}] Dropping client after send failure: {e}")
+                    self.clients.pop(client, None)
+
+    def take_speculation(self, sign: str) -> Optional[Any]:
+        """Hands the pre-armed run over to the incident confirming `sign`."""
+        speculation, self.speculation = self.speculation, None
+        if speculation is not None and speculation.sign_detected != sign:
+            speculation.discard()
+            return None
+        return speculation
+
+    def discard_speculation(self) -> None:
+        if self.speculation is not None:
+            logger.info(f"[{self.stream_id}] Pre-armed {self.speculation.sign_detected} run discarded")
+            self.speculation.discard()
+            self.speculation = None
+
+    def in_alert(self) -> bool:
+        """Alerting or accumulating emergency votes: such streams get scheduling priority."""
+        return self.state == EmergencyState.CONFIRMED or self.rate.arming
+
+    def confirm_emergency(self, emergency_triggered: bool, current_time: Optional[float] = None) -> bool:
+        """
+        Hysteresis & State Machine.
+        Returns True only on the IDLE -> CONFIRMED transition.
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        if self.state != EmergencyState.IDLE:
+            if (current_time - self.last_trigger_time) > COOLDOWN_SECONDS:
+                self.state = EmergencyState.IDLE
+                logger.info(f"[{self.stream_id}] System State Reset to IDLE")
+
+        if not emergency_triggered:
+            return False
+
+        if self.state == EmergencyState.IDLE:
+            logger.warning(f"[{self.stream_id}] EMERGENCY TRIGGERED - CONFIRMED")
+            self.state = EmergencyState.CONFIRMED
+            self.last_trigger_time = current_time
+            self.metrics["emergencies_confirmed"] += 1
+            return True
+
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "stream_id": self.stream_id,
+            "state": self.state.value,
+            "connections": self.connections,
+            "window": list(self.frame_history),
+            "votes": self.voter.snapshot(),
+            "prearmed": self.speculation.sign_detected if self.speculation is not None else None,
+            "rate": self.rate.snapshot(),
+            "skip_ratio": self.skip_ratio(),
+            **self.metrics,
+        }
+
+    def skip_ratio(self) -> float:
+        """Share of processed frames answered by the difference gate instead of the vision backend."""
+        processed = self.metrics["frames_analyzed"] + self.metrics["frames_skipped"]
+        return round(self.metrics["frames_skipped"] / processed, 3) if processed else 0.0
+
+
+class SessionLimitReached(RuntimeError):
+    """Raised when the registry is already serving MAX_STREAM_SESSIONS streams."""
+
+
+class StreamSessionRegistry:
+    """
+    Stream sessions keyed by stream/camera id.
+    A session lives as long as at least one connection holds it.
+    """
+    def __init__(self, max_sessions: int = MAX_STREAM_SESSIONS, budget: Optional[FrameBudget] = None):
+        self.max_sessions = max_sessions
+        self.budget = budget if budget is not None else FrameBudget()
+        self._sessions: Dict[str, StreamSession] = {}
+        self._anonymous_ids = itertools.count(1)
+
+    def open(self, stream_id: Optional[str], client: Any) -> StreamSession:
+        """
+        Attaches a client connection to the session for `stream_id`, creating
+        it if needed. Connections without a stream id get a private session.
+        """
+        if not stream_id:
+            stream_id = f"conn-{next(self._anonymous_ids)}"
+
+        session = self._sessions.get(stream_id)
+        if session is None:
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionLimitReached(f"Stream limit reached ({self.max_sessions})")
+            session = StreamSession(stream_id, self.budget)
+            self._sessions[stream_id] = session
+            logger.info(f"Stream session opened: {stream_id}")
+
+        session.clients[client] = asyncio.Lock()
+        return session
+
+    def close(self, session: StreamSession, client: Any) -> bool:
+        """
+        Detaches a connection; the session is shut down with its last connection.
+        Returns True if the session was shut down.
+        """
+        session.clients.pop(client, None)
+        if not session.clients and self._sessions.get(session.stream_id) is session:
+            del self._sessions[session.stream_id]
+            session.shutdown()
+            logger.info(f"Stream session closed: {session.stream_id}")
+            return True
+        return False
+
+    def shutdown(self) -> None:
+        for session in list(self._sessions.values()):
+            session.shutdown()
+        self._sessions.clear()
+
+    def get(self, stream_id: str) -> Optional[StreamSession]:
+        return self._sessions.get(stream_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self):
+        return iter(list(self._sessions.values()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "budget": self.budget.snapshot(),
+            "sessions": [session.snapshot() for session in self._sessions.values()],
+        }
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Per-tag rules; see gesture_rules.json for the format
+GESTURE_RULES_PATH = os.getenv("GUARDIAN_GESTURE_RULES", os.path.join(current_dir, "gesture_rules.json"))
+
+NEUTRAL_TAG = "Neutral"
+
+# Built-in defaults, identical to the original hard-coded trigger:
+# 10-frame window, more than 7 HELP votes, probability above 0.5, window must be full.
+# prearm_votes starts the reasoning early (0 disables pre-arming).
+DEFAULT_RULE = {
+    "window": 10,
+    "min_votes": 8,
+    "min_probability": 0.5,
+    "require_full_window": True,
+    "ewma_alpha": 0.3,
+    "min_score": 0.0,
+    "prearm_votes": 5,
+}
+DEFAULT_RULES = [{"tag": "HELP"}]
+
+
+class TagRule:
+    """
+    Trigger rule for one gesture tag: the tag fires once at least `min_votes`
+    of the last `window` frames voted for it. A frame votes for the tag when
+    it is the frame's best gesture with probability above `min_probability`.
+    `min_score` optionally also requires the confidence-weighted EWMA of the
+    tag to reach a level (0 disables the check).
+    The tag is pre-armed once it has `prearm_votes` votes, so the emergency
+    reasoning can start before the trigger confirms; it disarms when the
+    votes fall back below `prearm_votes - 1` (0 disables pre-arming).
+    """
+    def __init__(self, tag: str, window: int = 10, min_votes: int = 8, min_probability: float = 0.5,
+                 require_full_window: bool = True, ewma_alpha: float = 0.3, min_score: float = 0.0,
+                 prearm_votes: int = 5):
+        if window < 1 or not 1 <= min_votes <= window:
+            raise ValueError(f"Invalid rule for {tag}: window={window}, min_votes={min_votes}")
+        if prearm_votes < 0:
+            raise ValueError(f"Invalid rule for {tag}: prearm_votes={prearm_votes}")
+        self.tag = tag
+        self.window = window
+        self.min_votes = min_votes
+        self.min_probability = min_probability
+        self.require_full_window = require_full_window
+        self.ewma_alpha = ewma_alpha
+        self.min_score = min_score
+        # Never later than the trigger itself (the shared default may exceed a short rule's min_votes)
+        self.prearm_votes = min(prearm_votes, min_votes)
+
+    @classmethod
+    def from_config(cls, entry: Dict[str, Any], defaults: Dict[str, Any]) -> "TagRule":
+        merged = {**DEFAULT_RULE, **defaults, **entry}
+        return cls(
+            tag=merged["tag"],
+            window=int(merged["window"]),
+            min_votes=int(merged["min_votes"]),
+            min_probability=float(merged["min_probability"]),
+            require_full_window=bool(merged["require_full_window"]),
+            ewma_alpha=float(merged["ewma_alpha"]),
+            min_score=float(merged["min_score"]),
+            prearm_votes=int(merged["prearm_votes"]),
+        )
+
+
+def load_gesture_rules(path: Optional[str] = GESTURE_RULES_PATH) -> List[TagRule]:
+    """
+    Reads {"defaults": {...}, "rules": [{"tag": "HELP", ...}, ...]}.
+    Falls back to the built-in HELP rule when the file is missing or invalid.
+    """
+    config: Dict[str, Any] = {"defaults": {}, "rules": DEFAULT_RULES}
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot read gesture rules from {path}, using defaults: {e}")
+    try:
+        defaults = config.get("defaults", {})
+        return [TagRule.from_config(entry, defaults) for entry in config.get("rules", DEFAULT_RULES)]
+    except (KeyError, TypeError, ValueError) as e:
+        logger.error(f"Invalid gesture rules, using defaults: {e}")
+        return [TagRule.from_config(entry, {}) for entry in DEFAULT_RULES]
+
+
+GESTURE_RULES = load_gesture_rules()
+
+
+class _TagWindow:
+    """
+    Fixed ring buffer of one tag's recent votes with running totals, so
+    pushing a frame and reading the vote count are O(1) whatever the window.
+    """
+    __slots__ = ("rule", "weights", "index", "filled", "votes", "weight_sum", "score", "armed")
+
+    def __init__(self, rule: TagRule):
+        self.rule = rule
+        self.weights = [0.0] * rule.window  # vote probability, 0.0 = no vote
+        self.index = 0
+        self.filled = 0
+        self.votes = 0
+        self.weight_sum = 0.0
+        self.score = 0.0
+        self.armed = False
+
+    def push(self, probability: float) -> None:
+        evicted = self.weights[self.index]
+        if evicted > 0.0:
+            self.votes -= 1
+            self.weight_sum -= evicted
+        if probability > 0.0:
+            self.votes += 1
+            self.weight_sum += probability
+        self.weights[self.index] = probability
+        self.index = (self.index + 1) % self.rule.window
+        if self.filled < self.rule.window:
+            self.filled += 1
+        alpha = self.rule.ewma_alpha
+        self.score = alpha * probability + (1.0 - alpha) * self.score
+
+        # One vote of hysteresis so a window hovering at the threshold does not re-arm every frame
+        prearm_votes = self.rule.prearm_votes
+        if prearm_votes:
+            if self.votes >= prearm_votes:
+                self.armed = True
+            elif self.votes < prearm_votes - 1:
+                self.armed = False
+
+    def triggered(self) -> bool:
+        rule = self.rule
+        if rule.require_full_window and self.filled < rule.window:
+            return False
+        return self.votes >= rule.min_votes and self.score >= rule.min_score
+
+    def reset(self) -> None:
+        self.weights = [0.0] * self.rule.window
+        self.index = self.filled = self.votes = 0
+        self.weight_sum = self.score = 0.0
+        self.armed = False
+
+
+class VoteDecision:
+    __slots__ = ("tag", "probability", "triggered", "prearm", "votes", "scores")
+
+    def __init__(self, tag: str, probability: float, triggered: Optional[str],
+                 votes: Dict[str, int], scores: Dict[str, float], prearm: Optional[str] = None):
+        self.tag = tag                # this frame's tag (NEUTRAL_TAG when nothing qualified)
+        self.probability = probability
+        self.triggered = triggered    # first tag whose rule fired on this frame, if any
+        self.prearm = prearm          # first tag past its pre-arm threshold, if any
+        self.votes = votes
+        self.scores = scores
+
+    @property
+    def pending(self) -> bool:
+        """Some tag has votes in its window but has not fired yet."""
+        return self.triggered is None and any(self.votes.values())
+
+
+class TemporalVoter:
+    """
+    Per-stream temporal gesture detector. Each frame's best gesture is one
+    vote; every configured tag keeps its own window, counters and EWMA.
+    """
+    def __init__(self, rules: Optional[Iterable[TagRule]] = None):
+        self.rules = list(rules) if rules is not None else GESTURE_RULES
+        self._windows = {rule.tag: _TagWindow(rule) for rule in self.rules}
+        # Tags without a rule are still reported when above the default probability
+        self.default_min_probability = DEFAULT_RULE["min_probability"]
+
+    def observe(self, gestures: List[Dict[str, Any]]) -> VoteDecision:
+        tag, probability = NEUTRAL_TAG, 0.0
+        if gestures:
+            best = max(gestures, key=lambda g: g["probability"])
+            window = self._windows.get(best["tag"])
+            threshold = window.rule.min_probability if window else self.default_min_probability
+            if best["probability"] > threshold:
+                tag, probability = best["tag"], float(best["probability"])
+
+        triggered = prearm = None
+        for window_tag, window in self._windows.items():
+            window.push(probability if window_tag == tag else 0.0)
+            if triggered is None and window.triggered():
+                triggered = window_tag
+            if prearm is None and window.armed:
+                prearm = window_tag
+
+        return VoteDecision(
+            tag, probability, triggered,
+            {t: w.votes for t, w in self._windows.items()},
+            {t: round(w.score, 3) for t, w in self._windows.items()},
+            prearm,
+        )
+
+    def votes(self, tag: str) -> int:
+        window = self._windows.get(tag)
+        return window.votes if window else 0
+
+    def reset(self) -> None:
+        for window in self._windows.values():
+            window.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            tag: {"votes": w.votes, "window": w.rule.window, "filled": w.filled, "score": round(w.score, 3),
+                  "armed": w.armed}
+            for tag, w in self._windows.items()
+        }
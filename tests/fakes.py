@@ -0,0 +1,146 @@
+"""
+Stand-ins shared by the test suite: an async-only Gemini client, a
+blocking speech synthesizer, and builders for orchestrators, voice
+clients and JPEG frames. Import with `from tests.fakes import ...` after
+the usual project_root sys.path insert.
+"""
+import asyncio
+import io
+import json
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import azure.cognitiveservices.speech as speechsdk
+from PIL import Image, ImageDraw
+
+from backend.services.audio_store import AudioStore
+from backend.services.brain_service import CrisisOrchestrator
+from backend.services.phrase_cache import SAMPLE_RATE, wav_from_pcm
+from backend.services.speech_service import GuardianVoiceClient, SynthesizerPool
+
+FUSED_VERDICT = {
+    "valid": True,
+    "severity": 9,
+    "sbar": {
+        "situation": "Person signing HELP.",
+        "background": "Asthma.",
+        "assessment": "Respiratory distress likely.",
+        "recommendation": "Dispatch EMS.",
+    },
+}
+REPORT = "SITUATION: test\nBACKGROUND: test\nASSESSMENT: test\nRECOMMENDATION: test"
+# 0.1 s of speech, as the synthesizer returns it
+TENTH_SECOND_WAV = wav_from_pcm(b"\x01\x00" * (SAMPLE_RATE // 10))
+
+
+class FakeGemini:
+    """
+    Async-only Gemini stand-in: answers by prompt kind after a delay (per
+    kind in `delays`), records every request and counts cancellations.
+    Set `fail` to make every call raise.
+    """
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.delays = {}
+        self.chunk_delay = 0.01
+        self.verdict = "VALID"
+        self.severity = "7"
+        self.fused_text = json.dumps(FUSED_VERDICT)
+        self.report = REPORT
+        self.fail = False
+        self.calls = 0
+        self.cancelled = 0
+        self.requests = []
+        self.aio = SimpleNamespace(models=SimpleNamespace(
+            generate_content=self.generate_content, generate_content_stream=self.generate_content_stream
+        ))
+        # Any use of the blocking client is a bug
+        self.models = None
+
+    @staticmethod
+    def _kind(contents, config) -> str:
+        if config is not None and getattr(config, "response_json_schema", None):
+            return "fused"
+        if "Return 'VALID'" in contents:
+            return "validate"
+        if "Output ONLY the number" in contents:
+            return "severity"
+        return "report"
+
+    def _request(self, contents) -> None:
+        self.calls += 1
+        self.requests.append(contents)
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+
+    async def generate_content(self, model, contents, config=None):
+        self._request(contents)
+        kind = self._kind(contents, config)
+        try:
+            await asyncio.sleep(self.delays.get(kind, self.delay))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        text = {"fused": self.fused_text, "validate": self.verdict, "severity": self.severity}.get(kind, self.report)
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(prompt_token_count=40))
+
+    async def generate_content_stream(self, model, contents, config=None):
+        self._request(contents)
+
+        async def chunks():
+            try:
+                # Time to the first token, then one line per chunk
+                await asyncio.sleep(self.delays.get("report", self.delay))
+                for line in self.report.splitlines(keepends=True):
+                    await asyncio.sleep(self.chunk_delay)
+                    yield SimpleNamespace(text=line)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+
+        return chunks()
+
+
+def make_orchestrator(delay: float = 0.0, **attributes) -> CrisisOrchestrator:
+    """A CrisisOrchestrator on a FakeGemini; keyword arguments replace its attributes."""
+    orchestrator = CrisisOrchestrator()
+    orchestrator.client = FakeGemini(delay)
+    orchestrator.speech_config = None
+    for name, value in attributes.items():
+        setattr(orchestrator, name, value)
+    return orchestrator
+
+
+class BlockingSynthesizer:
+    """Blocks its thread like the real SDK's `.get()`, then returns `audio` (default: RIFF + the SSML)."""
+    def __init__(self, delay: float = 0.0, audio: bytes = None):
+        self.delay = delay
+        self.audio = audio
+
+    def speak_ssml_async(self, ssml):
+        def get():
+            time.sleep(self.delay)
+            audio = self.audio if self.audio is not None else b"RIFF" + ssml.encode()
+            return SimpleNamespace(reason=speechsdk.ResultReason.SynthesizingAudioCompleted, audio_data=audio)
+        return SimpleNamespace(get=get)
+
+
+def make_voice_client(tmp: str, create_synthesizer, size: int) -> GuardianVoiceClient:
+    """A configured GuardianVoiceClient storing into `tmp`, synthesizing on a pool of stand-ins."""
+    with patch.dict(os.environ, {"AZURE_SPEECH_KEY": "test-key", "AZURE_SPEECH_REGION": "eastus"}):
+        client = GuardianVoiceClient(store=AudioStore(spill_dir=tmp))
+    client.close()
+    client.pool = SynthesizerPool(create_synthesizer, size=size)
+    return client
+
+
+def make_jpeg(size=(640, 480), background=(90, 90, 90), box=None, fill=(240, 240, 240), quality=75) -> bytes:
+    """A flat frame, optionally with a filled rectangle `box` (x0, y0, x1, y1) in it."""
+    image = Image.new("RGB", size, background)
+    if box:
+        ImageDraw.Draw(image).rectangle(box, fill=fill)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
@@ -0,0 +1,462 @@
+"""
+Multi-camera load generator for /ws/stream.
+
+Opens N concurrent camera connections, replays JPEG frames over the binary
+frame protocol at a fixed rate, and reports latency percentiles, frame
+accounting, response throughput, event-loop lag and process RSS.
+
+By default the backend runs in-process (in its own thread and event loop)
+with stand-in vision and Gemini backends whose latency follows a
+configurable distribution, so no cloud credentials or quota are needed:
+
+    python tests/simulations/ws_load_generator.py --cameras 50 --fps 2 --duration 30 \\
+        --vision-latency lognormal:0.25,0.4 --llm-latency lognormal:1.5,0.3 \\
+        --json load_report.json --csv load_report.csv
+
+Point --url at a running server to load-test a real deployment instead
+(only client-side numbers are reported in that mode).
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import aiohttp
+import psutil
+
+from backend.frame_protocol import pack_frame
+
+
+# ==========================================
+# LATENCY DISTRIBUTIONS
+# ==========================================
+
+class LatencyDistribution:
+    """
+    Parses "const:0.2", "uniform:0.1,0.4", "normal:0.3,0.05" or
+    "lognormal:<median>,<sigma>" (all in seconds).
+    """
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+
+    def sample(self) -> float:
+        if self.kind == "const":
+            return self.params[0]
+        if self.kind == "uniform":
+            return random.uniform(self.params[0], self.params[1])
+        if self.kind == "normal":
+            return max(0.0, random.gauss(self.params[0], self.params[1]))
+        if self.kind == "lognormal":
+            return random.lognormvariate(math.log(self.params[0]), self.params[1])
+        raise ValueError(f"Unknown latency distribution: {self.spec}")
+
+
+class StageRecorder:
+    """Thread-safe latency samples per stage (server and clients run on different threads)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: summarize(values) for stage, values in self.samples.items()}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 2),
+    }
+
+
+# ==========================================
+# STAND-IN BACKENDS
+# ==========================================
+
+class StandInVisionBackend:
+    """VisionBackend with synthetic latency; reports a person on a fraction of frames."""
+    name = "stand-in"
+    available = True
+
+    def __init__(self, latency: LatencyDistribution, person_ratio: float, recorder: StageRecorder):
+        self.latency = latency
+        self.person_ratio = person_ratio
+        self.recorder = recorder
+
+    async def analyze(self, image_bytes, stream_id=None, priority=False) -> Dict[str, Any]:
+        from backend.services.vision_backends import apply_mvp_gesture, empty_result
+
+        delay = self.latency.sample()
+        await asyncio.sleep(delay)
+        self.recorder.record("vision", delay)
+
+        result = empty_result(self.name)
+        if random.random() < self.person_ratio:
+            result["people"].append({"confidence": 0.9, "box": {"x": 10, "y": 10, "w": 100, "h": 300}})
+            result["captions"].append({"text": "A person signaling for help", "confidence": 0.9})
+        apply_mvp_gesture(result)
+        return result
+
+    async def close(self) -> None:
+        pass
+
+
+def _stand_in_text(contents: Any, config: Any = None) -> str:
+    if config is not None and getattr(config, "response_json_schema", None):
+        return json.dumps({"valid": True, "severity": 9, "sbar": {
+            "situation": "Person signaling for help.", "background": "Load test.",
+            "assessment": "Synthetic incident.", "recommendation": "None, this is a simulation."}})
+    prompt = str(contents)
+    if "Return 'VALID'" in prompt:
+        return "VALID"
+    if "Output ONLY the number" in prompt:
+        return "9"
+    return ("SITUATION: Person signaling for help.\nBACKGROUND: Load test.\n"
+            "ASSESSMENT: Synthetic incident.\nRECOMMENDATION: None, this is a simulation.")
+
+
+class StandInGeminiClient:
+    """
+    Mimics google.genai.Client closely enough for CrisisOrchestrator:
+    `models.generate_content` blocks the calling thread like the real sync
+    client, `aio.models.generate_content` sleeps asynchronously and
+    and `aio.models.generate_content_stream` spreads that delay over a few chunks.
+    """
+    def __init__(self, latency: LatencyDistribution, recorder: StageRecorder):
+        self.latency = latency
+        self.recorder = recorder
+        self.models = SimpleNamespace(generate_content=self._generate_sync)
+        self.aio = SimpleNamespace(models=SimpleNamespace(
+            generate_content=self._generate_async, generate_content_stream=self._generate_stream
+        ))
+
+    def _generate_sync(self, model: str, contents: Any, config: Any = None):
+        delay = self.latency.sample()
+        time.sleep(delay)
+        self.recorder.record("llm", delay)
+        return SimpleNamespace(text=_stand_in_text(contents, config))
+
+    async def _generate_async(self, model: str, contents: Any, config: Any = None):
+        delay = self.latency.sample()
+        await asyncio.sleep(delay)
+        self.recorder.record("llm", delay)
+        return SimpleNamespace(text=_stand_in_text(contents, config))
+
+    async def _generate_stream(self, model: str, contents: Any, config: Any = None):
+        delay = self.latency.sample()
+        words = _stand_in_text(contents, config).split(" ")
+        chunk_size = max(1, len(words) // 4)
+
+        async def chunks():
+            for start in range(0, len(words), chunk_size):
+                await asyncio.sleep(delay * chunk_size / len(words))
+                text = " ".join(words[start:start + chunk_size])
+                yield SimpleNamespace(text=text if start == 0 else " " + text)
+            self.recorder.record("llm", delay)
+
+        return chunks()
+
+
+# ==========================================
+# IN-PROCESS SERVER
+# ==========================================
+
+class InProcessServer:
+    """Runs backend.main:app under uvicorn on its own thread and event loop."""
+    def __init__(self, args, recorder: StageRecorder):
+        import uvicorn
+        import backend.main as main
+        from backend.services.brain_service import CrisisOrchestrator
+
+        self.main = main
+        main.vision_client.backend = StandInVisionBackend(
+            LatencyDistribution(args.vision_latency), args.person_ratio, recorder
+        )
+        orchestrator = CrisisOrchestrator()
+        orchestrator.client = StandInGeminiClient(LatencyDistribution(args.llm_latency), recorder)
+        orchestrator.speech_config = None
+        if args.reasoning_mode:
+            orchestrator.reasoning_mode = args.reasoning_mode
+        main.master_agent.crisis_orchestrator = orchestrator
+        main.master_agent.voice_client = None
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+
+        self.server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=self.port,
+                                                    log_level="warning", loop="asyncio"))
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.serve())
+
+    async def start(self) -> str:
+        self.thread.start()
+        while not self.server.started:
+            await asyncio.sleep(0.05)
+        return f"ws://127.0.0.1:{self.port}/ws/stream"
+
+    def stream_snapshot(self) -> Dict[str, Any]:
+        future = asyncio.run_coroutine_threadsafe(self._snapshot(), self.loop)
+        return future.result(timeout=5)
+
+    async def _snapshot(self) -> Dict[str, Any]:
+        return self.main.stream_sessions.snapshot()
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def monitor_loop_lag(loop: asyncio.AbstractEventLoop, recorder: StageRecorder, stop: threading.Event,
+                     interval: float = 0.05) -> None:
+    """
+    Measures event-loop lag from outside the loop: how long a callback
+    posted with call_soon_threadsafe waits before it runs.
+    """
+    while not stop.is_set():
+        posted = time.perf_counter()
+        ran = threading.Event()
+        loop.call_soon_threadsafe(lambda: (recorder.record("event_loop_lag", time.perf_counter() - posted), ran.set()))
+        ran.wait(timeout=5)
+        stop.wait(interval)
+
+
+# ==========================================
+# CLIENTS
+# ==========================================
+
+def load_frames(frames_dir: Optional[str], static: bool) -> List[bytes]:
+    """Real JPEGs from a directory, or synthetic frames with a moving subject."""
+    if frames_dir:
+        names = sorted(n for n in os.listdir(frames_dir) if n.lower().endswith((".jpg", ".jpeg")))
+        frames = []
+        for name in names:
+            with open(os.path.join(frames_dir, name), "rb") as f:
+                frames.append(f.read())
+        if not frames:
+            raise SystemExit(f"No JPEG frames found in {frames_dir}")
+        return frames
+
+    from PIL import Image, ImageDraw
+    frames = []
+    for step in range(1 if static else 20):
+        image = Image.new("RGB", (640, 480), (70, 80, 90))
+        x = 40 + step * 25
+        ImageDraw.Draw(image).rectangle((x, 120, x + 90, 420), fill=(200, 170, 150))
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=70)
+        frames.append(buffer.getvalue())
+    return frames
+
+
+class CameraStats:
+    def __init__(self):
+        self.sent = 0
+        self.responses = 0
+        self.alerts = 0
+        self.errors = 0
+
+
+async def run_camera(index: int, http: aiohttp.ClientSession, url: str, frames: List[bytes], fps: float,
+                     duration: float, drain: float, stats: CameraStats, recorder: StageRecorder) -> None:
+    loop = asyncio.get_running_loop()
+    sent_at: Dict[int, float] = {}
+
+    async with http.ws_connect(f"{url}?stream_id=load-{index}", max_msg_size=0) as ws:
+        async def reader():
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                sequence = data.get("seq")
+                if sequence is not None and sequence in sent_at:
+                    recorder.record("end_to_end", loop.time() - sent_at.pop(sequence))
+                    stats.responses += 1
+                if data.get("status") == "alert":
+                    stats.alerts += 1
+                elif data.get("status") == "fallback" or data.get("type") == "error":
+                    stats.errors += 1
+
+        reader_task = asyncio.create_task(reader())
+
+        interval = 1.0 / fps
+        next_send = loop.time() + random.uniform(0, interval)  # spread cameras out
+        deadline = loop.time() + duration
+        sequence = 0
+        while loop.time() < deadline:
+            await asyncio.sleep(max(0.0, next_send - loop.time()))
+            sent_at[sequence] = loop.time()
+            await ws.send_bytes(pack_frame(frames[sequence % len(frames)], stream_id=index, sequence=sequence))
+            stats.sent += 1
+            sequence += 1
+            next_send += interval
+
+        await asyncio.sleep(drain)
+        reader_task.cancel()
+
+
+async def run(args) -> Dict[str, Any]:
+    recorder = StageRecorder()
+    frames = load_frames(args.frames_dir, args.static)
+
+    server = None
+    lag_stop = threading.Event()
+    if args.url:
+        url = args.url
+    else:
+        server = InProcessServer(args, recorder)
+        url = await server.start()
+        threading.Thread(target=monitor_loop_lag, args=(server.loop, recorder, lag_stop), daemon=True).start()
+
+    process = psutil.Process()
+    rss_samples: List[int] = []
+
+    async def sample_rss():
+        while True:
+            rss_samples.append(process.memory_info().rss)
+            await asyncio.sleep(1.0)
+
+    rss_task = asyncio.create_task(sample_rss())
+    camera_stats = [CameraStats() for _ in range(args.cameras)]
+    stream_snapshot: Dict[str, Any] = {}
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession() as http:
+        cameras = [
+            asyncio.create_task(run_camera(i, http, url, frames, args.fps, args.duration, args.drain,
+                                           camera_stats[i], recorder))
+            for i in range(args.cameras)
+        ]
+        if server:
+            # Snapshot server-side accounting just before the cameras hang up
+            await asyncio.sleep(args.duration + args.drain * 0.5)
+            stream_snapshot = server.stream_snapshot()
+        await asyncio.gather(*cameras)
+    elapsed = time.perf_counter() - started
+
+    rss_task.cancel()
+    lag_stop.set()
+    if server:
+        server.stop()
+
+    sessions = stream_snapshot.get("sessions", [])
+    frames_report = {
+        "sent": sum(s.sent for s in camera_stats),
+        "responses": sum(s.responses for s in camera_stats),
+        "alerts": sum(s.alerts for s in camera_stats),
+        "errors": sum(s.errors for s in camera_stats),
+    }
+    # Frames that never got their own answer (superseded in the mailbox or still in flight)
+    frames_report["dropped"] = frames_report["sent"] - frames_report["responses"]
+    for key in ("frames_received", "frames_analyzed", "frames_skipped", "frames_superseded", "frame_errors"):
+        if sessions:
+            frames_report[key] = sum(session.get(key, 0) for session in sessions)
+
+    return {
+        "config": {
+            "cameras": args.cameras,
+            "fps": args.fps,
+            "duration_s": args.duration,
+            "url": args.url or "in-process",
+            "vision_latency": args.vision_latency,
+            "llm_latency": args.llm_latency,
+            "reasoning_mode": args.reasoning_mode or "default",
+            "person_ratio": args.person_ratio,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "frames": frames_report,
+        "throughput": {
+            "frames_sent_per_s": round(frames_report["sent"] / args.duration, 2),
+            "responses_per_s": round(frames_report["responses"] / args.duration, 2),
+        },
+        "stages": recorder.summary(),
+        "rss_mb": {
+            "start": round(rss_samples[0] / 2**20, 1) if rss_samples else None,
+            "peak": round(max(rss_samples) / 2**20, 1) if rss_samples else None,
+        },
+    }
+
+
+def write_csv(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["stage", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+        for stage, stats in sorted(report["stages"].items()):
+            writer.writerow([stage, stats["count"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]])
+        for key, value in report["frames"].items():
+            writer.writerow([f"frames.{key}", value, "", "", "", ""])
+        for key, value in report["throughput"].items():
+            writer.writerow([f"throughput.{key}", value, "", "", "", ""])
+        for key, value in report["rss_mb"].items():
+            writer.writerow([f"rss_mb.{key}", value, "", "", "", ""])
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Multi-camera /ws/stream load generator")
+    parser.add_argument("--cameras", type=int, default=10, help="concurrent camera connections")
+    parser.add_argument("--fps", type=float, default=2.0, help="frames sent per camera per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of sending")
+    parser.add_argument("--drain", type=float, default=3.0, help="seconds to wait for late responses")
+    parser.add_argument("--frames-dir", help="directory of JPEG frames to replay")
+    parser.add_argument("--static", action="store_true", help="synthetic frames never change")
+    parser.add_argument("--url", help="ws:// URL of a running /ws/stream (default: in-process server)")
+    parser.add_argument("--vision-latency", default="lognormal:0.25,0.4", help="stand-in vision latency")
+    parser.add_argument("--llm-latency", default="lognormal:1.5,0.3", help="stand-in Gemini latency")
+    parser.add_argument("--reasoning-mode", help="override CrisisOrchestrator.reasoning_mode (in-process only)")
+    parser.add_argument("--person-ratio", type=float, default=0.1, help="fraction of frames with a person")
+    parser.add_argument("--json", help="write the report as JSON to this path")
+    parser.add_argument("--csv", help="write per-stage latency rows as CSV to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.csv:
+        write_csv(report, args.csv)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
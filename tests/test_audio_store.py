@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.audio_store import AudioStore, etag_matches, parse_range
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-9", 100) is None  # multiple ranges: whole clip
+    try:
+        parse_range("bytes=100-", 100)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Range past the end was accepted")
+
+
+def test_etag_matches():
+    etag = '"abc123"'
+    assert etag_matches('"abc123"', etag)
+    assert etag_matches('W/"abc123"', etag)
+    assert etag_matches('"old", W/"abc123" ,"other"', etag)
+    assert etag_matches(" * ", etag)
+    assert not etag_matches(None, etag) and not etag_matches("", etag)
+    # A different tag that merely contains the current one
+    assert not etag_matches('"xabc123x"', etag)
+    assert not etag_matches('"a,"abc123""', etag)
+    assert not etag_matches('"abc1234", "v2-abc123"', etag)
+
+
+def test_evicted_clips_spill_to_disk_and_stay_servable():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AudioStore(max_bytes=250, spill_dir=tmp)
+            first = store.put("cam-1-100-1.mp3", b"a" * 100)
+            store.put("cam-1-100-2.mp3", b"b" * 100)
+            store.put("cam-1-100-3.wav", b"c" * 100)
+            assert store.memory.stats()["evictions"] == 1
+
+            await store.flush()
+            assert os.listdir(tmp) == ["cam-1-100-1.mp3"]
+            spilled = await store.get("cam-1-100-1.mp3")
+            assert spilled.data == first.data and spilled.etag == first.etag
+            assert spilled.mime == "audio/mpeg" and spilled.url == "/audio/cam-1-100-1.mp3"
+
+            # Never a path outside the store
+            assert await store.get("../secrets.wav") is None
+            try:
+                store.put("../x.wav", b"x")
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("Unsafe key was accepted")
+
+            without_disk = AudioStore(max_bytes=150, spill_dir=None)
+            without_disk.put("a.wav", b"a" * 100)
+            without_disk.put("b.wav", b"b" * 100)
+            assert await without_disk.get("a.wav") is None
+
+    asyncio.run(scenario())
+
+
+def test_audio_endpoint_serves_ranges_and_etags():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+
+    store = AudioStore(spill_dir=None)
+    data = bytes(range(256)) * 1024
+    clip = store.put("cam-1-100-1.mp3", data)
+
+    with patch.object(main.master_agent, "voice_client", SimpleNamespace(store=store)):
+        client = TestClient(main.app)
+
+        full = client.get(clip.url)
+        assert full.status_code == 200 and full.content == data
+        assert full.headers["content-type"] == "audio/mpeg"
+        assert full.headers["etag"] == clip.etag and full.headers["accept-ranges"] == "bytes"
+
+        assert client.get(clip.url, headers={"If-None-Match": clip.etag}).status_code == 304
+        assert client.get(clip.url, headers={"If-None-Match": f'"stale", W/{clip.etag}'}).status_code == 304
+        assert client.get(clip.url, headers={"If-None-Match": "*"}).status_code == 304
+        longer_tag = clip.etag[:-1] + '-old"'
+        assert client.get(clip.url, headers={"If-None-Match": longer_tag}).status_code == 200
+
+        part = client.get(clip.url, headers={"Range": "bytes=1000-1999"})
+        assert part.status_code == 206 and part.content == data[1000:2000]
+        assert part.headers["content-range"] == f"bytes 1000-1999/{len(data)}"
+
+        # A partial copy of another version gets the whole current clip
+        stale = client.get(clip.url, headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert stale.status_code == 200 and len(stale.content) == len(data)
+
+        assert client.get(clip.url, headers={"Range": f"bytes={len(data)}-"}).status_code == 416
+        assert client.get("/audio/missing.wav").status_code == 404
+
+
+if __name__ == "__main__":
+    test_parse_range()
+    test_etag_matches()
+    test_evicted_clips_spill_to_disk_and_stay_servable()
+    test_audio_endpoint_serves_ranges_and_etags()
+    print("Audio store tests passed!")
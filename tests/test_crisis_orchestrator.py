@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.brain_service import PREARM_RUNS, PREARM_WASTED_CALLS, parse_fused_verdict
+from tests.fakes import FUSED_VERDICT, make_orchestrator
+
+
+def test_concurrent_incidents_do_not_block_the_loop():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=0.2)
+        lags = []
+
+        async def ticker():
+            while True:
+                expected = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - expected)
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            orchestrator.run_agentic_loop("A person waving", "HELP", {"location": "lab"}) for _ in range(5)
+        ))
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+
+        assert all(result["status"] == "COMPLETED" and result["severity"] == 7 for result in results)
+        assert orchestrator.client.calls == 15
+        # Five loops of three 0.2s calls overlap instead of queueing (3s sequentially)
+        assert elapsed < 1.5
+        assert max(lags) < 0.1
+
+    asyncio.run(scenario())
+
+
+def test_timeouts_fall_back_to_safe_defaults():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=5.0)
+        orchestrator.timeout = 0.05
+        started = time.perf_counter()
+        assert await orchestrator.validate_context("scene", "HELP") is True  # fail open
+        assert await orchestrator.calculate_severity("scene", "HELP") == 5
+        assert "CRITICAL ERROR" in await orchestrator.generate_dispatch_report("scene", {})
+        assert time.perf_counter() - started < 1.0
+
+    asyncio.run(scenario())
+
+
+def test_fused_mode_is_one_round_trip():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=0.01)
+        orchestrator.reasoning_mode = "fused"
+        stages = []
+
+        async def on_stage(stage, data):
+            stages.append(stage)
+
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {"location": "lab"}, on_stage)
+        assert result["mode"] == "fused"
+        assert result["severity"] == 9 and result["speech_triggered"]
+        assert result["sbar_report"].startswith("SITUATION: Person signing HELP.\nBACKGROUND: Asthma.")
+        assert orchestrator.client.calls == 1
+        assert stages == ["validated", "severity", "sbar_ready"]
+
+        # Schema violations fall back to the three-call path
+        orchestrator.client.fused_text = json.dumps({**FUSED_VERDICT, "severity": 42})
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {})
+        assert result["mode"] == "sequential" and result["severity"] == 7
+        assert orchestrator.client.calls == 1 + 1 + 3
+
+        orchestrator.client.fused_text = json.dumps({**FUSED_VERDICT, "valid": False})
+        assert (await orchestrator.run_agentic_loop("scene", "HELP", {}))["status"] == "ABORTED"
+
+    asyncio.run(scenario())
+
+
+def test_speculative_mode_overlaps_stages():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=0.2)
+        orchestrator.reasoning_mode = "speculative"
+        stages = []
+
+        async def on_stage(stage, data):
+            stages.append(stage)
+
+        started = time.perf_counter()
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {}, on_stage)
+        elapsed = time.perf_counter() - started
+        assert result["mode"] == "speculative" and result["status"] == "COMPLETED"
+        assert stages == ["validated", "severity"] + ["sbar_delta"] * 4 + ["sbar_ready"]
+        # Critical path is one call, not three
+        assert elapsed < 0.45
+        assert set(result["timings"]) == {"validate_ms", "severity_ms", "report_ms", "total_ms"}
+
+        # INVALID cancels the slower speculative calls
+        orchestrator.client.verdict = "INVALID"
+        orchestrator.client.delays = {"validate": 0.01, "severity": 5.0, "report": 5.0}
+        started = time.perf_counter()
+        result = await orchestrator.run_agentic_loop("scene", "HELP", {})
+        assert result["status"] == "ABORTED"
+        assert time.perf_counter() - started < 1.0
+        assert orchestrator.client.cancelled == 2
+        assert result["timings"]["report_ms"] == "cancelled"
+
+    asyncio.run(scenario())
+
+
+def test_sequential_mode_streams_the_sbar():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=0.01)
+        orchestrator.client.chunk_delay = 0.1
+        events = []
+        started = time.perf_counter()
+
+        async def on_stage(stage, data):
+            events.append((stage, data, time.perf_counter() - started))
+
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {}, on_stage)
+        deltas = [(data, at) for stage, data, at in events if stage == "sbar_delta"]
+        assert [stage for stage, _, _ in events if stage != "sbar_delta"] == ["validated", "severity", "sbar_ready"]
+        assert [data["index"] for data, _ in deltas] == [0, 1, 2, 3]
+        assert "".join(data["text"] for data, _ in deltas) == result["sbar_report"]
+        assert result["sbar_report"].startswith("SITUATION: test\nBACKGROUND")
+        # The first words reach the listener one chunk in, not after the whole report
+        sbar_ready_at = events[-1][2]
+        assert sbar_ready_at - deltas[0][1] > 0.25
+
+        # A stream that trickles past the deadline falls back to the error report
+        orchestrator.timeout = 0.15
+        report = await orchestrator.generate_dispatch_report("scene", {}, on_stage)
+        assert report.startswith("CRITICAL ERROR")
+
+    asyncio.run(scenario())
+
+
+def test_prearmed_run_is_committed_or_discarded():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=0.2)
+        committed = PREARM_RUNS.labels(outcome="committed").value
+        wasted = PREARM_WASTED_CALLS.labels().value
+
+        # Started while the votes accumulate; the trigger confirms 0.15s later
+        speculation = orchestrator.speculate("A person waving", "HELP", {})
+        await asyncio.sleep(0.15)
+        started = time.perf_counter()
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {}, speculation=speculation)
+        assert result["mode"] == "prearmed" and result["status"] == "COMPLETED"
+        assert time.perf_counter() - started < 0.15
+        assert result["timings"]["prearm_lead_ms"] >= 150
+        assert orchestrator.client.calls == 3
+        assert PREARM_RUNS.labels(outcome="committed").value == committed + 1
+
+        # The draft streams out once committed: buffered chunks first, then live ones
+        orchestrator.client.chunk_delay = 0.1
+        events = []
+
+        async def on_stage(stage, data):
+            events.append((stage, data))
+
+        speculation = orchestrator.speculate("A person waving", "HELP", {})
+        await asyncio.sleep(0.45)  # two of the four chunks written before the confirmation
+        result = await orchestrator.run_agentic_loop("A person waving", "HELP", {}, on_stage, speculation)
+        deltas = [data for stage, data in events if stage == "sbar_delta"]
+        assert [stage for stage, _ in events if stage != "sbar_delta"] == ["validated", "severity", "sbar_ready"]
+        assert [data["index"] for data in deltas] == [0, 1, 2, 3]
+        assert "".join(data["text"] for data in deltas) == result["sbar_report"]
+        orchestrator.client.chunk_delay = 0.01
+
+        # Votes decayed: every call of the run counts as wasted
+        speculation = orchestrator.speculate("Someone stretching", "HELP", {})
+        await asyncio.sleep(0.05)
+        speculation.discard()
+        await asyncio.gather(*speculation.tasks, return_exceptions=True)
+        assert orchestrator.client.cancelled == 3
+        assert PREARM_WASTED_CALLS.labels().value == wasted + 3
+
+    asyncio.run(scenario())
+
+
+def test_fused_parser_rejects_malformed_output():
+    for bad in ("not json", "[]", json.dumps({**FUSED_VERDICT, "valid": "yes"}),
+                json.dumps({**FUSED_VERDICT, "sbar": {"situation": "only one"}})):
+        try:
+            parse_fused_verdict(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"Accepted malformed verdict: {bad}")
+
+
+def test_cancellation_propagates():
+    async def scenario():
+        orchestrator = make_orchestrator(delay=5.0)
+        task = asyncio.create_task(orchestrator.run_agentic_loop("scene", "HELP", {}))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return
+        raise AssertionError("run_agentic_loop swallowed the cancellation")
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_concurrent_incidents_do_not_block_the_loop()
+    test_timeouts_fall_back_to_safe_defaults()
+    test_fused_mode_is_one_round_trip()
+    test_speculative_mode_overlaps_stages()
+    test_sequential_mode_streams_the_sbar()
+    test_prearmed_run_is_committed_or_discarded()
+    test_fused_parser_rejects_malformed_output()
+    test_cancellation_propagates()
+    print("Crisis orchestrator tests passed!")
@@ -0,0 +1,73 @@
+import asyncio
+import io
+import os
+import sys
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.frame_gate import FrameDifferenceGate
+from backend.services.image_signature import BufferReader, decode_thumbnail, frame_signature, perceptual_hash
+from tests.fakes import make_jpeg
+
+RESULT = {"captions": [], "objects": [], "people": [], "gestures": [], "metadata": {"width": 640, "height": 480}}
+
+
+def thumbnail(gate, jpeg):
+    return asyncio.run(gate.signature(memoryview(jpeg))).thumbnail
+
+
+def test_static_scene_reuses_previous_result():
+    gate = FrameDifferenceGate(threshold=0.01, max_reuse_seconds=10)
+    first = thumbnail(gate, make_jpeg())
+    assert gate.check(first, now=0.0) == (False, 1.0)
+    gate.record(first, RESULT, now=0.0)
+
+    reuse, change = gate.check(thumbnail(gate, make_jpeg()), now=1.0)
+    assert reuse
+    assert change == 0.0
+
+
+def test_motion_and_staleness_force_analysis():
+    gate = FrameDifferenceGate(threshold=0.01, max_reuse_seconds=10)
+    gate.record(thumbnail(gate, make_jpeg()), RESULT, now=0.0)
+
+    # A person-sized object entering the frame
+    reuse, change = gate.check(thumbnail(gate, make_jpeg(box=(250, 100, 390, 470))), now=1.0)
+    assert not reuse
+    assert change > 0.05
+
+    # Static, but the cached result is too old
+    reuse, _ = gate.check(thumbnail(gate, make_jpeg()), now=11.0)
+    assert not reuse
+
+
+def test_failed_analysis_is_never_reused():
+    gate = FrameDifferenceGate()
+    failed = {**RESULT, "metadata": {"error": "rate_limited"}}
+    gate.record(thumbnail(gate, make_jpeg()), failed, now=0.0)
+    assert gate.last_result is None
+    assert gate.check(thumbnail(gate, make_jpeg()), now=1.0) == (False, 1.0)
+
+
+def test_memoryview_frames_decode_once_without_a_bytesio_copy():
+    jpeg = make_jpeg(box=(250, 100, 390, 470))
+    reader = BufferReader(memoryview(jpeg))
+    assert reader.read(2) == b"\xff\xd8" and reader.tell() == 2
+    reader.seek(-2, io.SEEK_END)
+    assert reader.read() == b"\xff\xd9" and reader.read(10) == b""
+
+    with patch("backend.services.image_signature.io.BytesIO", side_effect=AssertionError("copied")):
+        from_view = frame_signature(memoryview(jpeg))
+    assert (from_view.thumbnail == decode_thumbnail(jpeg)).all()
+    assert from_view.hash == perceptual_hash(jpeg)
+
+
+if __name__ == "__main__":
+    test_static_scene_reuses_previous_result()
+    test_motion_and_staleness_force_analysis()
+    test_failed_analysis_is_never_reused()
+    test_memoryview_frames_decode_once_without_a_bytesio_copy()
+    print("Frame gate tests passed!")
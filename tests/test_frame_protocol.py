@@ -0,0 +1,81 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.frame_protocol import (
+    HEADER_SIZE, FrameProtocolError, pack_frame, parse_binary_frame, parse_text_frame
+)
+
+JPEG_BYTES = b"\xff\xd8\xff\xe0fake-jpeg-payload\xff\xd9"
+
+MOCK_RESULT = {
+    "captions": [{"text": "Mocked Caption", "confidence": 0.99}],
+    "objects": [],
+    "people": [],
+    "gestures": [],
+    "metadata": {"width": 0, "height": 0, "model_version": "mock"}
+}
+
+
+def test_binary_frame_roundtrip_is_zero_copy():
+    message = pack_frame(JPEG_BYTES, stream_id=7, sequence=42, capture_ts_ms=1700000000000)
+    frame = parse_binary_frame(message)
+
+    payload = frame.payload()
+    assert isinstance(payload, memoryview)
+    assert payload.obj is message  # a view into the received message, not a copy
+    assert bytes(payload) == JPEG_BYTES
+    assert frame.describe() == {"stream_id": 7, "seq": 42, "capture_ts": 1700000000000}
+
+
+def test_binary_frame_rejects_bad_header():
+    for bad in (b"GL", b"XX" + pack_frame(JPEG_BYTES)[2:]):
+        try:
+            parse_binary_frame(bad)
+        except FrameProtocolError:
+            continue
+        raise AssertionError(f"Expected FrameProtocolError for {bad[:HEADER_SIZE]!r}")
+
+
+def test_legacy_text_frame_decodes_lazily():
+    frame = parse_text_frame("data:image/jpeg;base64,ZmFrZV9kYXRhXzE=")
+    assert frame.legacy
+    assert frame.payload() == b"fake_data_1"
+    assert frame.describe() == {}
+
+
+def test_websocket_accepts_binary_and_legacy_frames():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+
+    with patch.object(main.vision_client, "analyze_frame", AsyncMock(return_value=MOCK_RESULT)) as analyze:
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/stream?stream_id=protocol-test") as websocket:
+            websocket.send_text('{"type": "ping"}')
+            assert websocket.receive_json() == {"type": "pong"}
+
+            rate = main.stream_sessions.get("protocol-test").rate
+            websocket.send_bytes(pack_frame(JPEG_BYTES, stream_id=1, sequence=5))
+            data = websocket.receive_json()
+            assert data["caption"] == "Mocked Caption"
+            assert data["seq"] == 5
+            assert bytes(analyze.call_args.args[0]) == JPEG_BYTES
+
+            rate.last_slot_time = 0.0
+            websocket.send_text("data:image/jpeg;base64,ZmFrZV9kYXRhXzE=")
+            data = websocket.receive_json()
+            assert data["status"] == "monitoring"
+            assert "seq" not in data
+            assert analyze.call_args.args[0] == b"fake_data_1"
+
+
+if __name__ == "__main__":
+    test_binary_frame_roundtrip_is_zero_copy()
+    test_binary_frame_rejects_bad_header()
+    test_legacy_text_frame_decodes_lazily()
+    test_websocket_accepts_binary_and_legacy_frames()
+    print("Frame protocol tests passed!")
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.incident_context import IncidentContextStore
+from tests.fakes import make_orchestrator
+
+USER = {"name": "Ada", "location": "Lab 3", "medical_history": "Asthma, penicillin allergy",
+        "emergency_contact": "Grace, +1 555 0100"}
+COMPLETED = {"status": "COMPLETED", "severity": 7,
+             "sbar_report": "SITUATION: Person signing HELP.\nBACKGROUND: Asthma.\n"
+                            "ASSESSMENT: Breathing difficulty.\nRECOMMENDATION: Dispatch EMS."}
+
+
+COLLAPSED = {"valid": True, "severity": 9, "sbar": {
+    "situation": "Person collapsed.", "background": "Asthma.",
+    "assessment": "Unresponsive.", "recommendation": "Dispatch EMS, priority 1."}}
+
+
+def test_follow_ups_send_the_last_verdict_and_the_new_observation():
+    async def scenario():
+        orchestrator = make_orchestrator(incident_contexts=IncidentContextStore())
+        orchestrator.client.fused_text = json.dumps(COLLAPSED)
+        orchestrator.open_incident_context("inc-1", "A person waving for help", "HELP", USER, COMPLETED)
+
+        update = await orchestrator.follow_up("inc-1", "The person has collapsed on the floor")
+        assert update["valid"] and update["severity"] == 9
+        assert update["sbar_report"].startswith("SITUATION: Person collapsed.")
+
+        # The whole request: no history, just the last verdict and the observation
+        [request] = orchestrator.client.requests
+        assert isinstance(request, str)
+        assert COMPLETED["sbar_report"] in request and "The person has collapsed on the floor" in request
+        assert "penicillin" not in request and "Grace" not in request
+        from_scratch = orchestrator._fused_prompt("The person has collapsed on the floor", "HELP", USER)
+        assert len(request) < len(from_scratch)
+
+        # Later follow-ups build on the updated verdict and do not grow
+        await orchestrator.follow_up("inc-1", "Paramedics arriving")
+        await orchestrator.follow_up("inc-1", "Person is being moved")
+        requests = orchestrator.client.requests
+        assert "Person collapsed." in requests[1] and COMPLETED["sbar_report"] not in requests[1]
+        assert len(requests[2]) <= len(requests[1]) + 16  # only the observation differs
+        snapshot = orchestrator.incident_contexts.get("inc-1").snapshot()
+        assert snapshot["follow_ups"] == 3 and snapshot["prompt_tokens"] == 120
+        assert snapshot["prompt_chars"] == sum(len(r) for r in requests)
+
+    asyncio.run(scenario())
+
+
+def test_contexts_are_bounded_and_failures_are_not_fatal():
+    async def scenario():
+        orchestrator = make_orchestrator(incident_contexts=IncidentContextStore(max_entries=2))
+        for incident_id in ("inc-1", "inc-2", "inc-3"):
+            orchestrator.open_incident_context(incident_id, "scene", "HELP", USER, COMPLETED)
+        assert orchestrator.incident_contexts.stats()["evictions"] == 1
+        assert await orchestrator.follow_up("inc-1", "new scene") is None
+        assert orchestrator.client.requests == []
+
+        # Aborted loops never open a context
+        assert orchestrator.open_incident_context("inc-4", "scene", "HELP", USER, {"status": "ABORTED"}) is None
+
+        orchestrator.client.fail = True
+        assert await orchestrator.follow_up("inc-3", "new scene") is None
+        assert orchestrator.incident_contexts.get("inc-3").severity == 7
+        orchestrator.client.fail = False
+        assert (await orchestrator.follow_up("inc-3", "new scene"))["severity"] == 9
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_follow_ups_send_the_last_verdict_and_the_new_observation()
+    test_contexts_are_bounded_and_failures_are_not_fatal()
+    print("Incident context tests passed!")
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.frame_protocol import pack_frame
+from backend.incidents import IncidentManager
+
+HELP_RESULT = {
+    "captions": [{"text": "A person waving for help", "confidence": 0.9}],
+    "objects": [],
+    "people": [{"confidence": 0.9, "box": {"x": 0, "y": 0, "w": 10, "h": 10}}],
+    "gestures": [{"tag": "HELP", "probability": 0.98}],
+    "metadata": {"width": 0, "height": 0, "model_version": "mock"}
+}
+
+
+def test_drain_waits_then_cancels():
+    async def scenario():
+        manager = IncidentManager()
+        owner = object()
+
+        async def quick(incident):
+            incident.advance("validated")
+
+        async def stuck(incident):
+            await asyncio.sleep(60)
+
+        done = manager.spawn("cam-1", "HELP", quick, owner=owner)
+        hung = manager.spawn("cam-1", "HELP", stuck, owner=owner)
+        other = manager.spawn("cam-2", "HELP", stuck, owner=object())
+
+        await manager.drain(owner=owner, timeout=0.05)
+        assert done.status == "completed" and done.stages == ["validated"]
+        assert hung.status == "cancelled"
+        # Another stream's incident is untouched
+        assert not other.task.done()
+        assert [i["incident_id"] for i in manager.snapshot()["active"]] == [other.incident_id]
+
+        await manager.drain(timeout=0.01)
+        assert other.status == "cancelled"
+
+    asyncio.run(scenario())
+
+
+def test_stream_keeps_analyzing_while_incident_runs():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+
+    async def slow_emergency(vision_context, user_metadata, sign_detected="HELP", on_stage=None, speculation=None,
+                             incident_id=None):
+        await on_stage("validated", {"valid": True})
+        await asyncio.sleep(0.5)
+        await on_stage("sbar_ready", {"sbar": "SITUATION: test"})
+        return {"user_feedback": "Help is on the way.", "sbar_preview": "SITUATION: test", "call_status": None}
+
+    with patch.object(main.vision_client.backend, "analyze", AsyncMock(return_value=HELP_RESULT)), \
+            patch.object(main.master_agent, "process_emergency", slow_emergency):
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/stream?stream_id=incident-test") as websocket:
+            session = main.stream_sessions.get("incident-test")
+            session.rate.wait = AsyncMock()
+
+            alert = None
+            for sequence in range(10):
+                websocket.send_bytes(pack_frame(b"\xff\xd8frame\xff\xd9", sequence=sequence))
+                alert = websocket.receive_json()
+            assert alert["status"] == "alert"
+            incident_id = alert["incident_id"]
+
+            # The next frame is answered while the incident is still reasoning
+            websocket.send_bytes(pack_frame(b"\xff\xd8frame\xff\xd9", sequence=10))
+            order = []
+            while "completed" not in order:
+                message = websocket.receive_json()
+                if message.get("type") == "incident_update":
+                    assert message["incident_id"] == incident_id
+                    order.append(message["stage"])
+                elif message.get("seq") == 10:
+                    order.append("frame-10")
+
+            assert order.index("frame-10") < order.index("sbar_ready")
+            assert [stage for stage in order if stage != "frame-10"] == ["validated", "sbar_ready", "completed"]
+
+        assert any(i["incident_id"] == incident_id and i["status"] == "completed"
+                   for i in main.incidents.snapshot()["recent"])
+
+
+def test_scene_change_after_an_incident_triggers_a_follow_up():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+
+    # What the Azure backend returns: people and objects, no captions
+    alone = {**HELP_RESULT, "captions": []}
+    helped = {**alone, "people": HELP_RESULT["people"] * 2,
+              "objects": [{"tag": "stretcher", "confidence": 0.8, "box": {"x": 0, "y": 0, "w": 5, "h": 5}}]}
+    analyze = AsyncMock(return_value=alone)
+    follow_up = AsyncMock(return_value={"valid": True, "severity": 6, "sbar_report": "SITUATION: Paramedics on scene."})
+
+    async def quick_emergency(vision_context, user_metadata, sign_detected="HELP", on_stage=None, speculation=None,
+                              incident_id=None):
+        return {"user_feedback": "Help is on the way.", "sbar_preview": "SITUATION: test", "call_status": None}
+
+    with patch.object(main.vision_client.backend, "analyze", analyze), \
+            patch.object(main.master_agent, "process_emergency", quick_emergency), \
+            patch.object(main.master_agent, "follow_up_emergency", follow_up), \
+            patch.object(main, "INCIDENT_FOLLOW_UP_SECONDS", 0):
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/stream?stream_id=follow-up-test") as websocket:
+            session = main.stream_sessions.get("follow-up-test")
+            session.rate.wait = AsyncMock()
+
+            sequence = 0
+            update = None
+            while update is None and sequence < 30:
+                if sequence == 12:
+                    analyze.return_value = helped
+                websocket.send_bytes(pack_frame(b"\xff\xd8frame\xff\xd9", sequence=sequence))
+                while True:
+                    message = websocket.receive_json()
+                    if message.get("stage") == "sbar_update":
+                        update = message
+                    if message.get("seq") == sequence:
+                        break
+                sequence += 1
+            assert update is not None, "the changed scene was never followed up"
+
+        # The unchanged scene never re-evaluated the incident; the changed one did, once
+        follow_up.assert_awaited_once()
+        incident_id, observation = follow_up.await_args.args
+        assert observation == "2 people with stretcher"
+        assert update["incident_id"] == incident_id and update["severity"] == 6
+        assert update["sbar"] == "[Severity 6] SITUATION: Paramedics on scene."
+
+
+if __name__ == "__main__":
+    test_drain_waits_then_cancels()
+    test_stream_keeps_analyzing_while_incident_runs()
+    test_scene_change_after_an_incident_triggers_a_follow_up()
+    print("Incident tests passed!")
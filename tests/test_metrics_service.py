@@ -0,0 +1,62 @@
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.metrics_service import MetricsRegistry
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames", "Frames seen.", ("encoding",))
+    frames.labels(encoding="binary").inc()
+    frames.labels(encoding="binary").inc(2)
+    queue = registry.gauge("queue_depth", "Queue depth.")
+    queue.set_function(lambda: 4)
+    latency = registry.histogram("stage_seconds", "Stage time.", ("stage",), buckets=(0.1, 1.0))
+    child = latency.labels(stage="vision")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert "# TYPE frames counter" in text
+    assert 'frames_total{encoding="binary"} 3' in text
+    assert "queue_depth 4" in text
+    # Buckets are cumulative and `le` is inclusive
+    assert 'stage_seconds_bucket{stage="vision",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="vision",le="1"} 3' in text
+    assert 'stage_seconds_bucket{stage="vision",le="+Inf"} 4' in text
+    assert 'stage_seconds_count{stage="vision"} 4' in text
+    assert 'stage_seconds_sum{stage="vision"} 3.65' in text
+
+    # Re-registering returns the same family
+    assert registry.counter("frames", "Frames seen.", ("encoding",)) is frames
+
+
+def test_hot_path_observations_are_all_counted():
+    registry = MetricsRegistry()
+    child = registry.histogram("hot_seconds", "Hot path.", ("stage",)).labels(stage="hot")
+    rounds = 100_000
+    for _ in range(rounds):
+        child.observe(0.003)
+    assert child.count == rounds
+
+
+def test_metrics_endpoint():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "guardian_stage_duration_seconds" in response.text
+    assert "guardian_active_streams" in response.text
+
+
+if __name__ == "__main__":
+    test_prometheus_text_format()
+    test_hot_path_observations_are_all_counted()
+    test_metrics_endpoint()
+    print("Metrics tests passed!")
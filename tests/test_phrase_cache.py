@@ -0,0 +1,117 @@
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import wave
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.phrase_cache import SAMPLE_RATE, SEGMENT_GAP_SECONDS, PhraseAudioCache
+from backend.services.speech_service import ALERT_PREFIX, HELP_ON_THE_WAY
+from tests.fakes import TENTH_SECOND_WAV, BlockingSynthesizer, make_voice_client
+
+
+class CountingRenderer:
+    """Stands in for a TTS round-trip: 10 ms of PCM per character after a delay."""
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.rendered = []
+
+    async def __call__(self, text: str) -> bytes:
+        self.rendered.append(text)
+        await asyncio.sleep(self.delay)
+        return b"\x01\x00" * (len(text) * SAMPLE_RATE // 100)
+
+
+def test_fixed_phrases_render_once_and_stitch_in_milliseconds():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            render = CountingRenderer()
+            cache = PhraseAudioCache(render, tmp, voice="test-voice")
+            await cache.warm([ALERT_PREFIX, HELP_ON_THE_WAY])
+
+            # Concurrent first use of a new segment is rendered once
+            await asyncio.gather(cache.get("Lab 3"), cache.get("Lab 3"))
+            assert render.rendered == [ALERT_PREFIX, HELP_ON_THE_WAY, "Lab 3"]
+
+            started = time.perf_counter()
+            audio = await cache.compose([ALERT_PREFIX, "Lab 3", HELP_ON_THE_WAY])
+            assert time.perf_counter() - started < 0.05
+            assert len(render.rendered) == 3
+
+            expected_frames = sum(len(text) * SAMPLE_RATE // 100 for text in (ALERT_PREFIX, "Lab 3", HELP_ON_THE_WAY))
+            expected_frames += 2 * int(SAMPLE_RATE * SEGMENT_GAP_SECONDS)
+            with wave.open(io.BytesIO(audio), "rb") as wav:
+                assert wav.getnframes() == expected_frames
+
+            # A restart finds the phrases on disk, addressed by content
+            restarted = PhraseAudioCache(CountingRenderer(), tmp, voice="test-voice")
+            await restarted.get(ALERT_PREFIX)
+            assert restarted.render.rendered == []
+            other_voice = PhraseAudioCache(CountingRenderer(delay=0), tmp, voice="other-voice")
+            await other_voice.get(ALERT_PREFIX)
+            assert other_voice.render.rendered == [ALERT_PREFIX]
+
+    asyncio.run(scenario())
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    async def scenario():
+        render = CountingRenderer(delay=0)
+        cache = PhraseAudioCache(render, None, voice="test-voice", max_bytes=3 * 1440)  # three 3-letter phrases
+        for text in ("one", "two", "six", "ten"):
+            await cache.get(text)
+        assert cache.stats()["evictions"] == 1
+        await cache.get("one")  # evicted and not on disk: rendered again
+        assert render.rendered.count("one") == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_incident_does_not_cancel_a_shared_render():
+    async def scenario():
+        render = CountingRenderer(delay=0.1)
+        cache = PhraseAudioCache(render, None, voice="test-voice")
+        # Two incidents at the same location; the first is drained mid-render
+        first = asyncio.create_task(cache.compose([ALERT_PREFIX, "Lab 3"]))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(cache.compose([ALERT_PREFIX, "Lab 3"]))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        audio = await asyncio.wait_for(second, timeout=1)
+        assert first.cancelled()
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            assert wav.getnframes() > 0
+        # The second incident took the abandoned renders over
+        assert render.rendered == [ALERT_PREFIX, "Lab 3"] * 2
+
+    asyncio.run(scenario())
+
+
+def test_voice_client_stores_stitched_alert_wav():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            client = make_voice_client(tmp, lambda: BlockingSynthesizer(audio=TENTH_SECOND_WAV), size=1)
+            client.phrases = PhraseAudioCache(client._render_phrase, os.path.join(tmp, "phrases"), voice="test")
+
+            clip = await client.render_phrases([ALERT_PREFIX, "Lab 3", HELP_ON_THE_WAY], "cam-1-100-1-alert")
+            client.close()
+            assert clip.url == "/audio/cam-1-100-1-alert.wav"
+            with wave.open(io.BytesIO(clip.data), "rb") as wav:
+                seconds = wav.getnframes() / wav.getframerate()
+            assert abs(seconds - (3 * 0.1 + 2 * SEGMENT_GAP_SECONDS)) < 0.01
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_fixed_phrases_render_once_and_stitch_in_milliseconds()
+    test_memory_tier_is_bounded_by_bytes()
+    test_cancelled_incident_does_not_cancel_a_shared_render()
+    test_voice_client_stores_stitched_alert_wav()
+    print("Phrase cache tests passed!")
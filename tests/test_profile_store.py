@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.profile_store import MOCK_LOCATION, PROFILES_PATH, ProfileStore
+
+
+def write_profiles(path: str, data) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_profiles_are_indexed_by_user_and_stream():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profiles.json")
+        write_profiles(path, {"default_user_id": "u1", "profiles": [
+            {"user_id": "u1", "name": "Ada", "stream_ids": ["cam-1"]},
+            {"user_id": "u2", "name": "Grace", "stream_ids": ["cam-2", "cam-3"], "location": "Lab 3"},
+        ]})
+        store = ProfileStore(path)
+
+        assert store.for_stream("cam-3")["name"] == "Grace"
+        assert store.for_stream("cam-3")["location"] == "Lab 3"
+        assert store.for_stream("cam-1")["location"] == MOCK_LOCATION
+        assert store.for_stream("unmapped")["name"] == "Ada"  # default user
+        assert store.for_user("u2")["name"] == "Grace" and store.for_user("nobody") is None
+
+        # Callers get copies
+        store.for_stream("cam-2")["name"] = "changed"
+        assert store.for_stream("cam-2")["name"] == "Grace"
+
+        missing = ProfileStore(os.path.join(tmp, "missing.json"))
+        assert missing.for_stream("cam-1") == {"name": "Unknown", "location": MOCK_LOCATION}
+
+    # The shipped single-user file covers every stream
+    assert ProfileStore(PROFILES_PATH).for_stream("any-camera")["user_id"] == "guardian_001"
+
+
+def test_changed_file_is_reloaded_by_version_stamp():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profiles.json")
+            write_profiles(path, [{"user_id": "u1", "name": "Ada", "stream_ids": ["cam-1"]}])
+            store = ProfileStore(path, poll_seconds=0.01)
+            assert await store.refresh() is False
+
+            write_profiles(path, [{"user_id": "u1", "name": "Ada Lovelace", "stream_ids": ["cam-1"]}])
+            watching = asyncio.create_task(store.watch())
+            await asyncio.sleep(0.1)
+            assert store.for_stream("cam-1")["name"] == "Ada Lovelace"
+            assert store.stats()["version"] == 2
+
+            # A half-written file keeps the last good profiles
+            with open(path, "w") as f:
+                f.write('[{"user_id": "u1", "na')
+            await asyncio.sleep(0.1)
+            watching.cancel()
+            assert store.for_stream("cam-1")["name"] == "Ada Lovelace"
+            assert store.stats()["errors"] > 0
+
+    asyncio.run(scenario())
+
+
+def test_tens_of_thousands_of_profiles():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profiles.json")
+        write_profiles(path, [
+            {"user_id": f"u{i}", "name": f"User {i}", "medical_history": "None", "stream_ids": [f"cam-{i}"]}
+            for i in range(50000)
+        ])
+        started = time.perf_counter()
+        store = ProfileStore(path)
+        assert time.perf_counter() - started < 2.0
+        assert store.stats()["profiles"] == 50000 and store.stats()["streams"] == 50000
+
+        started = time.perf_counter()
+        for i in range(0, 50000, 5):
+            store.for_stream(f"cam-{i}")
+        assert (time.perf_counter() - started) / 10000 < 0.0001
+        assert store.for_stream("cam-49999")["name"] == "User 49999"
+
+
+if __name__ == "__main__":
+    test_profiles_are_indexed_by_user_and_stream()
+    test_changed_file_is_reloaded_by_version_stamp()
+    test_tens_of_thousands_of_profiles()
+    print("Profile store tests passed!")
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.rate_control import (
+    AdaptiveRateController, FrameBudget, BASE_FPS, BURST_FPS, IDLE_FPS, IDLE_AFTER_SECONDS
+)
+
+
+def test_bursts_while_arming_and_idles_in_empty_rooms():
+    rate = AdaptiveRateController("cam")
+    rate.observe_result(0.1)
+    assert rate.target_fps == BASE_FPS
+
+    rate.set_arming(True)
+    assert rate.target_fps == BURST_FPS
+    rate.set_arming(False)
+
+    later = time.time() + IDLE_AFTER_SECONDS + 1
+    rate.observe_scene(motion=0.0, people_present=False, now=later)
+    assert rate.target_fps == IDLE_FPS
+
+    # Motion brings the stream straight back to the base rate
+    rate.observe_scene(motion=0.5, people_present=False, now=later)
+    assert rate.target_fps == BASE_FPS
+
+
+def test_backs_off_on_rate_limit_and_recovers():
+    rate = AdaptiveRateController("cam")
+    rate.observe_result(0.1, error="rate_limited")
+    rate.observe_result(0.1, error="rate_limited")
+    throttled = rate.target_fps
+    assert throttled < BASE_FPS / 2
+
+    for _ in range(50):
+        rate.observe_result(0.1)
+    assert rate.target_fps > throttled
+    assert abs(rate.target_fps - BASE_FPS) < 0.01
+
+
+def test_global_budget_is_shared_max_min_fairly():
+    budget = FrameBudget(total_fps=3.0)
+    budget.request("idle", 0.2)
+    budget.request("busy-1", 4.0)
+    budget.request("busy-2", 4.0)
+    budget._recompute()
+
+    assert budget.share("idle") == 0.2
+    assert abs(budget.share("busy-1") - 1.4) < 1e-9
+    assert abs(budget.share("busy-2") - 1.4) < 1e-9
+
+    busy = AdaptiveRateController("busy-1", budget)
+    busy.set_arming(True)
+    assert busy.target_fps <= 1.4 + 1e-9
+
+
+if __name__ == "__main__":
+    test_bursts_while_arming_and_idles_in_empty_rooms()
+    test_backs_off_on_rate_limit_and_recovers()
+    test_global_budget_is_shared_max_min_fairly()
+    print("Rate control tests passed!")
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.speech_service import SynthesisBackpressure, SynthesizerPool
+from tests.fakes import BlockingSynthesizer, make_voice_client
+
+
+def test_pool_synthesizes_in_parallel_off_the_loop():
+    async def scenario():
+        pool = SynthesizerPool(lambda: BlockingSynthesizer(0.2), size=4, queue_limit=4)
+        lags = []
+
+        async def ticker():
+            while True:
+                expected = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - expected)
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.speak_ssml(f"<speak>{i}</speak>") for i in range(4)))
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+        pool.close()
+
+        assert [r.audio_data for r in results] == [f"RIFF<speak>{i}</speak>".encode() for i in range(4)]
+        assert elapsed < 0.6  # 0.8s if run one after another
+        assert max(lags) < 0.1
+
+    asyncio.run(scenario())
+
+
+def test_saturated_pool_rejects_instead_of_queueing_forever():
+    async def scenario():
+        pool = SynthesizerPool(lambda: BlockingSynthesizer(0.2), size=1, queue_limit=1)
+        running = asyncio.create_task(pool.speak_ssml("a"))
+        waiting = asyncio.create_task(pool.speak_ssml("b"))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_flight"] == 1 and pool.stats()["waiting"] == 1
+
+        try:
+            await pool.speak_ssml("c")
+        except SynthesisBackpressure:
+            pass
+        else:
+            raise AssertionError("Saturated pool accepted another request")
+
+        await asyncio.gather(running, waiting)
+        assert pool.stats()["waiting"] == 0
+        await pool.speak_ssml("d")  # capacity is back
+        pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_each_incident_gets_its_own_compressed_clip():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            formats = []
+
+            def create_synthesizer(audio_format=None):
+                formats.append(audio_format)
+                return BlockingSynthesizer(0.05)
+
+            client = make_voice_client(tmp, create_synthesizer, size=2)
+            assert client.audio_format == "mp3"
+
+            first, second = await asyncio.gather(
+                client.synthesize_sbar_to_audio("SITUATION: one", incident_id="cam-1-100-1"),
+                client.synthesize_sbar_to_audio("SITUATION: two", incident_id="../cam-2-100-2"),
+            )
+            client.close()
+
+            assert first.key == "cam-1-100-1.mp3" and first.mime == "audio/mpeg"
+            assert second.key == "___cam-2-100-2.mp3"
+            assert b"SITUATION: one" in first.data and b"SITUATION: two" in second.data
+            assert (await client.store.get(first.key)) is first
+            # Compressed synthesizers are made on first use; nothing touches the disk
+            assert formats == [None, None, "mp3", "mp3"]
+            assert os.listdir(tmp) == []
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_pool_synthesizes_in_parallel_off_the_loop()
+    test_saturated_pool_rejects_instead_of_queueing_forever()
+    test_each_incident_gets_its_own_compressed_clip()
+    print("Speech pool tests passed!")
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.stream_session import (
+    COOLDOWN_SECONDS, EmergencyState, FrameMailbox, SessionLimitReached, StreamSessionRegistry
+)
+
+
+def test_sessions_do_not_share_state():
+    registry = StreamSessionRegistry()
+    cam_a = registry.open("cam-a", object())
+    cam_b = registry.open("cam-b", object())
+
+    for _ in range(10):
+        cam_a.frame_history.append("HELP")
+    assert list(cam_b.frame_history) == []
+
+    # cam-a confirming an emergency must not put cam-b into cooldown
+    assert cam_a.confirm_emergency(True, current_time=100.0)
+    assert cam_a.state == EmergencyState.CONFIRMED
+    assert cam_b.state == EmergencyState.IDLE
+    assert cam_b.confirm_emergency(True, current_time=101.0)
+
+    # Each stream gets its own rate controller
+    assert cam_a.rate is not cam_b.rate
+
+
+def test_cooldown_is_per_stream():
+    registry = StreamSessionRegistry()
+    cam = registry.open("cam", object())
+    assert cam.confirm_emergency(True, current_time=0.0)
+    assert not cam.confirm_emergency(True, current_time=1.0)
+    assert cam.confirm_emergency(True, current_time=COOLDOWN_SECONDS + 1.0)
+
+
+def test_registry_cleanup_and_limit():
+    registry = StreamSessionRegistry(max_sessions=2)
+    first_client, second_client = object(), object()
+    first = registry.open("cam-1", first_client)
+    again = registry.open("cam-1", second_client)
+    assert first is again
+
+    anonymous = registry.open(None, object())
+    assert anonymous.stream_id.startswith("conn-")
+
+    try:
+        registry.open("cam-3", object())
+    except SessionLimitReached:
+        pass
+    else:
+        raise AssertionError("Expected SessionLimitReached")
+
+    registry.close(first, first_client)
+    assert registry.get("cam-1") is again  # still held by the second connection
+    registry.close(again, second_client)
+    registry.close(anonymous, next(iter(anonymous.clients)))
+    assert len(registry) == 0
+
+
+def test_mailbox_keeps_only_the_latest_frame():
+    async def scenario():
+        mailbox = FrameMailbox()
+        analyzed = []
+        superseded = 0
+
+        async def analyzer():
+            while len(analyzed) < 2:
+                await mailbox.wait()
+                analyzed.append(mailbox.take())
+                await asyncio.sleep(0.2)  # slow vision call
+
+        task = asyncio.create_task(analyzer())
+        assert not mailbox.put(0)
+        await asyncio.sleep(0)  # analyzer picks up frame 0
+        for frame in range(1, 20):
+            superseded += mailbox.put(frame)
+            await asyncio.sleep(0.001)
+        await asyncio.wait_for(task, timeout=2.0)
+        return analyzed, superseded
+
+    analyzed, superseded = asyncio.run(scenario())
+    assert analyzed == [0, 19]
+    assert superseded == 18
+
+
+if __name__ == "__main__":
+    test_sessions_do_not_share_state()
+    test_cooldown_is_per_stream()
+    test_registry_cleanup_and_limit()
+    test_mailbox_keeps_only_the_latest_frame()
+    print("Stream session tests passed!")
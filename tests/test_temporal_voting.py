@@ -0,0 +1,108 @@
+import json
+import os
+import random
+import sys
+import tempfile
+from collections import deque
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.temporal_voting import NEUTRAL_TAG, TagRule, TemporalVoter, load_gesture_rules
+
+
+def legacy_decision(history, gestures):
+    """The original FRAME_HISTORY.count('HELP') trigger, kept as the reference."""
+    current_tag = "Neutral"
+    if gestures:
+        best_gesture = max(gestures, key=lambda x: x['probability'])
+        if best_gesture['probability'] > 0.5:
+            current_tag = best_gesture['tag']
+    history.append(current_tag)
+    return current_tag, len(history) == history.maxlen and history.count("HELP") > 7
+
+
+def test_default_rules_match_legacy_trigger():
+    rng = random.Random(7)
+    voter = TemporalVoter()
+    history = deque(maxlen=10)
+
+    for _ in range(5000):
+        gestures = []
+        # Long runs of HELP so the trigger actually fires, mixed with noise and other tags
+        if rng.random() < 0.8:
+            gestures.append({"tag": "HELP", "probability": rng.choice([0.3, 0.5, 0.51, 0.98])})
+        if rng.random() < 0.2:
+            gestures.append({"tag": "WAVE", "probability": rng.random()})
+
+        expected_tag, expected_trigger = legacy_decision(history, gestures)
+        decision = voter.observe(gestures)
+        assert decision.tag == expected_tag
+        assert (decision.triggered == "HELP") == expected_trigger
+        assert decision.votes["HELP"] == history.count("HELP")
+
+
+def test_per_tag_windows_and_ewma_score():
+    voter = TemporalVoter([
+        TagRule("HELP", window=10, min_votes=8),
+        TagRule("FIRE", window=3, min_votes=2, min_probability=0.7, require_full_window=False, min_score=0.4),
+    ])
+
+    decision = voter.observe([{"tag": "FIRE", "probability": 0.9}])
+    assert decision.tag == "FIRE" and decision.triggered is None and decision.pending
+
+    decision = voter.observe([{"tag": "FIRE", "probability": 0.9}])
+    assert decision.triggered == "FIRE"
+    assert decision.scores["FIRE"] > 0.4
+
+    # Below FIRE's own probability threshold: not a vote
+    decision = voter.observe([{"tag": "FIRE", "probability": 0.6}])
+    assert decision.tag == NEUTRAL_TAG
+    assert voter.votes("FIRE") == 2
+
+    # The 3-frame window forgets old votes
+    voter.observe([])
+    assert voter.votes("FIRE") == 1
+
+
+def test_rules_load_from_config_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rules.json")
+        with open(path, "w") as f:
+            json.dump({"defaults": {"window": 5, "min_votes": 3},
+                       "rules": [{"tag": "HELP"}, {"tag": "FALL", "window": 8, "min_votes": 6}]}, f)
+        rules = {rule.tag: rule for rule in load_gesture_rules(path)}
+        assert (rules["HELP"].window, rules["HELP"].min_votes) == (5, 3)
+        assert (rules["FALL"].window, rules["FALL"].min_votes) == (8, 6)
+
+        with open(path, "w") as f:
+            f.write("not json")
+        [fallback] = load_gesture_rules(path)
+        assert (fallback.tag, fallback.window, fallback.min_votes) == ("HELP", 10, 8)
+
+
+def test_prearm_arms_before_trigger_and_disarms_with_hysteresis():
+    voter = TemporalVoter([TagRule("HELP", window=10, min_votes=8, prearm_votes=5)])
+    help_frame = [{"tag": "HELP", "probability": 0.9}]
+
+    prearms = [voter.observe(help_frame).prearm for _ in range(5)]
+    assert prearms == [None, None, None, None, "HELP"]
+
+    # Dropping to 4 votes keeps it armed, 3 votes disarms
+    decisions = [voter.observe([]) for _ in range(10)]
+    held = [d for d in decisions if d.prearm == "HELP"]
+    assert min(d.votes["HELP"] for d in held) == 4
+    assert decisions[-1].prearm is None
+
+    # prearm_votes=0 disables it; a larger value is capped at min_votes
+    assert TemporalVoter([TagRule("HELP", prearm_votes=0)]).observe(help_frame).prearm is None
+    assert TagRule("FIRE", window=3, min_votes=2, prearm_votes=5).prearm_votes == 2
+
+
+if __name__ == "__main__":
+    test_default_rules_match_legacy_trigger()
+    test_per_tag_windows_and_ewma_score()
+    test_rules_load_from_config_file()
+    test_prearm_arms_before_trigger_and_disarms_with_hysteresis()
+    print("Temporal voting tests passed!")
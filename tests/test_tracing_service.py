@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import AsyncMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.frame_protocol import pack_frame
+from backend.services.tracing_service import NOOP_SPAN, JsonlFileExporter, RingBufferExporter, Tracer, traced
+
+MOCK_RESULT = {
+    "captions": [{"text": "Mocked Caption", "confidence": 0.99}],
+    "objects": [],
+    "people": [],
+    "gestures": [],
+    "metadata": {"width": 0, "height": 0, "model_version": "mock"}
+}
+
+
+def test_spans_nest_across_awaits_and_tasks():
+    ring = RingBufferExporter(capacity=100)
+    tracer = Tracer(sample_rate=1.0, exporters=[ring])
+
+    async def scenario():
+        root = tracer.start_trace("frame", stream_id="cam-1")
+        with tracer.use(root):
+            with tracer.span("decode"):
+                await asyncio.sleep(0)
+            # Child tasks inherit the current span through the context
+            await asyncio.create_task(child())
+        root.end()
+
+    async def child():
+        with tracer.span("vision", cache="miss"):
+            await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    [trace] = ring.query()
+    names = {span["name"]: span for span in trace["spans"]}
+    assert trace["root"] == "frame"
+    assert set(names) == {"frame", "decode", "vision"}
+    assert names["vision"]["parent_id"] == names["frame"]["span_id"]
+    assert names["vision"]["attributes"]["cache"] == "miss"
+
+
+def test_unsampled_traces_are_noops():
+    ring = RingBufferExporter(capacity=10)
+    tracer = Tracer(sample_rate=0.0, exporters=[ring])
+
+    root = tracer.start_trace("frame")
+    assert root is NOOP_SPAN
+    with tracer.use(root):
+        assert tracer.span("decode") is NOOP_SPAN
+    root.end()
+    assert len(ring.spans) == 0
+    assert tracer.stats()["traces_started"] == 1
+
+    # Forced sampling (incidents) ignores the rate
+    assert tracer.start_trace("incident", sampled=True).sampled
+
+
+def test_errors_are_recorded_and_exported_to_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spans.jsonl")
+        exporter = JsonlFileExporter(path)
+        tracer = Tracer(sample_rate=1.0, exporters=[exporter])
+
+        @traced("llm.validate")
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def scenario():
+            with tracer.start_trace("incident"):
+                try:
+                    await failing()
+                except RuntimeError:
+                    pass
+
+        # `traced` uses the module tracer; bind this one for the test
+        with patch("backend.services.tracing_service.tracer", tracer):
+            asyncio.run(scenario())
+        exporter.close()
+
+        with open(path) as f:
+            spans = [json.loads(line) for line in f]
+        assert [s["name"] for s in spans] == ["llm.validate", "incident"]
+        assert spans[0]["status"] == "error"
+        assert spans[1]["status"] == "ok"
+
+
+def test_frame_trace_from_socket_to_response():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+
+    with patch.object(main.vision_client.backend, "analyze", AsyncMock(return_value=MOCK_RESULT)), \
+            patch.object(main.tracer, "sample_rate", 1.0):
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/stream?stream_id=trace-test") as websocket:
+            websocket.send_bytes(pack_frame(b"\xff\xd8not-a-real-jpeg\xff\xd9", stream_id=3, sequence=9))
+            assert websocket.receive_json()["seq"] == 9
+
+        traces = client.get("/traces", params={"name": "frame"}).json()["traces"]
+        trace = next(t for t in traces if t["spans"][0]["attributes"].get("stream_id") == "trace-test")
+        names = [span["name"] for span in trace["spans"]]
+        assert names[0] == "frame"
+        assert {"frame.decode", "vision.analyze", "ws.broadcast"} <= set(names)
+
+
+if __name__ == "__main__":
+    test_spans_nest_across_awaits_and_tasks()
+    test_unsampled_traces_are_noops()
+    test_errors_are_recorded_and_exported_to_file()
+    test_frame_trace_from_socket_to_response()
+    print("Tracing tests passed!")
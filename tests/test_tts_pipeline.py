@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import io
+import os
+import sys
+import tempfile
+import time
+import wave
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.agent_protocol import GuardianMasterAgent
+from backend.services.brain_service import notify_stage
+from backend.services.phrase_cache import SAMPLE_RATE
+from backend.services.speech_service import GuardianVoiceClient, SentenceSplitter
+from tests.fakes import TENTH_SECOND_WAV, BlockingSynthesizer, make_voice_client
+
+SBAR = ("SITUATION: Person collapsed in Lab 3. BACKGROUND: Asthma, 37.5 C fever.\n"
+        "ASSESSMENT: Unresponsive! RECOMMENDATION: Dispatch EMS.")
+SENTENCES = ["SITUATION: Person collapsed in Lab 3.", "BACKGROUND: Asthma, 37.5 C fever.",
+             "ASSESSMENT: Unresponsive!", "RECOMMENDATION: Dispatch EMS."]
+
+
+def make_client(tmp: str, delay: float = 0.2) -> GuardianVoiceClient:
+    return make_voice_client(tmp, lambda: BlockingSynthesizer(delay, audio=TENTH_SECOND_WAV), size=4)
+
+
+async def trickle(text: str, size: int = 7, delay: float = 0.02):
+    for start in range(0, len(text), size):
+        await asyncio.sleep(delay)
+        yield text[start:start + size]
+
+
+def test_splitter_handles_chunks_and_complete_text():
+    splitter = SentenceSplitter()
+    sentences = []
+    for start in range(0, len(SBAR), 5):
+        sentences += splitter.feed(SBAR[start:start + 5])
+    sentences += splitter.flush()
+    assert sentences == SENTENCES
+
+    complete = SentenceSplitter()
+    assert complete.feed(SBAR) + complete.flush() == SENTENCES
+
+
+def test_first_sentence_plays_after_one_synthesis():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            client = make_client(tmp)
+            chunks = []
+            started = time.perf_counter()
+
+            async def on_chunk(index, sentence, audio):
+                chunks.append((index, sentence, time.perf_counter() - started))
+
+            async def complete():
+                yield SBAR
+
+            clip = await client.synthesize_pipelined(complete(), incident_id="cam-1-100-1", on_chunk=on_chunk)
+            elapsed = time.perf_counter() - started
+            client.close()
+
+            assert [(index, sentence) for index, sentence, _ in chunks] == list(enumerate(SENTENCES))
+            assert chunks[0][2] < 0.35  # one synthesis, not the whole report
+            assert elapsed < 0.6  # 4 x 0.2 s one after another; depth 3 overlaps them
+            with wave.open(io.BytesIO(clip.data), "rb") as wav:
+                assert abs(wav.getnframes() / wav.getframerate() - 0.4) < 0.01
+
+    asyncio.run(scenario())
+
+
+def test_streamed_text_is_spoken_before_it_is_complete():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            client = make_client(tmp, delay=0.05)
+            finished_text = []
+            spoken = []
+
+            async def source():
+                async for chunk in trickle(SBAR):
+                    yield chunk
+                finished_text.append(True)
+
+            async for index, sentence, audio in client.stream_sentences(source()):
+                spoken.append((sentence, bool(finished_text)))
+            client.close()
+
+            assert [sentence for sentence, _ in spoken] == SENTENCES
+            assert spoken[0][1] is False
+
+    asyncio.run(scenario())
+
+
+class StreamingBrain:
+    """Orchestrator stand-in: severity 9, then the SBAR in chunks (or all at once)."""
+    def __init__(self, stream: bool):
+        self.stream = stream
+        self.speech_alerts = True
+
+    async def run_agentic_loop(self, vision_context, sign_detected, user_metadata, on_stage=None, speculation=None):
+        await notify_stage(on_stage, "severity", severity=9)
+        if self.stream:
+            index = 0
+            async for chunk in trickle(SBAR):
+                await notify_stage(on_stage, "sbar_delta", index=index, text=chunk)
+                index += 1
+        return {"status": "COMPLETED", "severity": 9, "sbar_report": SBAR}
+
+    def open_incident_context(self, *args):
+        return None
+
+
+def test_agent_streams_audio_chunks_for_streamed_and_complete_reports():
+    async def scenario(stream: bool):
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict(os.environ, {"AZURE_SPEECH_KEY": "test-key", "AZURE_SPEECH_REGION": "eastus"}):
+            os.environ.pop("GOOGLE_API_KEY", None)
+            agent = GuardianMasterAgent()
+            agent.voice_client.close()
+            agent.voice_client = make_client(tmp, delay=0.05)
+            agent.voice_client.mode = "pipelined"
+            agent.voice_client.phrases.store_dir = None
+            agent.crisis_orchestrator = StreamingBrain(stream)
+            events = []
+
+            async def on_stage(stage, data):
+                events.append((stage, data))
+
+            response = await agent.process_emergency("A person collapsed", {"location": "Lab 3"},
+                                                     on_stage=on_stage, incident_id="cam-1-100-1")
+            agent.voice_client.close()
+
+            audio_chunks = [data for stage, data in events if stage == "audio_chunk"]
+            assert [data["text"] for data in audio_chunks] == SENTENCES
+            with wave.open(io.BytesIO(base64.b64decode(audio_chunks[0]["audio"])), "rb") as wav:
+                assert wav.getframerate() == SAMPLE_RATE
+            stages = [stage for stage, _ in events]
+            assert stages.index("audio_ready") > max(i for i, stage in enumerate(stages) if stage == "audio_chunk")
+            assert response["call_status"] == "CALL_PLACED"
+            assert response["audio_url"] == "/audio/cam-1-100-1.wav"
+
+    with patch.dict(os.environ):
+        asyncio.run(scenario(stream=True))
+        asyncio.run(scenario(stream=False))
+
+
+if __name__ == "__main__":
+    test_splitter_handles_chunks_and_complete_text()
+    test_first_sentence_plays_after_one_synthesis()
+    test_streamed_text_is_spoken_before_it_is_complete()
+    test_agent_streams_audio_chunks_for_streamed_and_complete_reports()
+    print("TTS pipeline tests passed!")
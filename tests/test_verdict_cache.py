@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.verdict_cache import VerdictCache, normalize_context
+from tests.fakes import make_orchestrator
+
+
+def test_repeat_contexts_are_answered_from_cache():
+    async def scenario():
+        orchestrator = make_orchestrator(verdict_cache=VerdictCache(db_path=None))
+        assert await orchestrator.validate_context("A person waving for help.", "HELP") is True
+        assert await orchestrator.calculate_severity("A person waving for help.", "HELP") == 7
+        assert orchestrator.client.calls == 2
+
+        # Same scene, different punctuation/case/spacing
+        started = time.perf_counter()
+        assert await orchestrator.validate_context("a person  waving for HELP", "help") is True
+        assert await orchestrator.calculate_severity("A person waving, for help", "HELP") == 7
+        assert time.perf_counter() - started < 0.01
+        assert orchestrator.client.calls == 2
+        assert orchestrator.verdict_cache.stats()["hits"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_never_cached():
+    async def scenario():
+        orchestrator = make_orchestrator(verdict_cache=VerdictCache(db_path=None))
+        orchestrator.client.fail = True
+        assert await orchestrator.validate_context("Smoke in kitchen", "FIRE") is True  # fail open
+        assert await orchestrator.calculate_severity("Smoke in kitchen", "FIRE") == 5  # default
+        assert len(orchestrator.verdict_cache.memory) == 0
+
+        orchestrator.client.fail = False
+        assert await orchestrator.calculate_severity("Smoke in kitchen", "FIRE") == 7
+        assert orchestrator.client.calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_verdicts_persist_across_restarts_and_expire():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "verdicts.db")
+            key = VerdictCache.key("severity", "Person on floor", "HELP", "gemini-2.5-flash", 1)
+
+            first = VerdictCache(db_path=path)
+            first.set(key, 9)
+            first.close()  # waits for the queued write
+
+            restarted = VerdictCache(db_path=path)
+            assert await restarted.get(key) == 9
+            assert restarted.stats()["disk_hits"] == 1
+            restarted.close()
+
+            short = VerdictCache(ttl_seconds=0.01, db_path=path)
+            short.set(key, 3)
+            await asyncio.sleep(0.02)
+            assert await short.get(key) is None
+            short.close()
+
+    asyncio.run(scenario())
+
+
+def test_disk_tier_stays_off_the_event_loop():
+    async def scenario():
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = VerdictCache(db_path=os.path.join(tmp, "verdicts.db"))
+            loop_thread = threading.get_ident()
+            db_threads = set()
+            real_store, real_load = cache._store, cache._load
+
+            def store(*args):
+                db_threads.add(threading.get_ident())
+                time.sleep(0.05)  # a slow disk
+                real_store(*args)
+
+            def load(key):
+                db_threads.add(threading.get_ident())
+                return real_load(key)
+
+            cache._store, cache._load = store, load
+            key = VerdictCache.key("validate", "Person on floor", "HELP", "gemini-2.5-flash", 1)
+            started = time.perf_counter()
+            cache.set(key, True)
+            assert time.perf_counter() - started < 0.01
+            cache.memory.clear()
+            assert await cache.get(key) is True  # queued behind the write, on the same thread
+            cache.close()
+            assert db_threads and loop_thread not in db_threads
+
+    asyncio.run(scenario())
+
+
+def test_normalization():
+    assert normalize_context("  A Person, waving!\n") == "a person waving"
+
+
+if __name__ == "__main__":
+    test_repeat_contexts_are_answered_from_cache()
+    test_failures_are_never_cached()
+    test_verdicts_persist_across_restarts_and_expire()
+    test_disk_tier_stays_off_the_event_loop()
+    test_normalization()
+    print("Verdict cache tests passed!")
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.vision_backends import CascadeVisionBackend, LocalPersonDetectorBackend, empty_result
+from backend.services.vision_service import AzureVisionClient
+from tests.fakes import make_jpeg
+
+
+class FakeBackend:
+    def __init__(self, name, people=0, error=None):
+        self.name = name
+        self.available = True
+        self.calls = 0
+        self.people = people
+        self.error = error
+
+    async def analyze(self, image_bytes, stream_id=None, priority=False):
+        self.calls += 1
+        result = empty_result(self.name)
+        result["people"] = [{"confidence": 0.9, "box": {"x": 0, "y": 0, "w": 1, "h": 1}}] * self.people
+        if self.error:
+            result["metadata"]["error"] = self.error
+        return result
+
+    async def close(self):
+        pass
+
+
+def test_local_detector_returns_the_shared_schema():
+    async def scenario():
+        backend = LocalPersonDetectorBackend(max_workers=1)
+        try:
+            result = await backend.analyze(memoryview(make_jpeg(background=(120, 120, 120))))
+            assert set(result) == {"captions", "objects", "people", "gestures", "metadata"}
+            assert result["people"] == [] and result["gestures"] == []
+            assert result["metadata"]["width"] == 640
+            assert result["metadata"]["model_version"] == "local-hog"
+
+            broken = await backend.analyze(b"not a jpeg")
+            assert broken["metadata"].get("error")
+        finally:
+            await backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_cascade_only_calls_the_cloud_to_confirm():
+    async def scenario():
+        empty_room = CascadeVisionBackend(FakeBackend("local"), FakeBackend("cloud", people=1))
+        result = await empty_room.analyze(b"frame")
+        assert result["metadata"]["model_version"] == "local"
+        assert empty_room.confirm_stage.calls == 0
+
+        occupied = CascadeVisionBackend(FakeBackend("local", people=1), FakeBackend("cloud", people=1))
+        result = await occupied.analyze(b"frame")
+        assert result["metadata"]["model_version"] == "cloud"
+
+        cloud_down = CascadeVisionBackend(FakeBackend("local", people=1), FakeBackend("cloud", error="http_error"))
+        result = await cloud_down.analyze(b"frame")
+        assert result["metadata"]["model_version"] == "local"
+
+    asyncio.run(scenario())
+
+
+def test_auto_selection_falls_back_to_local_without_credentials():
+    with patch.dict(os.environ, {"AZURE_VISION_ENDPOINT": "", "AZURE_VISION_KEY": ""}):
+        client = AzureVisionClient()
+    assert client.client is None
+    assert client.backend.name == "local-hog"
+
+    custom = AzureVisionClient(backend=FakeBackend("custom"))
+    result = asyncio.run(custom.analyze_frame(make_jpeg(background=(120, 120, 120)), stream_id="cam"))
+    assert result["metadata"]["model_version"] == "custom"
+
+
+if __name__ == "__main__":
+    test_local_detector_returns_the_shared_schema()
+    test_cascade_only_calls_the_cloud_to_confirm()
+    test_auto_selection_falls_back_to_local_without_credentials()
+    print("Vision backend tests passed!")
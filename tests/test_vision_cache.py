@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.cache_service import TTLCache
+from backend.services.vision_service import AzureVisionClient
+from tests.fakes import make_jpeg
+
+
+def shaded_jpeg(shade: int) -> bytes:
+    return make_jpeg((320, 240), (shade, shade, shade), box=(100, 40, 200, 230), fill=(255 - shade, 80, 80), quality=80)
+
+
+def mock_vision_result():
+    result = MagicMock()
+    result.people.list = []
+    result.objects.list = []
+    result.metadata.width = 320
+    result.metadata.height = 240
+    result.model_version = "mock"
+    return result
+
+
+def test_ttl_cache_lru_ttl_and_memory_ceiling():
+    cache = TTLCache("test", max_entries=2, ttl_seconds=60, max_bytes=100, sizeof=lambda value: value)
+    cache.set("a", 40)
+    cache.set("b", 40)
+    assert cache.get("a") == 40          # "a" is now most recently used
+    cache.set("c", 40)                   # over 100 bytes -> evicts "b"
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.evictions == 1
+
+    cache.set("short", 1, ttl_seconds=-1)
+    assert cache.get("short") is None
+    assert cache.expirations == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_analyze_frame_caches_per_stream_by_perceptual_hash():
+    async def scenario():
+        with patch.dict(os.environ, {"AZURE_VISION_ENDPOINT": "https://mock", "AZURE_VISION_KEY": "mock"}), \
+             patch("backend.services.vision_service.ImageAnalysisClient") as MockAnalysisClient:
+            client = AzureVisionClient()
+            analyze = MockAnalysisClient.return_value.analyze
+            analyze.side_effect = lambda **kwargs: asyncio.sleep(0, result=mock_vision_result())
+
+            frame = shaded_jpeg(60)
+            first = await client.analyze_frame(memoryview(frame), stream_id="cam-1")
+            again = await client.analyze_frame(shaded_jpeg(60), stream_id="cam-1")
+            assert again is first
+            assert analyze.call_count == 1
+
+            # Same picture on another camera is a separate cache scope
+            await client.analyze_frame(frame, stream_id="cam-2")
+            assert analyze.call_count == 2
+
+            # Batch callers share the cache
+            await client.analyze_frames([frame, shaded_jpeg(200)], stream_id="cam-1")
+            assert analyze.call_count == 3
+
+            # Failures are never cached
+            analyze.side_effect = RuntimeError("boom")
+            failed = await client.analyze_frame(shaded_jpeg(120), stream_id="cam-1")
+            assert failed["metadata"]["error"] == "error"
+            assert client.cache.stats()["entries"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_changed_frame_with_a_colliding_hash_reaches_the_backend():
+    from fastapi.testclient import TestClient
+    import backend.main as main
+    from backend.frame_protocol import pack_frame
+    from backend.services.image_signature import frame_signature
+    from backend.services.vision_backends import empty_result
+
+    fallen = {**empty_result("mock"), "people": [{"confidence": 0.9, "box": {"x": 200, "y": 380, "w": 200, "h": 80}}]}
+    analyze = AsyncMock(side_effect=[empty_result("mock"), fallen])
+
+    def colliding_signature(image_bytes):
+        return frame_signature(image_bytes)._replace(hash=0)
+
+    # Every frame hashes alike: the cache alone would answer the second frame with "no people".
+    # The hash comes from the gate's decode; analyze_frame never decodes the frame again.
+    with patch.object(main.vision_client.backend, "analyze", analyze), \
+            patch("backend.frame_gate.frame_signature", side_effect=colliding_signature), \
+            patch("backend.services.vision_service.perceptual_hash", side_effect=AssertionError("decoded twice")), \
+            patch("backend.services.vision_service.signatures_available", return_value=True):
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/stream?stream_id=collision-test") as websocket:
+            main.stream_sessions.get("collision-test").rate.wait = AsyncMock()
+            websocket.send_bytes(pack_frame(make_jpeg(), sequence=0))
+            websocket.receive_json()
+            # Someone lying on the floor
+            websocket.send_bytes(pack_frame(make_jpeg(box=(200, 380, 400, 460)), sequence=1))
+            websocket.receive_json()
+
+    assert analyze.await_count == 2
+    assert main.vision_client.cache.get(("collision-test", 0)) is fallen
+
+
+if __name__ == "__main__":
+    test_ttl_cache_lru_ttl_and_memory_ceiling()
+    test_analyze_frame_caches_per_stream_by_perceptual_hash()
+    test_changed_frame_with_a_colliding_hash_reaches_the_backend()
+    print("Vision cache tests passed!")
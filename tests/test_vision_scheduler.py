@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.vision_service import VisionRequestScheduler
+
+
+def test_concurrency_is_bounded():
+    async def scenario():
+        scheduler = VisionRequestScheduler(max_concurrency=2, rate_per_second=1000, burst=1000)
+        active = peak = 0
+
+        async def request():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(*(scheduler.run(f"cam-{i % 3}", request) for i in range(10)))
+        assert peak == 2
+        assert scheduler.stats()["dispatched"] == 10
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_enforces_quota_and_backoff():
+    async def scenario():
+        scheduler = VisionRequestScheduler(max_concurrency=10, rate_per_second=20, burst=1)
+
+        async def request():
+            return time.monotonic()
+
+        started = time.monotonic()
+        stamps = await asyncio.gather(*(scheduler.run("cam", request) for _ in range(5)))
+        # 1 burst token, then 20/s -> the last start is ~0.2s later
+        assert max(stamps) - started >= 0.15
+
+        scheduler.backoff(retry_after=0.2)
+        paused_at = time.monotonic()
+        resumed = await scheduler.run("cam", request)
+        assert resumed - paused_at >= 0.18
+        assert scheduler.stats()["rate_limited"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_fair_queuing_and_alert_priority():
+    async def scenario():
+        scheduler = VisionRequestScheduler(max_concurrency=1, rate_per_second=1000, burst=1000)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        def tagged(name):
+            async def request():
+                order.append(name)
+            return request
+
+        # Occupy the only slot so everything else queues up
+        first = asyncio.create_task(scheduler.run("busy", blocker))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(scheduler.run("busy", tagged("busy"))) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(scheduler.run("quiet", tagged("quiet"))))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(scheduler.run("alerting", tagged("alert"), priority=True)))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queue_depth"] == 6
+
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        assert order[0] == "alert"
+        # The quiet stream is not stuck behind the busy stream's backlog
+        assert order.index("quiet") <= 2
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_concurrency_is_bounded()
+    test_token_bucket_enforces_quota_and_backoff()
+    test_fair_queuing_and_alert_priority()
+    print("Vision scheduler tests passed!")
@@ -2,24 +2,25 @@
 import asyncio
 import os
 import sys
-from collections import deque
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Add backend to path to allow imports
-backend_path = Path(__file__).resolve().parent.parent / 'backend'
-sys.path.append(str(backend_path))
+# Add the project root to path so the backend package imports resolve
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 # Load actual .env
-load_dotenv(backend_path.parent / '.env')
+load_dotenv(project_root / '.env')
 
 async def main():
     try:
         print("--- Stage 2 Verification: Live Credentials & Temporal Logic ---")
         
         # 1. Verify Imports and Global State
-        from services.vision_service import AzureVisionClient
-        from main import FRAME_HISTORY
+        from backend.services.vision_service import AzureVisionClient
+        from backend.stream_session import StreamSession
+        FRAME_HISTORY = StreamSession("verify").frame_history
         
         print("[PASS] Imports successful.")
         